@@ -1,19 +1,94 @@
 from tqdm import tqdm
-import collections
+import hashlib
+import json
+import shutil
+import tempfile
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import Pool
+
+import numpy as np
 
 from os.path import dirname, realpath, join
 
-from arekit.common.context.token import Token
 from arekit.common.data import const
 from arekit.common.data.input.providers.text.single import BaseSingleTextProvider
 from arekit.common.data.storages.base import BaseRowsStorage
-from arekit.common.entities.base import Entity
 from arekit.common.frames.variants.base import FrameVariant
-from arekit.common.news.entity import DocumentEntity
 from arekit.contrib.utils.processing.text.tokens import Tokens
 from arekit.contrib.networks.core.input.const import FrameVariantIndices
 from arekit.contrib.networks.core.input.rows_parser import ParsedSampleRow
 
+from arelight.brat_html import dumps_script_json
+from arelight.readers.docs_index import get_docs_index, find_docs_range_rows, build_docs_index_from_frames
+from arelight.readers.tsv import DataFrameRows, TsvChunkedRows, read_tsv_rows
+
+# Supported sources of the rows.
+ROWS_TYPES = (BaseRowsStorage, DataFrameRows, TsvChunkedRows)
+
+
+class _OrderedLabels(object):
+    """ Labels of the rows, which are expected to be requested in ascending order of the row ids.
+        Labels are provided by frames: index of the first row of the frame and array of the labels.
+        Frames are consumed lazily, so the labels of all the rows are never kept in memory.
+    """
+
+    def __init__(self, labels_frames_iter):
+        self.__it = iter(labels_frames_iter)
+        self.__offset = 0
+        self.__labels = None
+        self.__is_over = False
+
+    def get(self, row_id):
+        while not self.__is_over and (self.__labels is None or self.__offset + len(self.__labels) <= row_id):
+            frame = next(self.__it, None)
+            self.__is_over = frame is None
+            if not self.__is_over:
+                self.__offset, self.__labels = frame
+
+        if self.__is_over or row_id < self.__offset:
+            return None
+
+        return self.__labels[row_id - self.__offset]
+
+
+class _TermsTable(object):
+    """ Terms of the document, represented by the parallel arrays of
+        kinds, texts and entities (id within document and type) of the terms.
+    """
+
+    WORD = 0
+    ENTITY = 1
+    FRAME = 2
+
+    def __init__(self):
+        self.__kinds = []
+        self.__texts = []
+        self.__entity_ids = []
+        self.__entity_types = []
+
+    @property
+    def Kinds(self):
+        return self.__kinds
+
+    @property
+    def Texts(self):
+        return self.__texts
+
+    @property
+    def EntityIds(self):
+        return self.__entity_ids
+
+    @property
+    def EntityTypes(self):
+        return self.__entity_types
+
+    def add(self, kind, text, entity_id=-1, entity_type=None):
+        self.__kinds.append(kind)
+        self.__texts.append(text)
+        self.__entity_ids.append(entity_id)
+        self.__entity_types.append(entity_type)
+
 
 class BratBackend(object):
 
@@ -23,6 +98,27 @@ class BratBackend(object):
     SUBJECT_ROLE = "Subj"
     OBJECT_ROLE = "Obj"
 
+    SENT_DATA_COLUMNS = [BaseSingleTextProvider.TEXT_A,
+                         const.ENTITY_VALUES,
+                         const.ENTITY_TYPES,
+                         const.ENTITIES,
+                         FrameVariantIndices]
+
+    # Collection data, created per colors configuration:
+    # key -> (coll_data, serialized coll_data, hash).
+    __coll_data_cache = {}
+
+    def __init__(self, processes=1, docs_per_task=16):
+        """ processes: int
+                amount of processes, utilized for processing documents.
+            docs_per_task: int
+                amount of documents, passed to a process at once.
+        """
+        assert(isinstance(processes, int) and processes > 0)
+        assert(isinstance(docs_per_task, int) and docs_per_task > 0)
+        self.__processes = processes
+        self.__docs_per_task = docs_per_task
+
     @staticmethod
     def __create_relation_types(relation_color_types, entity_types):
         assert(isinstance(relation_color_types, dict))
@@ -58,184 +154,201 @@ class BratBackend(object):
         return entity_types
 
     @staticmethod
-    def __extract_objects(text_terms):
-        """ Entities: ['T1', 'Person', [[0, 11]]]
-            Triggers: ['T1', 'Frame', [[12, 21]]]
+    def __extract_objects(terms):
+        """ Provides objects (entities and frames) of the document as tuples of
+            (id, type, char_start, char_end), where ids and bounds are related to the document,
+            and the amount of ids, reserved by them.
         """
-        assert (isinstance(text_terms, list))
+        assert(isinstance(terms, _TermsTable))
 
-        entities_count = 0
-        for term in text_terms:
-            if isinstance(term, DocumentEntity):
-                entities_count = max(entities_count, term.IdInDocument)
+        kinds = np.asarray(terms.Kinds, dtype=np.int8)
+        entity_ids = np.asarray(terms.EntityIds, dtype=np.int64)
 
-        frame_ind = entities_count + 1
-        char_ind = 0
+        # Terms are separated by space.
+        lengths = np.fromiter((len(t) for t in terms.Texts), dtype=np.int64, count=len(terms.Texts))
+        starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
 
-        objects = []
+        is_entity = kinds == _TermsTable.ENTITY
+        entities_count = int(entity_ids[is_entity].max()) if is_entity.any() else 0
 
-        for term in text_terms:
-            t_from = char_ind
+        frame_ind = entities_count + 1
 
-            text_term = BratBackend.__term_to_text(term)
-            t_to = t_from + len(text_term)
+        objects = []
 
-            if isinstance(term, DocumentEntity):
-                entity = ["T{}".format(term.IdInDocument), term.Type, [[t_from, t_to]]]
-                objects.append(entity)
+        for i in np.flatnonzero(is_entity | (kinds == _TermsTable.FRAME)):
+            start, end = int(starts[i]), int(starts[i] + lengths[i])
 
-            elif isinstance(term, FrameVariant):
-                frame = ["T{}".format(frame_ind), "Frame", [[t_from, t_to]]]
+            if kinds[i] == _TermsTable.ENTITY:
+                objects.append((int(entity_ids[i]), terms.EntityTypes[i], start, end))
+            else:
+                objects.append((frame_ind, "Frame", start, end))
                 frame_ind += 1
-                objects.append(frame)
 
-            # Considering sep
-            char_ind = t_to + 1
+        return objects, frame_ind
+
+    @staticmethod
+    def __to_brat_objects(objects, char_offset, id_offset):
+        """ Entities: ['T1', 'Person', [[0, 11]]]
+            Triggers: ['T1', 'Frame', [[12, 21]]]
+            Character bounds and ids of the objects are shifted by the related offsets.
+        """
+        return [["T{}".format(id_offset + obj_id), obj_type, [[char_offset + start, char_offset + end]]]
+                for obj_id, obj_type, start, end in objects]
 
-        return objects
+    @staticmethod
+    def __iter_frames(rows):
+        if isinstance(rows, BaseRowsStorage):
+            yield 0, rows.DataFrame
+        else:
+            for offset, df in rows.iter_frames():
+                yield offset, df
 
     @staticmethod
     def __iter_predicted_labels(result_data, label_to_rel):
-        assert(isinstance(result_data, BaseRowsStorage))
+        """ Provides label of every row, which is the first label with the positive value.
+        """
+        assert(isinstance(result_data, ROWS_TYPES))
         assert(isinstance(label_to_rel, dict))
 
-        for res_ind, row in result_data:
+        rel_names = np.array(list(label_to_rel.values()) + [None], dtype=object)
 
-            rel_type = None
-            for col_label, rel_name in label_to_rel.items():
-                if row[col_label] > 0:
-                    rel_type = rel_name
-                    break
+        for offset, df in BratBackend.__iter_frames(result_data):
+
+            if len(label_to_rel) == 0:
+                yield offset, np.full(len(df), None, dtype=object)
+                continue
 
-            yield res_ind, rel_type
+            is_positive = df[list(label_to_rel.keys())].to_numpy() > 0
+            # Rows without positive values refer to the last one, i.e. None.
+            first_positive = np.where(is_positive.any(axis=1), is_positive.argmax(axis=1), len(label_to_rel))
+            yield offset, rel_names[first_positive]
 
     @staticmethod
     def __iter_sample_labels(samples, label_to_rel):
-        assert(isinstance(samples, BaseRowsStorage))
+        assert(isinstance(samples, ROWS_TYPES))
 
-        for row_ind, row in samples:
-            str_label = str(row[const.LABEL]) if const.LABEL in row else None
-            label = label_to_rel[str_label] if str_label in label_to_rel else None
-            yield row_ind, label
+        for offset, df in BratBackend.__iter_frames(samples):
+            if const.LABEL not in df.columns:
+                yield offset, np.full(len(df), None, dtype=object)
+                continue
+            str_labels = df[const.LABEL].astype(str)
+            yield offset, np.array([label_to_rel.get(str_label, None) for str_label in str_labels], dtype=object)
 
     @staticmethod
-    def __extract_relations(relations, labels_iter):
+    def __extract_relations(relations, labels, id_offset=0):
         assert(isinstance(relations, list))
-        assert(isinstance(labels_iter, collections.Iterable))
+        assert(isinstance(labels, _OrderedLabels))
 
         def __rel_id(r_data):
             return r_data[0]
 
-        relations = sorted(relations, key=lambda item: __rel_id(item))
-
-        # Map relation id towards the related index in list.
-        id_to_ind = {}
-        for r_ind, r_data in enumerate(relations):
-            key = r_data[0]
-            id_to_ind[key] = r_ind
-
         brat_rels = []
-        for row_id, rel_type in labels_iter:
-
-            if row_id not in id_to_ind:
-                continue
+        for rel_id, s_ind, t_ind in sorted(relations, key=lambda item: __rel_id(item)):
 
-            __id = id_to_ind[row_id]
-            rel_id, s_ind, t_ind = relations[__id]
-            assert(row_id == rel_id)
+            rel_type = labels.get(rel_id)
 
             # Was not found.
             if rel_type is None:
                 continue
 
             brat_rels.append([rel_id, rel_type, [
-                [BratBackend.SUBJECT_ROLE, 'T{}'.format(s_ind)],
-                [BratBackend.OBJECT_ROLE, 'T{}'.format(t_ind)]
+                [BratBackend.SUBJECT_ROLE, 'T{}'.format(id_offset + s_ind)],
+                [BratBackend.OBJECT_ROLE, 'T{}'.format(id_offset + t_ind)]
             ]])
 
         return brat_rels
 
     @staticmethod
-    def __to_terms(doc_data):
+    def __to_terms(doc_id, doc_data):
+        """ Provides table of the document terms, including preamble and sentence endings,
+            and relations between entities in terms of their ids within the document.
+        """
         assert (isinstance(doc_data, dict))
 
-        sentence_terms = []
+        terms = _TermsTable()
+        relations = []
+
+        # Document preamble.
+        terms.add(_TermsTable.WORD, "DOC: {}".format(doc_id))
+        terms.add(_TermsTable.WORD, '\n')
 
         e_doc_id = 0
         for s_ind in sorted(doc_data):
             sent_data = doc_data[s_ind]
             text_terms = sent_data[BaseSingleTextProvider.TEXT_A]
+            sentence_entity_values = sent_data[const.ENTITY_VALUES]
+            sentence_entity_types = sent_data[const.ENTITY_TYPES]
 
+            # Entities of the sentence: term index -> (value, type, id in document).
+            entities = {}
             for i, e_ind in enumerate(sent_data[const.ENTITIES]):
-                sentence_entity_values = sent_data[const.ENTITY_VALUES]
-                sentence_entity_types = sent_data[const.ENTITY_TYPES]
 
                 if e_ind >= len(text_terms):
                     continue
 
-                text_terms[e_ind] = DocumentEntity(
-                    value=sentence_entity_values[i],
-                    e_type=sentence_entity_types[i],
-                    id_in_doc=e_doc_id,
-                    group_index=None)
-
+                entities[e_ind] = (sentence_entity_values[i], sentence_entity_types[i], e_doc_id)
                 e_doc_id += 1
 
-            if sent_data[FrameVariantIndices] is not None:
-                for i, f_ind in enumerate(sent_data[FrameVariantIndices]):
-                    value = text_terms[f_ind]
-                    text_terms[f_ind] = FrameVariant(text=value, frame_id="0")
+            frames = set(sent_data[FrameVariantIndices]) if sent_data[FrameVariantIndices] is not None else set()
 
             for i, term in enumerate(text_terms):
-                if not isinstance(term, str):
-                    continue
-                token = Tokens.try_parse(term)
-                if token is None:
+                if i in frames:
+                    terms.add(_TermsTable.FRAME, BratBackend.__frame_to_text(term))
+                elif i in entities:
+                    value, e_type, e_id = entities[i]
+                    terms.add(_TermsTable.ENTITY, value, entity_id=e_id, entity_type=e_type)
+                else:
+                    terms.add(_TermsTable.WORD, BratBackend.__word_to_text(term))
+
+            for r_ind, r_s_ind, r_t_ind in sent_data["relations"]:
+                if r_s_ind >= len(text_terms) or r_t_ind >= len(text_terms):
                     continue
-                text_terms[i] = token
+                assert(r_s_ind in entities and r_t_ind in entities)
+                relations.append([r_ind, entities[r_s_ind][2], entities[r_t_ind][2]])
 
-            # Update sentence contents.
-            sentence_terms.append(text_terms)
+            # Sentence ending.
+            terms.add(_TermsTable.WORD, '\n')
 
-        return sentence_terms
+        # Document appendix.
+        terms.add(_TermsTable.WORD, '\n')
 
-    @staticmethod
-    def __iter_relations(doc_data):
-        assert(isinstance(doc_data, dict))
-        for s_ind in sorted(doc_data):
-            r_data = doc_data[s_ind]
-            for relation in r_data["relations"]:
-                terms = r_data[BaseSingleTextProvider.TEXT_A]
-                if relation[1] >= len(terms) or relation[2] >= len(terms):
-                    continue
-                r_ind = relation[0]
-                s_obj = terms[relation[1]]
-                t_obj = terms[relation[2]]
-                yield [r_ind, s_obj.IdInDocument, t_obj.IdInDocument]
+        return terms, relations
 
     @staticmethod
-    def __iter_docs_data(samples, sent_data_cols):
-
-        def __create_doc_data():
-            return dict()
+    def __iter_docs_rows(samples):
+        """ Provides rows of every document, i.e. partitions rows by `doc_id`.
+        """
 
-        doc_data = __create_doc_data()
+        rows = []
         curr_doc_id = None
 
         for row_ind, row in samples:
 
-            parsed = ParsedSampleRow.parse(row)
-            doc_id = parsed[const.DOC_ID]
+            doc_id = row[const.DOC_ID]
 
-            if curr_doc_id is None:
-                curr_doc_id = doc_id
-            elif curr_doc_id != doc_id:
+            if curr_doc_id is not None and curr_doc_id != doc_id:
                 if (doc_id < curr_doc_id):
                     break
-                yield curr_doc_id, doc_data
-                doc_data = __create_doc_data()
+                yield curr_doc_id, rows
+                rows = []
 
             curr_doc_id = doc_id
+            rows.append((row_ind, row))
+
+        if len(rows) > 0:
+            yield curr_doc_id, rows
+
+    @staticmethod
+    def __create_doc_data(doc_rows):
+        """ Composes data of every sentence of the document rows.
+        """
+
+        doc_data = dict()
+
+        for row_ind, row in doc_rows:
+
+            parsed = ParsedSampleRow.parse(row)
+
             sent_ind = parsed[const.SENT_IND]
             has_row = sent_ind in doc_data
             s_data = {"relations": []} if not has_row else doc_data[sent_ind]
@@ -246,113 +359,285 @@ class BratBackend(object):
             if has_row:
                 continue
 
-            for col in sent_data_cols:
+            for col in BratBackend.SENT_DATA_COLUMNS:
                 s_data[col] = parsed[col]
 
             doc_data[sent_ind] = s_data
 
-        if len(doc_data) > 0:
-            yield curr_doc_id, doc_data
-
-    def __extract_data_from_samples(self, samples, docs_range):
-        assert(isinstance(samples, BaseRowsStorage))
-        assert(isinstance(docs_range, tuple) or docs_range is None)
+        return doc_data
 
-        sent_data_cols = [BaseSingleTextProvider.TEXT_A,
-                          const.ENTITY_VALUES,
-                          const.ENTITY_TYPES,
-                          const.ENTITIES,
-                          FrameVariantIndices]
+    @staticmethod
+    def _create_doc_chunk(doc):
+        """ Provides text, objects (see `__extract_objects`), amount of reserved ids and relations
+            of the document, given by (doc_id, rows). Performed independently for every document,
+            so it is also utilized as a task of the pool of processes.
+        """
+        doc_id, doc_rows = doc
+        terms, relations = BratBackend.__to_terms(doc_id=doc_id, doc_data=BratBackend.__create_doc_data(doc_rows))
+        objects, ids_count = BratBackend.__extract_objects(terms)
+        return " ".join(terms.Texts), objects, ids_count, relations
 
-        # Join all the sentences within a single list of terms.
-        text_terms = []
-        relations = []
+    def __iter_docs_in_range(self, samples, docs_range):
+        assert(isinstance(samples, ROWS_TYPES))
+        assert(isinstance(docs_range, tuple) or docs_range is None)
 
-        for doc_id, doc_data in tqdm(self.__iter_docs_data(samples, sent_data_cols=sent_data_cols)):
+        for doc_id, doc_rows in tqdm(self.__iter_docs_rows(samples)):
 
             # Check whether document to be saved is actually in range.
             if docs_range is not None and not (doc_id >= docs_range[0] and doc_id <= docs_range[1]):
                 continue
 
-            # Handle sentences
-            sentences_terms = self.__to_terms(doc_data=doc_data)
-            relations.extend(self.__iter_relations(doc_data=doc_data))
+            yield doc_id, doc_rows
 
-            # Provide sentence endings.
-            for sent_terms in sentences_terms:
-                sent_terms.append('\n')
+    def __iter_docs_contents(self, samples, docs_range):
+        """ Provides contents of every document within the range.
+            Documents are processed either one after another, or in the pool of processes
+            by windows of documents, so that only a limited amount of them is kept in memory.
+        """
+        docs = self.__iter_docs_in_range(samples=samples, docs_range=docs_range)
 
-            # Document preamble.
-            text_terms.extend(["DOC: {}".format(doc_id), '\n'])
+        if self.__processes == 1:
+            for doc in docs:
+                yield self._create_doc_chunk(doc)
+            return
 
-            # Document contents.
-            for sent_terms in sentences_terms:
-                text_terms.extend(sent_terms)
+        window_size = self.__processes * self.__docs_per_task * 4
 
-            # Document appendix.
-            text_terms.append('\n')
+        with Pool(processes=self.__processes) as pool:
+            while True:
+                window = list(islice(docs, window_size))
+                if len(window) == 0:
+                    break
+                for contents in pool.imap(BratBackend._create_doc_chunk, window, chunksize=self.__docs_per_task):
+                    yield contents
+
+    def __iter_docs_chunks(self, samples, result, label_to_rel, docs_range):
+        """ Provides text, entities and relations of every document.
+            Documents are separated by space in the output text, so the character bounds
+            and ids of the document objects are shifted by the length of the text and
+            amount of ids of the prior documents.
+        """
+        assert(isinstance(label_to_rel, dict))
+        assert(isinstance(samples, ROWS_TYPES))
+        assert(isinstance(result, ROWS_TYPES) or result is None)
 
-        return text_terms, relations
+        # Defining the source of labels: from result or predefined.
+        labels = _OrderedLabels(self.__iter_predicted_labels(result, label_to_rel)
+                                if result is not None else self.__iter_sample_labels(samples, label_to_rel))
+
+        char_offset = 0
+        id_offset = 0
+        for text, objects, ids_count, relations in self.__iter_docs_contents(samples=samples, docs_range=docs_range):
+
+            entities = self.__to_brat_objects(objects, char_offset=char_offset, id_offset=id_offset)
+            brat_rels = self.__extract_relations(relations, labels=labels, id_offset=id_offset)
+
+            yield text, entities, brat_rels
+
+            char_offset += len(text) + 1
+            id_offset += ids_count
 
     # TODO. Process text back via pipeline.
     @staticmethod
-    def __term_to_text(term):
-        if isinstance(term, Entity):
-            return term.Value
-        if isinstance(term, FrameVariant):
-            return term.get_value()
-        if isinstance(term, Token):
-            return term.get_meta_value()
-        if isinstance(term, str):
-            return term.replace('_', ' ')
-
-        return term
-
-    def __to_data(self, samples, result, obj_color_types, rel_color_types, label_to_rel, docs_range):
+    @lru_cache(maxsize=65536)
+    def __word_to_text(term):
+        token = Tokens.try_parse(term)
+        if token is not None:
+            return token.get_meta_value()
+        return term.replace('_', ' ')
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def __frame_to_text(term):
+        return FrameVariant(text=term, frame_id="0").get_value()
+
+    @staticmethod
+    def __read_or_slice(filepath, rows, bounds, chunk_size, col_types=None):
+        """ Provides rows: all at once, by chunks of `chunk_size` rows, or only within the
+            bounds (index of the first row and rows count), either from file or already read rows.
+        """
+        if rows is not None:
+            if bounds is None:
+                return rows
+            assert(isinstance(rows, (BaseRowsStorage, DataFrameRows)))
+            skip_rows, rows_count = bounds
+            frames = list(BratBackend.__iter_frames(rows))
+            assert(len(frames) == 1)
+            offset, df = frames[0]
+            return DataFrameRows(df.iloc[skip_rows - offset:skip_rows - offset + rows_count], offset=skip_rows)
+
+        if bounds is not None:
+            skip_rows, rows_count = bounds
+            return DataFrameRows(read_tsv_rows(filepath, skip_rows=skip_rows, rows_count=rows_count,
+                                               col_types=col_types),
+                                 offset=skip_rows)
+
+        if chunk_size is not None:
+            return TsvChunkedRows(filepath, chunk_size=chunk_size, col_types=col_types)
+
+        return BaseRowsStorage.from_tsv(filepath, col_types=col_types)
+
+    @staticmethod
+    def __read_rows(samples_data_filepath, result_data_filepath, docs_range, chunk_size=None,
+                    samples=None, result=None):
+        """ Provides samples and result rows, either all at once,
+            by chunks of `chunk_size` rows, or only the rows of documents within the range.
+            Rows are read from files unless they were already read (`samples` and `result`).
+        """
+        # Reading only rows of the documents within the range.
+        # Result rows are aligned with the samples rows.
+        bounds = None
+        if docs_range is not None:
+            index = get_docs_index(samples_data_filepath) if samples is None else \
+                build_docs_index_from_frames(BratBackend.__iter_frames(samples))
+            bounds = find_docs_range_rows(index=index, docs_range=docs_range)
+
+        samples = BratBackend.__read_or_slice(samples_data_filepath, rows=samples, bounds=bounds,
+                                              chunk_size=chunk_size, col_types={'frames': str})
+
+        if result_data_filepath is not None or result is not None:
+            result = BratBackend.__read_or_slice(result_data_filepath, rows=result, bounds=bounds,
+                                                 chunk_size=chunk_size)
+
+        return samples, result
+
+    @staticmethod
+    def __write_list_item(stream, item, is_first):
+        if not is_first:
+            stream.write(", ")
+        stream.write(dumps_script_json(item))
+
+    @staticmethod
+    def __coll_data_key(obj_color_types, rel_color_types):
+        return json.dumps([obj_color_types, rel_color_types], sort_keys=True)
+
+    def __provide_coll_data(self, obj_color_types, rel_color_types):
         assert(isinstance(obj_color_types, dict))
         assert(isinstance(rel_color_types, dict))
-        assert(isinstance(label_to_rel, dict))
-        assert(isinstance(samples, BaseRowsStorage))
-        assert(isinstance(result, BaseRowsStorage) or result is None)
-
-        # Composing whole output document text.
-        text_terms, relations = self.__extract_data_from_samples(
-            samples=samples,
-            docs_range=docs_range)
 
-        text = " ".join([self.__term_to_text(t) for t in text_terms])
+        key = self.__coll_data_key(obj_color_types, rel_color_types)
 
-        # Defining the source of labels: from result or predefined.
-        labels_src = self.__iter_predicted_labels(result, label_to_rel) \
-            if result is not None else self.__iter_sample_labels(samples, label_to_rel)
+        cached = BratBackend.__coll_data_cache.get(key, None)
+        if cached is not None:
+            return cached
 
-        # Filling coll data.
         coll_data = dict()
         coll_data['entity_types'] = self.__create_object_types(obj_color_types)
         coll_data['relation_types'] = self.__create_relation_types(
             relation_color_types=rel_color_types,
             entity_types=list(obj_color_types.keys()))
 
-        # Filling doc data.
-        doc_data = dict()
-        doc_data['text'] = text
-        doc_data['entities'] = self.__extract_objects(text_terms)
-        doc_data['relations'] = self.__extract_relations(relations, labels_src)
+        coll_data_json = json.dumps(coll_data)
+        cached = (coll_data, coll_data_json, hashlib.sha1(coll_data_json.encode('utf-8')).hexdigest())
+        BratBackend.__coll_data_cache[key] = cached
+
+        return cached
+
+    def create_coll_data(self, obj_color_types, rel_color_types):
+        """ Provides collection data, which is created once per colors configuration
+            and shared, i.e. expected to be kept unmodified.
+        """
+        return self.__provide_coll_data(obj_color_types, rel_color_types)[0]
+
+    def serialize_coll_data(self, obj_color_types, rel_color_types):
+        """ Provides collection data, serialized in JSON.
+        """
+        return self.__provide_coll_data(obj_color_types, rel_color_types)[1]
 
-        return text, coll_data, doc_data
+    def get_coll_data_hash(self, obj_color_types, rel_color_types):
+        """ Provides hash of the serialized collection data, which might be used as a resource name.
+        """
+        return self.__provide_coll_data(obj_color_types, rel_color_types)[2]
 
     def to_data(self, obj_color_types, rel_color_types, samples_data_filepath,
-                result_data_filepath, label_to_rel, docs_range=None):
+                result_data_filepath, label_to_rel, docs_range=None, samples=None, result=None):
+        """ samples, result: BaseRowsStorage, DataFrameRows or None
+                already read rows of the samples and results respectively,
+                which are utilized instead of reading the related files.
+        """
+        assert(isinstance(docs_range, tuple) or docs_range is None)
+        assert(isinstance(label_to_rel, dict))
+
+        samples, result = self.__read_rows(samples_data_filepath=samples_data_filepath,
+                                           result_data_filepath=result_data_filepath,
+                                           docs_range=docs_range,
+                                           samples=samples,
+                                           result=result)
+
+        # Composing whole output document text.
+        texts = []
+        entities = []
+        relations = []
+        for doc_text, doc_entities, doc_relations in self.__iter_docs_chunks(
+                samples=samples, result=result, label_to_rel=label_to_rel, docs_range=docs_range):
+            texts.append(doc_text)
+            entities.extend(doc_entities)
+            relations.extend(doc_relations)
+
+        text = " ".join(texts)
+
+        # Filling doc data.
+        doc_data = dict()
+        doc_data['text'] = text
+        doc_data['entities'] = entities
+        doc_data['relations'] = relations
+
+        return {"text": text,
+                "coll_data": self.create_coll_data(obj_color_types=obj_color_types, rel_color_types=rel_color_types),
+                "doc_data": doc_data}
+
+    def write_doc_data(self, stream, samples_data_filepath, result_data_filepath, label_to_rel,
+                       docs_range=None, chunk_size=10000, text_stream=None):
+        """ Writes BRAT doc_data in JSON format into the text stream (file or socket file) document by document.
+            Samples are read by chunks of `chunk_size` rows; text is written straight away, while entities
+            and relations are spooled into temporary files and appended afterwards,
+            so that memory consumption does not depend on the amount of documents.
+
+            text_stream: text stream or None
+                optional stream for the output text (unescaped).
+        """
         assert(isinstance(docs_range, tuple) or docs_range is None)
         assert(isinstance(label_to_rel, dict))
 
-        text, coll_data, doc_data = self.__to_data(
-            samples=BaseRowsStorage.from_tsv(samples_data_filepath, col_types={'frames': str}),
-            result=BaseRowsStorage.from_tsv(result_data_filepath) if result_data_filepath is not None else None,
-            obj_color_types=obj_color_types,
-            rel_color_types=rel_color_types,
-            label_to_rel=label_to_rel,
-            docs_range=docs_range)
+        samples, result = self.__read_rows(samples_data_filepath=samples_data_filepath,
+                                           result_data_filepath=result_data_filepath,
+                                           docs_range=docs_range,
+                                           chunk_size=chunk_size)
+
+        with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as entities_file, \
+                tempfile.TemporaryFile(mode="w+", encoding="utf-8") as relations_file:
+
+            entities_count = 0
+            relations_count = 0
+
+            stream.write('{"text": "')
+
+            for doc_ind, (doc_text, doc_entities, doc_relations) in enumerate(self.__iter_docs_chunks(
+                    samples=samples, result=result, label_to_rel=label_to_rel, docs_range=docs_range)):
+
+                if doc_ind > 0:
+                    doc_text = " " + doc_text
+
+                # Writing escaped contents of the text.
+                stream.write(dumps_script_json(doc_text)[1:-1])
+
+                if text_stream is not None:
+                    text_stream.write(doc_text)
+
+                for entity in doc_entities:
+                    self.__write_list_item(entities_file, entity, is_first=entities_count == 0)
+                    entities_count += 1
+
+                for relation in doc_relations:
+                    self.__write_list_item(relations_file, relation, is_first=relations_count == 0)
+                    relations_count += 1
+
+            stream.write('", "entities": [')
+            entities_file.seek(0)
+            shutil.copyfileobj(entities_file, stream)
 
-        return {"text": text, "coll_data": coll_data, "doc_data": doc_data}
+            stream.write('], "relations": [')
+            relations_file.seek(0)
+            shutil.copyfileobj(relations_file, stream)
 
+            stream.write(']}')
@@ -0,0 +1,190 @@
+import html
+import io
+import json
+import os
+import re
+import tempfile
+
+PLACEHOLDER_PATTERN = r"\$____([A-Z_]+)____"
+
+
+def split_template(template):
+    """ Splits template into the list of literal parts and placeholders names,
+        where placeholders names are at odd positions.
+    """
+    return re.split(PLACEHOLDER_PATTERN, template)
+
+
+class BratTemplate(object):
+    """ Template, which is split once into the static chunks and placeholder slots.
+        Placeholders are declared as `$____NAME____`.
+    """
+
+    # Templates, loaded within the current process: filepath -> (mtime, template).
+    __loaded = {}
+
+    def __init__(self, template):
+        assert(isinstance(template, str))
+        self.__parts = split_template(template)
+
+    @property
+    def Placeholders(self):
+        return self.__parts[1::2]
+
+    @classmethod
+    def load(cls, filepath):
+        """ Provides template of the file, which is read again only in case of modification.
+        """
+        filepath = os.path.abspath(filepath)
+        mtime = os.stat(filepath).st_mtime
+
+        loaded = cls.__loaded.get(filepath, None)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+
+        with open(filepath, "r", encoding="utf-8") as f:
+            template = cls(f.read())
+
+        cls.__loaded[filepath] = (mtime, template)
+
+        return template
+
+    def bind(self, values):
+        """ Provides template, in which the placeholders with string values are replaced.
+        """
+        assert(isinstance(values, dict))
+        template = BratTemplate("")
+        template.__parts = self.__resolve(values)
+        return template
+
+    def write(self, output, values):
+        """ Writes template into the text stream.
+
+            values: dict
+                placeholder name -> str, or func(output) which writes the value into the stream.
+                Placeholders without values are kept as is.
+        """
+        assert(isinstance(values, dict))
+
+        for i, part in enumerate(self.__parts):
+            if i % 2 == 0:
+                output.write(part)
+                continue
+
+            value = values.get(part, None)
+            if value is None:
+                output.write("$____{}____".format(part))
+            elif callable(value):
+                value(output)
+            else:
+                output.write(value)
+
+    def render(self, values):
+        output = io.StringIO()
+        self.write(output, values)
+        return output.getvalue()
+
+    # region private methods
+
+    def __resolve(self, values):
+        parts = [self.__parts[0]]
+        for i in range(1, len(self.__parts), 2):
+            value = values.get(self.__parts[i], None)
+            if isinstance(value, str):
+                # Merge value with the literal parts.
+                parts[-1] += value + self.__parts[i + 1]
+            else:
+                parts.extend([self.__parts[i], self.__parts[i + 1]])
+        return parts
+
+    # endregion
+
+
+def escape_script_json(json_str):
+    """ Escapes characters of JSON, which allow to leave the html <script> element
+        (e.g. the "</script>" within the user text). The result remains a valid JSON.
+    """
+    return json_str.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+def dumps_script_json(data):
+    return escape_script_json(json.dumps(data))
+
+
+def json_value(data):
+    """ Value of the template, which serializes data into the stream (safe for the <script> element).
+    """
+
+    def __write(output):
+        for chunk in json.JSONEncoder().iterencode(data):
+            output.write(escape_script_json(chunk))
+
+    return __write
+
+
+def text_value(text):
+    """ Value of the template for the text, which is placed within html elements.
+    """
+    return html.escape(text)
+
+
+# Collection data, provided by a separate script (see `write_coll_data_script`).
+# Object is filled by the script, which is loaded by head.js before the visualization.
+COLL_DATA_LOADER = "((window.bratCollData = window.bratCollData || {{}}), head.js({url}), window.bratCollData)"
+
+
+def coll_data_script_name(coll_data_hash):
+    return "coll_data.{}.js".format(coll_data_hash)
+
+
+def write_coll_data_script(filepath, coll_data_json):
+    """ Writes collection data as a script, which might be shared by the pages and cached by browsers.
+    """
+    assert(isinstance(coll_data_json, str))
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("window.bratCollData = Object.assign(window.bratCollData || {{}}, {});\n".format(coll_data_json))
+
+
+def write_html(output, template, coll_data, brat_url, write_doc_data_func, coll_data_url=None):
+    """ Writes BRAT html page into the output text stream.
+        Document data is written by `write_doc_data_func(stream, text_stream)`,
+        where text stream is optional (None) and receives the document text.
+
+        coll_data: dict or str
+            collection data or its JSON.
+        coll_data_url: str or None
+            url of the collection data script, referenced instead of embedding `coll_data`.
+    """
+    assert(isinstance(template, BratTemplate))
+    assert(isinstance(coll_data, (dict, str)))
+    assert(callable(write_doc_data_func))
+
+    placeholders = template.Placeholders
+
+    if coll_data_url is not None:
+        coll_data_value = COLL_DATA_LOADER.format(url=json.dumps(coll_data_url))
+    else:
+        coll_data_value = coll_data if isinstance(coll_data, str) else json_value(coll_data)
+
+    # Text is kept in case of the related placeholder only.
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as text_file:
+
+        is_doc_data_written = []
+
+        def __write_doc_data(stream):
+            write_doc_data_func(stream, text_file if "TEXT" in placeholders else None)
+            is_doc_data_written.append(True)
+
+        def __write_text(stream):
+            # Text becomes available once the document data has been written.
+            assert(len(is_doc_data_written) > 0)
+            text_file.seek(0)
+            for chunk in iter(lambda: text_file.read(1 << 16), ""):
+                stream.write(text_value(chunk))
+
+        template.write(output, {
+            "COL_DATA_SEM": coll_data_value,
+            "BRAT_URL": brat_url,
+            "DOC_DATA_SEM": __write_doc_data,
+            "TEXT": __write_text
+        })
@@ -0,0 +1,163 @@
+import glob
+import json
+import os
+from multiprocessing import Pool
+from os.path import join, exists, dirname, getmtime
+
+from arelight.brat_backend import BratBackend
+from arelight.brat_html import BratTemplate, write_html, write_coll_data_script, coll_data_script_name
+from arelight.readers.docs_index import get_docs_index
+from arelight.serving.precompressed import ENCODINGS_EXTENSIONS, ETAG_EXTENSION
+
+MANIFEST_FILENAME = "manifest.json"
+PAGE_FILENAME_PATTERN = "page-{}.html"
+
+
+def __remove_pages(target_dir):
+    """ Removes pages of the previous manifest as well as their compressed variants and entity tags.
+    """
+    extensions = [""] + list(ENCODINGS_EXTENSIONS.values()) + [ETAG_EXTENSION]
+    for page_filepath in glob.glob(join(target_dir, PAGE_FILENAME_PATTERN.format("*"))):
+        for ext in extensions:
+            if exists(page_filepath + ext):
+                os.remove(page_filepath + ext)
+
+
+def create_pages_manifest(target_dir, samples_filepath, result_filepath, template_filepath,
+                          label_to_rel, obj_color_types, rel_color_types, brat_url, docs_per_page=1):
+    """ Splits documents of the samples into pages of `docs_per_page` documents and saves the
+        manifest, which contains everything required for rendering pages independently.
+        Pages themselves are not rendered, while collection data is saved once as a script,
+        shared by all the pages. Pages of the previous manifest of the `target_dir` are removed.
+    """
+    assert(isinstance(docs_per_page, int) and docs_per_page > 0)
+    assert(isinstance(label_to_rel, dict))
+
+    doc_ids = sorted(get_docs_index(samples_filepath))
+
+    pages = []
+    for i in range(0, len(doc_ids), docs_per_page):
+        page_doc_ids = doc_ids[i:i + docs_per_page]
+        pages.append({"docs_range": [page_doc_ids[0], page_doc_ids[-1]],
+                      "filename": PAGE_FILENAME_PATTERN.format(len(pages))})
+
+    brat_be = BratBackend()
+    coll_data_script = coll_data_script_name(
+        brat_be.get_coll_data_hash(obj_color_types=obj_color_types, rel_color_types=rel_color_types))
+
+    manifest = {
+        "samples": os.path.abspath(samples_filepath),
+        "result": os.path.abspath(result_filepath) if result_filepath is not None else None,
+        "template": os.path.abspath(template_filepath),
+        "label_to_rel": label_to_rel,
+        "obj_color_types": obj_color_types,
+        "rel_color_types": rel_color_types,
+        "brat_url": brat_url,
+        "coll_data_script": coll_data_script,
+        "pages": pages
+    }
+
+    if not exists(target_dir):
+        os.makedirs(target_dir)
+
+    write_coll_data_script(filepath=join(target_dir, coll_data_script),
+                           coll_data_json=brat_be.serialize_coll_data(obj_color_types=obj_color_types,
+                                                                      rel_color_types=rel_color_types))
+
+    # Manifest is replaced at once, so that readers never observe a partial manifest.
+    manifest_filepath = join(target_dir, MANIFEST_FILENAME)
+    tmp_filepath = "{}.{}.tmp".format(manifest_filepath, os.getpid())
+    with open(tmp_filepath, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_filepath, manifest_filepath)
+
+    # Pages are removed after the manifest replacement, so they could not be rendered from the previous one.
+    __remove_pages(target_dir)
+
+    return manifest_filepath
+
+
+def read_manifest(manifest_filepath):
+    with open(manifest_filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def render_page(manifest_filepath, page_ind, force=False):
+    """ Provides filepath of the page, which is rendered in case of absence,
+        or in case of the page is older than the manifest.
+        Pages are independent, so they might be rendered in parallel.
+    """
+    manifest = read_manifest(manifest_filepath)
+    page = manifest["pages"][page_ind]
+    page_filepath = join(dirname(manifest_filepath), page["filename"])
+
+    if exists(page_filepath) and not force and getmtime(page_filepath) >= getmtime(manifest_filepath):
+        return page_filepath
+
+    brat_be = BratBackend()
+
+    template = BratTemplate.load(manifest["template"])
+
+    def __write_doc_data(stream, text_stream):
+        brat_be.write_doc_data(stream=stream,
+                               samples_data_filepath=manifest["samples"],
+                               result_data_filepath=manifest["result"],
+                               label_to_rel=manifest["label_to_rel"],
+                               docs_range=tuple(page["docs_range"]),
+                               text_stream=text_stream)
+
+    # Page is written into the temporary file first, so that readers never observe a partial page.
+    tmp_filepath = "{}.{}.tmp".format(page_filepath, os.getpid())
+    with open(tmp_filepath, "w", encoding="utf-8") as output:
+        write_html(output=output,
+                   template=template,
+                   coll_data=brat_be.serialize_coll_data(obj_color_types=manifest["obj_color_types"],
+                                                         rel_color_types=manifest["rel_color_types"]),
+                   coll_data_url=manifest.get("coll_data_script", None),
+                   brat_url=manifest["brat_url"],
+                   write_doc_data_func=__write_doc_data)
+
+    os.replace(tmp_filepath, page_filepath)
+
+    return page_filepath
+
+
+def find_page_ind(manifest, filename):
+    """ Provides index of the page of the manifest with the given filename, or None if it is missed.
+    """
+    for page_ind, page in enumerate(manifest["pages"]):
+        if page["filename"] == filename:
+            return page_ind
+    return None
+
+
+def create_lazy_render_func(pages_dir):
+    """ Provides func(name) -> filepath, which renders the page of the manifest within `pages_dir`
+        on demand; None is provided in case of the absence of the manifest or the page.
+    """
+    manifest_filepath = join(pages_dir, MANIFEST_FILENAME)
+
+    def __render(name):
+        if not exists(manifest_filepath):
+            return None
+        page_ind = find_page_ind(read_manifest(manifest_filepath), name)
+        return render_page(manifest_filepath, page_ind) if page_ind is not None else None
+
+    return __render
+
+
+def __render_page_args(args):
+    return render_page(*args)
+
+
+def render_pages(manifest_filepath, processes=1, force=False):
+    """ Renders all the pages of the manifest, optionally within the pool of processes.
+    """
+    args = [(manifest_filepath, page_ind, force)
+            for page_ind in range(len(read_manifest(manifest_filepath)["pages"]))]
+
+    if processes == 1:
+        return [__render_page_args(a) for a in args]
+
+    with Pool(processes=processes) as pool:
+        return pool.map(__render_page_args, args)
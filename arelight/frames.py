@@ -0,0 +1,57 @@
+from arekit.contrib.source.rusentiframes.collection import RuSentiFramesCollection
+from arekit.contrib.source.rusentiframes.labels_fmt import RuSentiFramesLabelsFormatter, \
+    RuSentiFramesEffectLabelsFormatter
+from arekit.contrib.source.rusentiframes.types import RuSentiFramesVersions
+
+from arelight.network.nn.common import create_and_fill_variant_collection
+from arelight.pipelines.demo.labels.base import PositiveLabel, NegativeLabel
+from arelight.snapshot import load_snapshot, save_snapshot, get_package_version
+
+# Collections, loaded within the current process.
+# Being filled before the fork, they are shared by workers as a read-only copy.
+_collections = {}
+
+
+def __create_signature(version):
+    return "rusentiframes", version.value, get_package_version("arekit")
+
+
+def __read(version):
+    frames_collection = RuSentiFramesCollection.read_collection(
+        version=version,
+        labels_fmt=RuSentiFramesLabelsFormatter(
+            pos_label_type=PositiveLabel, neg_label_type=NegativeLabel),
+        effect_labels_fmt=RuSentiFramesEffectLabelsFormatter(
+            pos_label_type=PositiveLabel, neg_label_type=NegativeLabel))
+
+    return frames_collection, create_and_fill_variant_collection(frames_collection)
+
+
+def __load(version, snapshot_filepath):
+    if snapshot_filepath is None:
+        return __read(version)
+
+    signature = __create_signature(version)
+    collections = load_snapshot(snapshot_filepath, signature=signature)
+
+    if collections is None:
+        collections = __read(version)
+        # Collections are provided even if the snapshot could not be saved.
+        save_snapshot(snapshot_filepath, signature=signature, data=collections)
+
+    return collections
+
+
+def read_frames_collections(version=RuSentiFramesVersions.V20, snapshot_filepath=None):
+    """ Provides RuSentiFrames collection and the related frame variants collection.
+        Both are read lazily (once per process) from the snapshot file if the latter provided,
+        and are expected to be utilized in read-only mode.
+    """
+    assert(isinstance(version, RuSentiFramesVersions))
+
+    key = (version, snapshot_filepath)
+
+    if key not in _collections:
+        _collections[key] = __load(version=version, snapshot_filepath=snapshot_filepath)
+
+    return _collections[key]
@@ -0,0 +1,80 @@
+import numpy as np
+
+# Term label is the label of its first token.
+MERGE_FIRST = "first"
+# Term label has the most frequent type among the term tokens.
+MERGE_MAJORITY = "majority"
+# Terms of several tokens are considered as outside of entities.
+MERGE_OUTSIDE = "outside"
+
+MERGE_POLICIES = [MERGE_FIRST, MERGE_MAJORITY, MERGE_OUTSIDE]
+
+OUTSIDE_TAG = "O"
+
+
+def align_tokens_to_terms(terms, tokens):
+    """ Provides index of the term for every token.
+        Tokens are expected to cover the terms text consequently (without spaces),
+        so the term of the token is the one, which bounds contain the token start.
+    """
+    term_ends = np.cumsum(np.fromiter((len(t) for t in terms), dtype=np.int64, count=len(terms)))
+    token_lengths = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    token_starts = np.cumsum(token_lengths) - token_lengths
+    return np.minimum(np.searchsorted(term_ends, token_starts, side='right'), max(len(terms) - 1, 0))
+
+
+def __split_tags(tags, separator):
+    parts = []
+    types = []
+    for tag in tags:
+        part, _, tag_type = tag.partition(separator)
+        parts.append(part)
+        types.append(tag_type)
+    return parts, types
+
+
+def align_labels(terms, tokens, labels, policy=MERGE_FIRST, separator='-'):
+    """ Provides label of every term, which is covered by tokens, where tokens have `labels`.
+        Labels of the term tokens are merged according to the `policy`.
+    """
+    assert(len(tokens) == len(labels))
+    assert(policy in MERGE_POLICIES)
+
+    if len(tokens) == 0:
+        return []
+
+    term_inds = align_tokens_to_terms(terms, tokens)
+
+    # Index of the first token of every term; terms without tokens are absent.
+    is_first = np.concatenate(([True], term_inds[1:] != term_inds[:-1]))
+    first_token_inds = np.flatnonzero(is_first)
+    tokens_count = np.diff(np.append(first_token_inds, len(tokens)))
+
+    labels = np.asarray(labels, dtype=object)
+    term_labels = labels[first_token_inds]
+
+    if policy == MERGE_OUTSIDE:
+        term_labels[tokens_count > 1] = OUTSIDE_TAG
+
+    elif policy == MERGE_MAJORITY and (tokens_count > 1).any():
+        vocab, codes = np.unique(labels, return_inverse=True)
+        parts, types = __split_tags(vocab, separator)
+        types_vocab, type_codes = np.unique(types, return_inverse=True)
+
+        # Amount of tokens of every type within every term.
+        terms_order = np.cumsum(is_first) - 1
+        counts = np.zeros((len(first_token_inds), len(types_vocab)), dtype=np.int64)
+        np.add.at(counts, (terms_order, type_codes[codes]), 1)
+        majority_types = types_vocab[counts.argmax(axis=1)]
+
+        first_parts = np.asarray(parts, dtype=object)[codes[first_token_inds]]
+
+        term_labels = np.array([
+            OUTSIDE_TAG if t == "" else (p if p != OUTSIDE_TAG else "B") + separator + t
+            for p, t in zip(first_parts, majority_types)], dtype=object)
+
+    result = [OUTSIDE_TAG] * len(terms)
+    for term_ind, label in zip(term_inds[first_token_inds], term_labels):
+        result[term_ind] = label
+
+    return result
@@ -17,50 +17,57 @@ class BaseNER(object):
         assert(isinstance(sequences, list))
         seqs_tags = self._extract_tags(sequences)
         assert(len(sequences) == len(seqs_tags))
-
-        extracted = []
-        for sequence_ind, sequence in enumerate(sequences):
-            seq_tags = seqs_tags[sequence_ind]
-            objs_len = [len(entry) for entry in self.__merge(sequence, seq_tags)]
-            objs_type = [self.__tag_type(tag) for tag in seq_tags if self.__tag_part(tag) == self.begin_tag]
-            objs_positions = [j for j, tag in enumerate(seq_tags) if self.__tag_part(tag) == self.begin_tag]
-
-            assert(len(objs_len) == len(objs_type) == len(objs_positions))
-
-            seq_obj_descriptors = [NerObjectDescriptor(pos=objs_positions[i],
-                                                       length=objs_len[i],
-                                                       obj_type=objs_type[i])
-                                   for i in range(len(objs_len))]
-
-            extracted.append(seq_obj_descriptors)
-
-        return extracted
+        return [self.__decode(seq_tags) for seq_tags in seqs_tags]
 
     def _extract_tags(self, seqences):
         raise NotImplementedError()
 
     # region private methods
 
-    def __merge(self, terms, tags):
-        merged = []
-        for i, tag in enumerate(tags):
-            current_tag = self.__tag_part(tag)
-            if current_tag == self.begin_tag:
-                merged.append([terms[i]])
-            elif current_tag == self.inner_tag and len(merged) > 0:
-                merged[-1].append(terms[i])
-        return merged
+    # Tags vocabulary, shared by all the instances: tag -> (part code, type).
+    __tags = {}
 
-    @staticmethod
-    def __tag_part(tag):
-        assert(isinstance(tag, str))
-        return tag if BaseNER.separator not in tag \
-            else tag[:tag.index(BaseNER.separator)]
+    __OTHER = 0
+    __BEGIN = 1
+    __INNER = 2
 
     @staticmethod
-    def __tag_type(tag):
+    def __parse_tag(tag):
         assert(isinstance(tag, str))
-        return "" if BaseNER.separator not in tag \
-            else tag[tag.index(BaseNER.separator) + 1:]
+        part, _, tag_type = tag.partition(BaseNER.separator)
+        if part == BaseNER.begin_tag:
+            return BaseNER.__BEGIN, tag_type
+        if part == BaseNER.inner_tag:
+            return BaseNER.__INNER, tag_type
+        return BaseNER.__OTHER, tag_type
+
+    def __decode(self, tags):
+        """ Provides objects of the sequence tags within a single pass.
+            Object starts with the begin tag, while the inner tags extend the last started object.
+        """
+        tags_vocab = BaseNER.__tags
+
+        positions = []
+        lengths = []
+        types = []
+
+        for j, tag in enumerate(tags):
+
+            parsed = tags_vocab.get(tag, None)
+            if parsed is None:
+                parsed = self.__parse_tag(tag)
+                tags_vocab[tag] = parsed
+
+            part, tag_type = parsed
+
+            if part == self.__BEGIN:
+                positions.append(j)
+                lengths.append(1)
+                types.append(tag_type)
+            elif part == self.__INNER and len(lengths) > 0:
+                lengths[-1] += 1
+
+        return [NerObjectDescriptor(pos=positions[i], length=lengths[i], obj_type=types[i])
+                for i in range(len(positions))]
 
     # endregion
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from arelight.ner.obj_desc import NerObjectDescriptor
+
+
+class NerCache(object):
+    """ Content-addressed cache of the NER results: hash of the sequence terms
+        is mapped onto the list of (pos, length, type) descriptors.
+        Results are kept in memory (LRU of `capacity` sequences) and optionally
+        in SQLite database of `filepath`, shared across runs.
+        Results of the other model (`model_key`) are never provided.
+    """
+
+    __TERMS_SEPARATOR = "\x1f"
+
+    def __init__(self, model_key, capacity=100000, filepath=None):
+        assert(isinstance(model_key, str))
+        assert(isinstance(capacity, int) and capacity >= 0)
+        self.__model_key = model_key
+        self.__capacity = capacity
+        self.__memory = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__db = self.__open_db(filepath, model_key) if filepath is not None else None
+
+        self.__memory_hits = 0
+        self.__disk_hits = 0
+        self.__misses = 0
+
+    # region properties
+
+    @property
+    def Hits(self):
+        return self.__memory_hits + self.__disk_hits
+
+    @property
+    def Misses(self):
+        return self.__misses
+
+    @property
+    def HitRate(self):
+        total = self.Hits + self.Misses
+        return self.Hits / total if total > 0 else 0.0
+
+    # endregion
+
+    # region private methods
+
+    @staticmethod
+    def __open_db(filepath, model_key):
+        db = sqlite3.connect(filepath, check_same_thread=False)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS ner (key BLOB PRIMARY KEY, objects TEXT)")
+
+        row = db.execute("SELECT value FROM meta WHERE name = 'model'").fetchone()
+        if row is None or row[0] != model_key:
+            # Results of the other model become outdated.
+            db.execute("DELETE FROM ner")
+            db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('model', ?)", (model_key,))
+
+        db.commit()
+        return db
+
+    def __key(self, terms):
+        h = hashlib.sha1(self.__model_key.encode("utf-8"))
+        h.update(self.__TERMS_SEPARATOR.join(terms).encode("utf-8"))
+        return h.digest()
+
+    def __memorize(self, key, objects):
+        if self.__capacity == 0:
+            return
+        self.__memory[key] = objects
+        self.__memory.move_to_end(key)
+        while len(self.__memory) > self.__capacity:
+            self.__memory.popitem(last=False)
+
+    @staticmethod
+    def __to_descriptors(objects):
+        return [NerObjectDescriptor(pos=pos, length=length, obj_type=obj_type)
+                for pos, length, obj_type in objects]
+
+    # endregion
+
+    def get(self, terms):
+        """ Provides list of NerObjectDescriptor for the terms, or None in case of a miss.
+        """
+        assert(isinstance(terms, list))
+
+        key = self.__key(terms)
+
+        with self.__lock:
+
+            objects = self.__memory.get(key, None)
+            if objects is not None:
+                self.__memory.move_to_end(key)
+                self.__memory_hits += 1
+                return self.__to_descriptors(objects)
+
+            row = self.__db.execute("SELECT objects FROM ner WHERE key = ?", (key,)).fetchone() \
+                if self.__db is not None else None
+
+            if row is None:
+                self.__misses += 1
+                return None
+
+            objects = [tuple(obj) for obj in json.loads(row[0])]
+            self.__memorize(key, objects)
+            self.__disk_hits += 1
+
+        return self.__to_descriptors(objects)
+
+    def put_many(self, sequences, descriptors):
+        """ Saves descriptors (lists of NerObjectDescriptor) of the related sequences.
+        """
+        assert(len(sequences) == len(descriptors))
+
+        records = []
+        for terms, seq_descriptors in zip(sequences, descriptors):
+            objects = [(d.Position, d.Length, d.ObjectType) for d in seq_descriptors]
+            records.append((self.__key(terms), objects))
+
+        with self.__lock:
+
+            for key, objects in records:
+                self.__memorize(key, objects)
+
+            if self.__db is not None:
+                self.__db.executemany("INSERT OR REPLACE INTO ner (key, objects) VALUES (?, ?)",
+                                      [(key, json.dumps(objects)) for key, objects in records])
+                self.__db.commit()
+
+    def get_stats(self):
+        return {
+            "memory_hits": self.__memory_hits,
+            "disk_hits": self.__disk_hits,
+            "misses": self.__misses,
+            "hit_rate": self.HitRate
+        }
+
+    def close(self):
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
@@ -1,5 +1,7 @@
 class NerObjectDescriptor:
 
+    __slots__ = ("__pos", "__len", "__obj_type")
+
     def __init__(self, pos, length, obj_type):
         self.__pos = pos
         self.__len = length
@@ -18,4 +20,4 @@ class NerObjectDescriptor:
         return self.__obj_type
 
     def get_range(self):
-        return self.__pos, self.__pos + self.__len
\ No newline at end of file
+        return self.__pos, self.__pos + self.__len
@@ -1,56 +1,107 @@
-import importlib
-
+from arelight.ner.alignment import align_labels, MERGE_FIRST, MERGE_POLICIES
 from arelight.ner.base import BaseNER
+from arelight.ner.cache import NerCache
+from arelight.ner.registry import get_model, ontonotes_bert_mult_config
+from arelight.ner.windows import create_windows, merge_windows_objects
+from arelight.snapshot import file_sha256
 
 
 class BertOntonotesNER(BaseNER):
 
-    def __init__(self):
+    def __init__(self, cache_capacity=100000, cache_filepath=None, merge_policy=MERGE_FIRST,
+                 window_size=128, window_overlap=16):
+        """ merge_policy: str
+                policy of merging labels of the tokens of a single term (see `MERGE_POLICIES`).
+            window_size: int or None
+                max amount of terms, passed to the model at once; longer sequences are split
+                into windows, which share `window_overlap` terms. None disables splitting.
+            cache_capacity: int
+                amount of sequences, which results are kept in memory.
+            cache_filepath: str or None
+                SQLite database, in which results are kept across runs.
+        """
+
+        assert(merge_policy in MERGE_POLICIES)
+        assert(window_size is None or (isinstance(window_size, int) and 0 <= window_overlap < window_size))
+
+        self.__merge_policy = merge_policy
+        self.__window_size = window_size
+        self.__window_overlap = window_overlap
+        self.__cache_capacity = cache_capacity
+        self.__cache_filepath = cache_filepath
+
+        # Model and cache are initialized lazily on the first use.
+        self.__config_path = None
+        self.__cache = None
+
+    # region private methods
+
+    def __provide_config_path(self):
+        if self.__config_path is None:
+            self.__config_path = ontonotes_bert_mult_config()
+        return self.__config_path
+
+    def __extract_cached(self, sequences):
+        """ Provides cached results for the known sequences, while the rest are passed to the model.
+        """
+        extracted = [self.Cache.get(terms) for terms in sequences]
+        missed = [i for i, objects in enumerate(extracted) if objects is None]
+
+        if len(missed) == 0:
+            return extracted
+
+        missed_sequences = [sequences[i] for i in missed]
+        missed_extracted = super(BertOntonotesNER, self).extract(missed_sequences)
+        self.Cache.put_many(missed_sequences, missed_extracted)
+
+        for i, objects in zip(missed, missed_extracted):
+            extracted[i] = objects
+
+        return extracted
+
+    # endregion
+
+    @property
+    def Cache(self):
+        if self.__cache is None:
+            # Cached results depend on the model configuration and the labels merging.
+            model_key = "{}:{}".format(file_sha256(self.__provide_config_path()), self.__merge_policy)
+            self.__cache = NerCache(model_key=model_key,
+                                    capacity=self.__cache_capacity,
+                                    filepath=self.__cache_filepath)
+        return self.__cache
+
+    def preload(self):
+        """ Builds the model in advance, i.e. before forking workers, which then share it.
+        """
+        get_model(self.__provide_config_path())
+
+    def extract(self, sequences):
+        """ Long sequences are split into windows, which are processed together with the rest sequences.
+        """
+        assert(isinstance(sequences, list))
+
+        if self.__window_size is None:
+            return self.__extract_cached(sequences)
+
+        seqs_windows = [create_windows(len(terms), window_size=self.__window_size, overlap=self.__window_overlap)
+                        for terms in sequences]
+
+        windows_extracted = iter(self.__extract_cached(
+            [terms[start:end] for terms, windows in zip(sequences, seqs_windows) for start, end in windows]))
 
-        # Dynamic libraries import.
-        deeppavlov = importlib.import_module("deeppavlov")
-        build_model = deeppavlov.build_model
-        configs = deeppavlov.configs
+        extracted = []
+        for windows in seqs_windows:
+            windows_objects = [next(windows_extracted) for _ in windows]
+            extracted.append(windows_objects[0] if len(windows) == 1
+                             else merge_windows_objects(windows, windows_objects))
 
-        self.__ner_model = build_model(configs.ner.ner_ontonotes_bert_mult,
-                                       download=True)
+        return extracted
 
     # region Properties
 
     def _extract_tags(self, sequences):
-        tokens, labels = self.__ner_model(sequences)
-        gathered_labels_seq = []
-        for i, sequence in enumerate(sequences):
-            _, labels = self.__tokens_to_terms(terms=sequence, tokens=tokens[i], labels=labels[i])
-            gathered_labels_seq.append(self.__gather(labels))
-        return gathered_labels_seq
-
-    @staticmethod
-    def __tokens_to_terms(terms, tokens, labels):
-        def __cur_term():
-            return len(joined_tokens) - 1
-
-        assert (len(labels) == len(tokens))
-
-        terms_lengths = [len(term) for term in terms]
-        current_lengths = [0] * len(terms)
-        joined_tokens = [[]]
-        joined_labels = [[]]
-        for i, token in enumerate(tokens):
-            if current_lengths[__cur_term()] == terms_lengths[__cur_term()]:
-                joined_tokens.append([])
-                joined_labels.append([])
-            joined_tokens[-1].append(token)
-            joined_labels[-1].append(labels[i])
-            current_lengths[__cur_term()] += len(token)
-
-        return joined_tokens, joined_labels
-
-    @staticmethod
-    def __gather(labels_in_lists):
-        return [labels[0] if len(labels) == 1 else BertOntonotesNER.__gather_many(labels)
-                for labels in labels_in_lists]
-
-    @staticmethod
-    def __gather_many(labels):
-        return 'O'
+        tokens, labels = get_model(self.__provide_config_path())(sequences)
+        return [align_labels(terms=sequence, tokens=tokens[i], labels=labels[i],
+                             policy=self.__merge_policy, separator=self.separator)
+                for i, sequence in enumerate(sequences)]
@@ -0,0 +1,76 @@
+import importlib
+import logging
+import threading
+from os.path import isfile
+
+logger = logging.getLogger(__name__)
+
+# Process-wide models: config path -> model.
+# Models, built before forking, are shared by the forked workers (copy-on-write).
+__models = {}
+__lock = threading.Lock()
+
+
+def ontonotes_bert_mult_config():
+    """ Provides path to the DeepPavlov config of the multilingual BERT OntoNotes NER model.
+    """
+    deeppavlov = importlib.import_module("deeppavlov")
+    return deeppavlov.configs.ner.ner_ontonotes_bert_mult
+
+
+# Component parameters of the files, which are required for the model building.
+__FILE_PARAMS = ["vocab_file", "bert_config_file"]
+# Component parameters of the checkpoints (path prefixes) or files.
+__CHECKPOINT_PARAMS = ["load_path", "pretrained_bert"]
+__CHECKPOINT_EXTENSIONS = ["", ".index", ".meta"]
+
+
+def __iter_required_paths(config_path):
+    """ Provides paths of the concrete model files, mentioned by the config components,
+        each path is represented as the list of the alternatives.
+    """
+    utils = importlib.import_module("deeppavlov.core.commands.utils")
+    config = utils.parse_config(config_path)
+
+    for component in config.get("chainer", {}).get("pipe", []):
+        for param in __FILE_PARAMS:
+            if param in component:
+                yield [str(utils.expand_path(component[param]))]
+        for param in __CHECKPOINT_PARAMS:
+            if param in component:
+                path = str(utils.expand_path(component[param]))
+                yield [path + ext for ext in __CHECKPOINT_EXTENSIONS]
+
+
+def __is_downloaded(config_path):
+    """ Checks whether the model files, required by the config (checkpoints and vocabularies), are present.
+        Existence of the download directories is not enough, since they might be partially extracted.
+    """
+    try:
+        required_paths = list(__iter_required_paths(config_path))
+    except Exception as e:
+        logger.warning("Unable to check downloads of {}: {}".format(config_path, e))
+        return False
+
+    if len(required_paths) == 0:
+        return False
+
+    return all(any(isfile(path) for path in alternatives) for alternatives in required_paths)
+
+
+def get_model(config_path):
+    """ Provides DeepPavlov model of the config, which is built once on the first request.
+        Downloading is skipped once all the model files are present.
+    """
+    key = str(config_path)
+
+    with __lock:
+
+        model = __models.get(key, None)
+
+        if model is None:
+            deeppavlov = importlib.import_module("deeppavlov")
+            model = deeppavlov.build_model(config_path, download=not __is_downloaded(config_path))
+            __models[key] = model
+
+    return model
@@ -0,0 +1,60 @@
+from arelight.ner.obj_desc import NerObjectDescriptor
+
+
+def create_windows(length, window_size, overlap):
+    """ Provides bounds (start, end) of the windows of `window_size` terms, which cover the sequence
+        of `length` terms, where the neighboring windows share `overlap` terms.
+    """
+    assert(isinstance(window_size, int) and window_size > 0)
+    assert(isinstance(overlap, int) and 0 <= overlap < window_size)
+
+    if length <= window_size:
+        return [(0, length)]
+
+    step = window_size - overlap
+
+    windows = []
+    start = 0
+    while True:
+        end = min(start + window_size, length)
+        windows.append((start, end))
+        if end == length:
+            break
+        start += step
+
+    return windows
+
+
+def __owned_bounds(windows, i):
+    """ Every window owns the terms up to the center of the overlap with the neighboring windows.
+    """
+    start, end = windows[i]
+    owned_start = start if i == 0 else (start + windows[i - 1][1]) // 2
+    owned_end = end if i == len(windows) - 1 else (windows[i + 1][0] + end) // 2
+    return owned_start, owned_end
+
+
+def merge_windows_objects(windows, windows_objects):
+    """ Composes objects of the whole sequence from the objects of its windows.
+        Object belongs to the window which owns its first term, so that the objects within
+        the overlap are taken once. Objects, which intersect the already taken ones, are omitted.
+    """
+    assert(len(windows) == len(windows_objects))
+
+    merged = []
+    for i, (window, objects) in enumerate(zip(windows, windows_objects)):
+        owned_start, owned_end = __owned_bounds(windows, i)
+
+        for obj in objects:
+            assert(isinstance(obj, NerObjectDescriptor))
+            pos = window[0] + obj.Position
+
+            if not (owned_start <= pos < owned_end):
+                continue
+
+            if len(merged) > 0 and pos < merged[-1].Position + merged[-1].Length:
+                continue
+
+            merged.append(NerObjectDescriptor(pos=pos, length=obj.Length, obj_type=obj.ObjectType))
+
+    return merged
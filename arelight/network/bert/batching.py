@@ -0,0 +1,142 @@
+import queue
+import threading
+from itertools import islice
+
+
+def iter_length_bucketed_batches(lengths, batch_size, tokens_per_batch=None):
+    """ Groups indices of the items into batches of items with a similar length.
+        Items are sorted by length, so that every batch is padded up to the length
+        of its longest item rather than up to the maximum sequence length.
+
+        lengths: list
+            lengths of the items (in tokens).
+        batch_size: int
+            max amount of items in a single batch.
+        tokens_per_batch: int or None
+            max amount of tokens in a single batch, i.e. amount of items
+            multiplied by the longest item length (including the padding).
+    """
+    assert(isinstance(lengths, list))
+    assert(isinstance(batch_size, int) and batch_size > 0)
+    assert(isinstance(tokens_per_batch, int) or tokens_per_batch is None)
+
+    batch = []
+    batch_max_len = 0
+    for i in sorted(range(len(lengths)), key=lambda ind: lengths[ind]):
+
+        max_len = max(batch_max_len, lengths[i])
+
+        is_full = len(batch) >= batch_size or \
+            (tokens_per_batch is not None and max_len * (len(batch) + 1) > tokens_per_batch)
+
+        if len(batch) > 0 and is_full:
+            yield batch
+            batch = []
+            max_len = lengths[i]
+
+        batch.append(i)
+        batch_max_len = max_len
+
+    if len(batch) > 0:
+        yield batch
+
+
+def trim_features_padding(features):
+    """ Cuts the padding of the BERT input features down to the longest item of the batch.
+        NOTE: input mask is expected to be a sequence of ones, followed by the padding zeros.
+    """
+    assert(isinstance(features, list))
+
+    seq_len = max([sum(f.input_mask) for f in features])
+
+    for f in features:
+        f.input_ids = f.input_ids[:seq_len]
+        f.input_mask = f.input_mask[:seq_len]
+        f.input_type_ids = f.input_type_ids[:seq_len]
+
+    return features
+
+
+def iter_windowed_batches(items_it, window_size, features_func, batch_size, tokens_per_batch=None):
+    """ Groups items into batches of a similar length within bounded windows of `window_size` items,
+        so that only the features of a single window are kept at once.
+        Items of every window are converted into features by `features_func(window)` lazily,
+        i.e. once the batches of the prior window have been consumed.
+        Provides window items, indices of the batch items within the window,
+        batch features (trimmed padding) and whether the batch is the last one of the window.
+    """
+    assert(isinstance(window_size, int) and window_size > 0)
+    assert(callable(features_func))
+
+    items_it = iter(items_it)
+
+    while True:
+        window = list(islice(items_it, window_size))
+
+        if len(window) == 0:
+            break
+
+        features = features_func(window)
+        assert(len(features) == len(window))
+
+        lengths = [sum(f.input_mask) for f in features]
+        batches = list(iter_length_bucketed_batches(lengths=lengths,
+                                                    batch_size=batch_size,
+                                                    tokens_per_batch=tokens_per_batch))
+
+        for b_ind, batch_inds in enumerate(batches):
+            batch_features = trim_features_padding([features[i] for i in batch_inds])
+            yield window, batch_inds, batch_features, b_ind == len(batches) - 1
+
+        # Features of the window are released before the next one is created.
+        del features, batch_features
+
+
+def iter_prefetched(iterable, depth):
+    """ Performs iteration over `iterable` in a background thread, which is allowed
+        to stay ahead of the consumer by at most `depth` items (bounded queue).
+        Exceptions of the background iteration are raised on the consumer side.
+    """
+    assert(isinstance(depth, int) and depth > 0)
+
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    end = object()
+
+    def __put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __produce():
+        try:
+            for item in iterable:
+                if not __put(item):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            __put(end)
+
+    producer = threading.Thread(target=__produce)
+    producer.daemon = True
+    producer.start()
+
+    try:
+        while True:
+            item = items.get()
+            if item is end:
+                break
+            yield item
+    finally:
+        # Release the producer in case of the consumer leaves iteration earlier.
+        stop.set()
+        producer.join()
+
+    if len(errors) > 0:
+        raise errors[0]
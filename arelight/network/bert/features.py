@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+from os.path import join, exists, getmtime, getsize
+
+import numpy as np
+
+from arelight.snapshot import file_sha256
+
+
+class BertInputFeatures(object):
+    """ Input features of a single text pair, compatible with the DeepPavlov BERT models.
+    """
+
+    def __init__(self, input_ids, input_mask, input_type_ids):
+        self.input_ids = input_ids
+        self.input_mask = input_mask
+        self.input_type_ids = input_type_ids
+
+
+class BertFeaturesStore(object):
+    """ Tokenized BERT input features (input ids, masks and segment ids),
+        kept as compact int32 NumPy arrays of shape [samples_count, max_seq_length].
+        Arrays might be saved on disk and memory-mapped afterwards.
+    """
+
+    ARRAYS = ["input_ids", "input_mask", "input_type_ids"]
+    META_FILENAME = "meta.json"
+
+    def __init__(self, input_ids, input_mask, input_type_ids):
+        assert(input_ids.shape == input_mask.shape == input_type_ids.shape)
+        self.__arrays = {
+            "input_ids": input_ids,
+            "input_mask": input_mask,
+            "input_type_ids": input_type_ids
+        }
+
+    @property
+    def SamplesCount(self):
+        return self.__arrays["input_ids"].shape[0]
+
+    @classmethod
+    def from_texts(cls, proc, texts_a, texts_b, max_seq_length, chunk_size=1000):
+        """ Performs tokenization of the text pairs with the `proc` (BertPreprocessor)
+            by chunks of `chunk_size` pairs.
+        """
+        assert(len(texts_a) == len(texts_b))
+        assert(isinstance(max_seq_length, int))
+
+        shape = (len(texts_a), max_seq_length)
+        arrays = [np.zeros(shape, dtype=np.int32) for _ in cls.ARRAYS]
+
+        for i in range(0, len(texts_a), chunk_size):
+            features = proc(texts_a=texts_a[i:i + chunk_size], texts_b=texts_b[i:i + chunk_size])
+            for j, f in enumerate(features):
+                for array, name in zip(arrays, cls.ARRAYS):
+                    values = getattr(f, name)
+                    array[i + j, :len(values)] = values
+
+        return cls(*arrays)
+
+    @classmethod
+    def load(cls, target_dir, mmap=True):
+        mmap_mode = 'r' if mmap else None
+        return cls(*[np.load(join(target_dir, name + ".npy"), mmap_mode=mmap_mode) for name in cls.ARRAYS])
+
+    def save(self, target_dir):
+        if not exists(target_dir):
+            os.makedirs(target_dir)
+        for name in self.ARRAYS:
+            np.save(join(target_dir, name + ".npy"), self.__arrays[name])
+
+    def get_features(self, indices):
+        """ Provides list of features for the given samples indices.
+        """
+        rows = [self.__arrays[name][indices] for name in self.ARRAYS]
+        return [BertInputFeatures(*[r[i] for r in rows]) for i in range(len(indices))]
+
+
+def create_features_cache_dir(cache_dir, samples_filepath, vocab_filepath, do_lowercase, max_seq_length):
+    """ Provides directory of the features store, which is unique for the samples file (its size and
+        modification time), the vocabulary contents and the tokenization parameters.
+        Meta information is saved alongside.
+    """
+    meta = {
+        "samples": [os.path.abspath(samples_filepath), getsize(samples_filepath), getmtime(samples_filepath)],
+        "vocab": [os.path.abspath(vocab_filepath), file_sha256(vocab_filepath)],
+        "do_lowercase": do_lowercase,
+        "max_seq_length": max_seq_length
+    }
+
+    meta_str = json.dumps(meta, sort_keys=True)
+    target_dir = join(cache_dir, hashlib.sha1(meta_str.encode('utf-8')).hexdigest())
+
+    return target_dir, meta_str
+
+
+def load_or_create_features_store(cache_dir, samples_filepath, vocab_filepath, do_lowercase,
+                                  max_seq_length, create_func):
+    """ Loads memory-mapped features store from the cache in case of the latter
+        exists, or creates it via `create_func` and saves into cache otherwise.
+    """
+    target_dir, meta_str = create_features_cache_dir(cache_dir=cache_dir,
+                                                     samples_filepath=samples_filepath,
+                                                     vocab_filepath=vocab_filepath,
+                                                     do_lowercase=do_lowercase,
+                                                     max_seq_length=max_seq_length)
+
+    meta_filepath = join(target_dir, BertFeaturesStore.META_FILENAME)
+
+    if exists(meta_filepath):
+        with open(meta_filepath, "r") as f:
+            if f.read() == meta_str:
+                return BertFeaturesStore.load(target_dir, mmap=True)
+
+    store = create_func()
+    store.save(target_dir)
+
+    # Meta is written last, so that the partially saved store is never considered.
+    with open(meta_filepath, "w") as f:
+        f.write(meta_str)
+
+    return store
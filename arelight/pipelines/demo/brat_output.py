@@ -0,0 +1,53 @@
+from arekit.common.labels.scaler.base import BaseLabelScaler
+
+from arelight.pipelines.demo.labels.base import PositiveLabel, NegativeLabel
+from arelight.pipelines.items.backend_brat_html_stream import BratHtmlStreamingPipelineItem
+from arelight.pipelines.items.backend_brat_json import BratBackendContentsPipelineItem
+from arelight.pipelines.items.backend_brat_pages import BratPaginatedHtmlPipelineItem
+
+# BRAT contents, kept in memory, i.e. to be embedded into html page or provided by server.
+BRAT_OUTPUT_CONTENTS = "contents"
+# Single html page, written straight into the output file.
+BRAT_OUTPUT_STREAM = "stream"
+# Html pages of the manifest, which are rendered on demand.
+BRAT_OUTPUT_PAGES = "pages"
+
+BRAT_OUTPUT_TYPES = [BRAT_OUTPUT_CONTENTS, BRAT_OUTPUT_STREAM, BRAT_OUTPUT_PAGES]
+
+
+def create_brat_output_pipeline_item(output_type, labels_scaler, brat_url="http://localhost:8001/", processes=1):
+    """ Provides pipeline item, which composes BRAT output of the inference results.
+
+        processes: int
+            amount of processes, utilized for processing documents (rendering pages).
+    """
+    assert(output_type in BRAT_OUTPUT_TYPES)
+    assert(isinstance(labels_scaler, BaseLabelScaler))
+    assert(isinstance(processes, int) and processes > 0)
+
+    label_to_rel = {
+        str(labels_scaler.label_to_uint(PositiveLabel())): "POS",
+        str(labels_scaler.label_to_uint(NegativeLabel())): "NEG"
+    }
+    obj_color_types = {"ORG": '#7fa2ff', "GPE": "#7fa200", "PERSON": "#7f00ff", "Frame": "#00a2ff"}
+    rel_color_types = {"POS": "GREEN", "NEG": "RED"}
+
+    if output_type == BRAT_OUTPUT_STREAM:
+        return BratHtmlStreamingPipelineItem(label_to_rel=label_to_rel,
+                                             obj_color_types=obj_color_types,
+                                             rel_color_types=rel_color_types,
+                                             brat_url=brat_url,
+                                             processes=processes)
+
+    if output_type == BRAT_OUTPUT_PAGES:
+        return BratPaginatedHtmlPipelineItem(label_to_rel=label_to_rel,
+                                             obj_color_types=obj_color_types,
+                                             rel_color_types=rel_color_types,
+                                             brat_url=brat_url,
+                                             processes=processes)
+
+    return BratBackendContentsPipelineItem(label_to_rel=label_to_rel,
+                                           obj_color_types=obj_color_types,
+                                           rel_color_types=rel_color_types,
+                                           brat_url=brat_url,
+                                           processes=processes)
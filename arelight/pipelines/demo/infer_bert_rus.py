@@ -7,8 +7,7 @@ from arekit.contrib.networks.core.predict.tsv_writer import TsvPredictWriter
 from arekit.contrib.utils.io_utils.samples import SamplesIO
 from arekit.contrib.utils.pipelines.items.sampling.bert import BertExperimentInputSerializerPipelineItem
 
-from arelight.pipelines.demo.labels.base import PositiveLabel, NegativeLabel
-from arelight.pipelines.items.backend_brat_json import BratBackendContentsPipelineItem
+from arelight.pipelines.demo.brat_output import create_brat_output_pipeline_item, BRAT_OUTPUT_CONTENTS
 from arelight.pipelines.items.inference_bert import BertInferencePipelineItem
 from arelight.samplers.bert import create_bert_sample_provider
 from arelight.samplers.types import SampleFormattersService
@@ -23,7 +22,14 @@ def demo_infer_texts_bert_pipeline(texts_count,
                                    labels_scaler,
                                    text_b_type=SampleFormattersService.name_to_type("nli_m"),
                                    do_lowercase=False,
-                                   max_seq_length=128):
+                                   max_seq_length=128,
+                                   batch_size=10,
+                                   tokens_per_batch=None,
+                                   window_batches=32,
+                                   stream_chunk_size=None,
+                                   prefetch_batches=0,
+                                   brat_output=BRAT_OUTPUT_CONTENTS,
+                                   brat_processes=1):
     assert(isinstance(texts_count, int))
     assert(isinstance(output_dir, str))
     assert(isinstance(labels_scaler, BaseLabelScaler))
@@ -50,15 +56,16 @@ def demo_infer_texts_bert_pipeline(texts_count,
             vocab_filepath=bert_vocab_path,
             max_seq_length=max_seq_length,
             do_lowercase=do_lowercase,
-            labels_scaler=labels_scaler),
+            labels_scaler=labels_scaler,
+            batch_size=batch_size,
+            tokens_per_batch=tokens_per_batch,
+            window_batches=window_batches,
+            stream_chunk_size=stream_chunk_size,
+            prefetch_batches=prefetch_batches),
 
-        BratBackendContentsPipelineItem(label_to_rel={
-            str(labels_scaler.label_to_uint(PositiveLabel())): "POS",
-            str(labels_scaler.label_to_uint(NegativeLabel())): "NEG"
-        },
-            obj_color_types={"ORG": '#7fa2ff', "GPE": "#7fa200", "PERSON": "#7f00ff", "Frame": "#00a2ff"},
-            rel_color_types={"POS": "GREEN", "NEG": "RED"},
-        )
+        create_brat_output_pipeline_item(output_type=brat_output,
+                                         labels_scaler=labels_scaler,
+                                         processes=brat_processes)
     ])
 
     return pipeline
@@ -23,9 +23,8 @@ from arekit.contrib.utils.vectorizers.bpe import BPEVectorizer
 from arekit.contrib.utils.vectorizers.random_norm import RandomNormalVectorizer
 
 from arelight.network.nn.common import create_bags_collection_type, create_full_model_name
-from arelight.pipelines.demo.labels.base import PositiveLabel, NegativeLabel
+from arelight.pipelines.demo.brat_output import create_brat_output_pipeline_item, BRAT_OUTPUT_CONTENTS
 from arelight.pipelines.demo.labels.scalers import ThreeLabelScaler
-from arelight.pipelines.items.backend_brat_json import BratBackendContentsPipelineItem
 from arelight.pipelines.items.inference_nn import TensorflowNetworkInferencePipelineItem
 
 
@@ -37,7 +36,9 @@ def demo_infer_texts_tensorflow_nn_pipeline(texts_count,
                                             entity_fmt,
                                             frames_collection,
                                             bags_per_minibatch=2,
-                                            labels_scaler=ThreeLabelScaler()):
+                                            labels_scaler=ThreeLabelScaler(),
+                                            brat_output=BRAT_OUTPUT_CONTENTS,
+                                            brat_processes=1):
     assert(isinstance(texts_count, int))
     assert(isinstance(model_name, ModelNames))
 
@@ -101,13 +102,9 @@ def demo_infer_texts_tensorflow_nn_pipeline(texts_count,
                 TrainingStatProviderCallback(),
             ]),
 
-        BratBackendContentsPipelineItem(label_to_rel={
-            str(labels_scaler.label_to_uint(PositiveLabel())): "POS",
-            str(labels_scaler.label_to_uint(NegativeLabel())): "NEG"
-        },
-            obj_color_types={"ORG": '#7fa2ff', "GPE": "#7fa200", "PERSON": "#7f00ff", "Frame": "#00a2ff"},
-            rel_color_types={"POS": "GREEN", "NEG": "RED"},
-        ),
+        create_brat_output_pipeline_item(output_type=brat_output,
+                                         labels_scaler=labels_scaler,
+                                         processes=brat_processes)
     ])
 
     return pipeline
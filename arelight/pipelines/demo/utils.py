@@ -2,6 +2,8 @@ from arekit.common.text.stemmer import Stemmer
 from arekit.contrib.source.synonyms.utils import iter_synonym_groups
 from arekit.contrib.utils.synonyms.stemmer_based import StemmerBasedSynonymCollection
 
+from arelight.synonyms import read_stemmer_based_synonyms_collection
+
 
 def iter_groups(filepath):
     with open(filepath, 'r', encoding='utf-8') as file:
@@ -9,8 +11,19 @@ def iter_groups(filepath):
             yield group
 
 
-def read_synonyms_collection(synonyms_filepath, stemmer):
-    assert(iter_synonym_groups(stemmer, Stemmer))
+def read_synonyms_collection(synonyms_filepath, stemmer, snapshot_filepath=None):
+    """ snapshot_filepath: str or None
+            file of the stemmed values snapshot, which allows to avoid
+            stemming of the whole collection on every start.
+    """
+    assert(isinstance(stemmer, Stemmer))
+
+    if snapshot_filepath is not None:
+        return read_stemmer_based_synonyms_collection(
+            iter_group_values_lists=iter_groups(synonyms_filepath),
+            synonyms_filepath=synonyms_filepath,
+            stemmer=stemmer,
+            snapshot_filepath=snapshot_filepath)
 
     synonyms = StemmerBasedSynonymCollection(
         iter_group_values_lists=iter_groups(synonyms_filepath),
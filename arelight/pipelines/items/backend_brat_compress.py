@@ -0,0 +1,20 @@
+from arekit.common.pipeline.context import PipelineContext
+from arekit.common.pipeline.items.base import BasePipelineItem
+
+from arelight.serving.precompressed import write_precompressed
+
+
+class BratHtmlPrecompressPipelineItem(BasePipelineItem):
+    """ Writes compressed variants and entity tag of the BRAT html output
+        (filepath, provided by the previous item), which are then served as is.
+    """
+
+    def __init__(self, encodings=None):
+        assert(isinstance(encodings, list) or encodings is None)
+        self.__encodings = encodings
+
+    def apply_core(self, input_data, pipeline_ctx):
+        assert(isinstance(input_data, str))
+        assert(isinstance(pipeline_ctx, PipelineContext))
+        write_precompressed(input_data, encodings=self.__encodings)
+        return input_data
@@ -1,9 +1,10 @@
-import json
 from os.path import join
 
 from arekit.common.pipeline.context import PipelineContext
 from arekit.common.pipeline.items.base import BasePipelineItem
 
+from arelight.brat_html import BratTemplate, json_value, text_value
+
 
 class BratHtmlEmbeddingPipelineItem(BasePipelineItem):
 
@@ -15,15 +16,7 @@ class BratHtmlEmbeddingPipelineItem(BasePipelineItem):
         assert(isinstance(pipeline_ctx, PipelineContext))
 
         # Loading template file.
-        template_filepath = pipeline_ctx.provide_or_none("template_filepath")
-        with open(template_filepath, "r") as templateFile:
-            template = templateFile.read()
-
-        # Replace template placeholders.
-        template = template.replace("$____COL_DATA_SEM____", json.dumps(input_data["coll_data"]))
-        template = template.replace("$____DOC_DATA_SEM____", json.dumps(input_data["doc_data"]))
-        template = template.replace("$____BRAT_URL____", self.__brat_url)
-        template = template.replace("$____TEXT____", input_data["text"])
+        template = BratTemplate.load(pipeline_ctx.provide_or_none("template_filepath"))
 
         # Setup predicted result writer.
         template_fp = pipeline_ctx.provide_or_none("brat_vis_fp")
@@ -31,8 +24,13 @@ class BratHtmlEmbeddingPipelineItem(BasePipelineItem):
             exp_root = pipeline_ctx.provide_or_none("exp_root")
             template_fp = join(exp_root, "brat_output.html")
 
-        # Save results.
-        with open(template_fp, "w") as output:
-            output.write(template)
+        # Save results with the replaced template placeholders.
+        with open(template_fp, "w", encoding="utf-8") as output:
+            template.write(output, {
+                "COL_DATA_SEM": json_value(input_data["coll_data"]),
+                "DOC_DATA_SEM": json_value(input_data["doc_data"]),
+                "BRAT_URL": self.__brat_url,
+                "TEXT": text_value(input_data["text"])
+            })
 
-        return template
+        return template_fp
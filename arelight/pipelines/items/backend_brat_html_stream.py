@@ -0,0 +1,67 @@
+from os.path import join, dirname
+
+from arekit.common.experiment.data_type import DataType
+from arekit.common.pipeline.context import PipelineContext
+from arekit.common.pipeline.items.base import BasePipelineItem
+from arekit.contrib.utils.io_utils.samples import SamplesIO
+
+from arelight.brat_backend import BratBackend
+from arelight.brat_html import BratTemplate, write_html
+
+
+class BratHtmlStreamingPipelineItem(BasePipelineItem):
+    """ Writes BRAT html page for the samples and predicted results straight into
+        the output file, i.e. without keeping the whole contents in memory.
+        Replaces the `BratBackendContentsPipelineItem` + `BratHtmlEmbeddingPipelineItem` pair.
+    """
+
+    def __init__(self, label_to_rel, obj_color_types, rel_color_types, brat_url="http://localhost:8001/",
+                 chunk_size=10000, processes=1):
+        assert(isinstance(label_to_rel, dict))
+        assert(isinstance(obj_color_types, dict))
+        assert(isinstance(rel_color_types, dict))
+        self.__brat_be = BratBackend(processes=processes)
+        self.__label_to_rel = label_to_rel
+        self.__obj_color_types = obj_color_types
+        self.__rel_color_types = rel_color_types
+        self.__brat_url = brat_url
+        self.__chunk_size = chunk_size
+
+    def apply_core(self, input_data, pipeline_ctx):
+        assert(isinstance(input_data, SamplesIO))
+        assert(isinstance(pipeline_ctx, PipelineContext))
+
+        samples_filepath = input_data.create_target(data_type=DataType.Test,
+                                                    data_folding=pipeline_ctx.provide("data_folding"))
+
+        # Loading template file.
+        template_filepath = pipeline_ctx.provide_or_none("template_filepath")
+        template = BratTemplate.load(template_filepath)
+
+        # Setup output filepath.
+        exp_root = dirname(samples_filepath)
+        template_fp = pipeline_ctx.provide_or_none("brat_vis_fp")
+        if template_fp is None:
+            template_fp = join(exp_root, "brat_output.html")
+
+        pipeline_ctx.update("exp_root", exp_root)
+
+        coll_data = self.__brat_be.serialize_coll_data(obj_color_types=self.__obj_color_types,
+                                                       rel_color_types=self.__rel_color_types)
+
+        def __write_doc_data(stream, text_stream):
+            self.__brat_be.write_doc_data(stream=stream,
+                                          samples_data_filepath=samples_filepath,
+                                          result_data_filepath=pipeline_ctx.provide("predict_fp"),
+                                          label_to_rel=self.__label_to_rel,
+                                          chunk_size=self.__chunk_size,
+                                          text_stream=text_stream)
+
+        with open(template_fp, "w", encoding="utf-8") as output:
+            write_html(output=output,
+                       template=template,
+                       coll_data=coll_data,
+                       brat_url=self.__brat_url,
+                       write_doc_data_func=__write_doc_data)
+
+        return template_fp
@@ -6,13 +6,17 @@ from arekit.common.pipeline.items.base import BasePipelineItem
 from arekit.contrib.utils.io_utils.samples import SamplesIO
 
 from arelight.brat_backend import BratBackend
+from arelight.pipelines.items.utils import provide_shared_rows
 
 
 class BratBackendContentsPipelineItem(BasePipelineItem):
 
     def __init__(self, obj_color_types, rel_color_types,
-                 label_to_rel, brat_url="http://localhost:8001/"):
-        self.__brat_be = BratBackend()
+                 label_to_rel, brat_url="http://localhost:8001/", processes=1):
+        """ processes: int
+                amount of processes, utilized for processing documents.
+        """
+        self.__brat_be = BratBackend(processes=processes)
         self.__brat_url = brat_url
         self.__obj_color_types = obj_color_types
         self.__rel_color_types = rel_color_types
@@ -25,12 +29,28 @@ class BratBackendContentsPipelineItem(BasePipelineItem):
         samples_filepath = input_data.create_target(data_type=DataType.Test,
                                                     data_folding=pipeline_ctx.provide("data_folding"))
 
-        contents = self.__brat_be.to_data(
-           result_data_filepath=pipeline_ctx.provide("predict_fp"),
-           samples_data_filepath=samples_filepath,
-           obj_color_types=self.__obj_color_types,
-           rel_color_types=self.__rel_color_types,
-           label_to_rel=self.__label_to_rel)
+        predict_filepath = pipeline_ctx.provide("predict_fp")
+
+        # Samples and predictions might be already read by the prior pipeline items.
+        samples = provide_shared_rows(pipeline_ctx, key="samples_rows", filepath=samples_filepath)
+        result = provide_shared_rows(pipeline_ctx, key="predict_rows", filepath=predict_filepath)
+
+        def __to_data(docs_range):
+            return self.__brat_be.to_data(
+                result_data_filepath=predict_filepath,
+                samples_data_filepath=samples_filepath,
+                obj_color_types=self.__obj_color_types,
+                rel_color_types=self.__rel_color_types,
+                label_to_rel=self.__label_to_rel,
+                docs_range=docs_range,
+                samples=samples,
+                result=result)
+
+        # Optional list of documents ranges, each of which is expected to be represented separately.
+        docs_ranges = pipeline_ctx.provide_or_none("docs_ranges")
+
+        contents = __to_data(docs_range=None) if docs_ranges is None \
+            else [__to_data(docs_range=docs_range) for docs_range in docs_ranges]
 
         exp_root = dirname(samples_filepath)
 
@@ -0,0 +1,60 @@
+from os.path import join, dirname
+
+from arekit.common.experiment.data_type import DataType
+from arekit.common.pipeline.context import PipelineContext
+from arekit.common.pipeline.items.base import BasePipelineItem
+from arekit.contrib.utils.io_utils.samples import SamplesIO
+
+from arelight.brat_pages import create_pages_manifest, render_pages
+
+
+class BratPaginatedHtmlPipelineItem(BasePipelineItem):
+    """ Provides BRAT output as separate html pages of `docs_per_page` documents each, described by manifest.
+        By default pages are not rendered, and expected to be rendered lazily on demand,
+        e.g. by the server of the pages directory (see `create_lazy_render_func`).
+    """
+
+    def __init__(self, label_to_rel, obj_color_types, rel_color_types, brat_url="http://localhost:8001/",
+                 docs_per_page=1, render=False, processes=1):
+        assert(isinstance(label_to_rel, dict))
+        assert(isinstance(obj_color_types, dict))
+        assert(isinstance(rel_color_types, dict))
+        assert(isinstance(render, bool))
+        self.__label_to_rel = label_to_rel
+        self.__obj_color_types = obj_color_types
+        self.__rel_color_types = rel_color_types
+        self.__brat_url = brat_url
+        self.__docs_per_page = docs_per_page
+        self.__render = render
+        self.__processes = processes
+
+    def apply_core(self, input_data, pipeline_ctx):
+        assert(isinstance(input_data, SamplesIO))
+        assert(isinstance(pipeline_ctx, PipelineContext))
+
+        samples_filepath = input_data.create_target(data_type=DataType.Test,
+                                                    data_folding=pipeline_ctx.provide("data_folding"))
+
+        exp_root = dirname(samples_filepath)
+        pipeline_ctx.update("exp_root", exp_root)
+
+        pages_dir = pipeline_ctx.provide_or_none("brat_pages_dir")
+        if pages_dir is None:
+            pages_dir = join(exp_root, "brat_pages")
+
+        manifest_filepath = create_pages_manifest(target_dir=pages_dir,
+                                                  samples_filepath=samples_filepath,
+                                                  result_filepath=pipeline_ctx.provide_or_none("predict_fp"),
+                                                  template_filepath=pipeline_ctx.provide("template_filepath"),
+                                                  label_to_rel=self.__label_to_rel,
+                                                  obj_color_types=self.__obj_color_types,
+                                                  rel_color_types=self.__rel_color_types,
+                                                  brat_url=self.__brat_url,
+                                                  docs_per_page=self.__docs_per_page)
+
+        if self.__render:
+            render_pages(manifest_filepath, processes=self.__processes, force=True)
+
+        pipeline_ctx.update("brat_manifest_fp", manifest_filepath)
+
+        return manifest_filepath
@@ -9,29 +9,77 @@ from arelight.ner.ontonotes import BertOntonotesNER
 
 class BertOntonotesNERPipelineItem(SentenceObjectsParserPipelineItem):
 
-    def __init__(self, obj_filter=None):
+    def __init__(self, obj_filter=None, batch_size=16, cache_filepath=None, window_size=128, window_overlap=16):
+        """ cache_filepath: str or None
+                SQLite database of the NER results, shared across runs.
+            window_size: int or None
+                max amount of terms of the sentence, passed to the model at once;
+                longer sentences are processed by windows, which share `window_overlap` terms.
+        """
         assert(callable(obj_filter) or obj_filter is None)
+        assert(isinstance(batch_size, int) and batch_size > 0)
         # Initialize bert-based model instance.
-        self.__ontonotes_ner = BertOntonotesNER()
+        self.__ontonotes_ner = BertOntonotesNER(cache_filepath=cache_filepath,
+                                                window_size=window_size,
+                                                window_overlap=window_overlap)
         self.__obj_filter = obj_filter
+        self.__batch_size = batch_size
+        self.__prefetched = {}
         super(BertOntonotesNERPipelineItem, self).__init__(TermsPartitioning())
 
+    @property
+    def CacheStats(self):
+        return self.__ontonotes_ner.Cache.get_stats()
+
     def _get_parts_provider_func(self, input_data, pipeline_ctx):
         return self.__iter_subs_values_with_bounds(input_data)
 
-    def __iter_subs_values_with_bounds(self, terms_list):
-        assert(isinstance(terms_list, list))
+    def preload(self):
+        """ Builds the NER model in advance, so that the first request is not delayed by it.
+        """
+        self.__ontonotes_ner.preload()
+
+    def prefetch(self, sequences):
+        """ Performs NER for the whole list of sequences (lists of terms) in batches,
+            so that the further parsing of the related sentences reuses the extracted
+            objects instead of running the model for every sentence separately.
+            Results of the previous prefetch are dropped.
+        """
+        self.__prefetched.clear()
+
+        unique_sequences = []
+        for terms in sequences:
+            assert(isinstance(terms, list))
+            key = tuple(terms)
+            if len(terms) == 0 or key in self.__prefetched:
+                continue
+            self.__prefetched[key] = None
+            unique_sequences.append(terms)
+
+        for i in range(0, len(unique_sequences), self.__batch_size):
+            batch = unique_sequences[i:i + self.__batch_size]
+            processed_sequences = self.__ontonotes_ner.extract(sequences=batch)
+            for terms, p_sequence in zip(batch, processed_sequences):
+                self.__prefetched[tuple(terms)] = p_sequence
+
+    def __extract_objects(self, terms_list):
+        p_sequence = self.__prefetched.get(tuple(terms_list), None)
+
+        if p_sequence is not None:
+            return p_sequence
 
         single_sequence = [terms_list]
-        processed_sequences = self.__ontonotes_ner.extract(sequences=single_sequence)
+        return self.__ontonotes_ner.extract(sequences=single_sequence)[0]
+
+    def __iter_subs_values_with_bounds(self, terms_list):
+        assert(isinstance(terms_list, list))
 
-        for p_sequence in processed_sequences:
-            for s_obj in p_sequence:
-                assert(isinstance(s_obj, NerObjectDescriptor))
+        for s_obj in self.__extract_objects(terms_list):
+            assert(isinstance(s_obj, NerObjectDescriptor))
 
-                if self.__obj_filter is not None and not self.__obj_filter(s_obj):
-                    continue
+            if self.__obj_filter is not None and not self.__obj_filter(s_obj):
+                continue
 
-                value = " ".join(terms_list[s_obj.Position:s_obj.Position + s_obj.Length])
-                entity = Entity(value=value, e_type=s_obj.ObjectType)
-                yield entity, Bound(pos=s_obj.Position, length=s_obj.Length)
+            value = " ".join(terms_list[s_obj.Position:s_obj.Position + s_obj.Length])
+            entity = Entity(value=value, e_type=s_obj.ObjectType)
+            yield entity, Bound(pos=s_obj.Position, length=s_obj.Length)
@@ -1,5 +1,6 @@
 from os.path import join, dirname
 
+import pandas as pd
 from arekit.common.data import const
 from arekit.common.data.input.providers.text.single import BaseSingleTextProvider
 from arekit.common.data.storages.base import BaseRowsStorage
@@ -14,18 +15,41 @@ from arekit.contrib.utils.io_utils.samples import SamplesIO
 from deeppavlov.models.bert import bert_classifier
 from deeppavlov.models.preprocessors.bert_preprocessor import BertPreprocessor
 
+from arelight.network.bert.batching import iter_windowed_batches, iter_prefetched
+from arelight.pipelines.items.utils import provide_shared_rows
+from arelight.readers.tsv import iter_tsv_chunks, DataFrameRows
+
 
 class BertInferencePipelineItem(BasePipelineItem):
 
     def __init__(self, bert_config_file, model_checkpoint_path, vocab_filepath, samples_io,
                  data_type, predict_writer, labels_scaler, max_seq_length, do_lowercase,
-                 batch_size=10):
+                 batch_size=10, tokens_per_batch=None, stream_chunk_size=None, prefetch_batches=0,
+                 window_batches=32):
+        """ batch_size: int
+                max amount of samples in a single batch.
+            tokens_per_batch: int or None
+                max amount of tokens (including padding) in a single batch.
+            window_batches: int
+                samples are tokenized and grouped into batches of a similar length
+                within windows of `window_batches` * `batch_size` samples.
+            stream_chunk_size: int or None
+                enables streaming mode, in which samples are read by chunks
+                of the given amount of rows instead of the whole file.
+            prefetch_batches: int
+                amount of batches, which reading and tokenization (window by window) is performed
+                in background, while model performs prediction of the prior ones;
+                0 stands for the sequential processing.
+        """
         assert(isinstance(predict_writer, BasePredictWriter))
         assert(isinstance(data_type, DataType))
         assert(isinstance(labels_scaler, BaseLabelScaler))
         assert(isinstance(do_lowercase, bool))
         assert(isinstance(max_seq_length, int))
         assert(isinstance(samples_io, SamplesIO))
+        assert(isinstance(stream_chunk_size, int) or stream_chunk_size is None)
+        assert(isinstance(prefetch_batches, int) and prefetch_batches >= 0)
+        assert(isinstance(window_batches, int) and window_batches > 0)
 
         # Model classifier.
         self.__model = bert_classifier.BertClassifierModel(
@@ -46,47 +70,87 @@ class BertInferencePipelineItem(BasePipelineItem):
         self.__predict_provider = BasePredictProvider()
         self.__samples_io = samples_io
         self.__batch_size = batch_size
+        self.__tokens_per_batch = tokens_per_batch
+        self.__stream_chunk_size = stream_chunk_size
+        self.__prefetch_batches = prefetch_batches
+        self.__window_batches = window_batches
+
+    def __create_features(self, window):
+        return self.__proc(texts_a=[text_a for _, text_a, _ in window],
+                           texts_b=[text_b for _, _, text_b in window])
+
+    def __predict(self, samples_it):
+        """ Predicts labels for samples (row_ind, text_a, text_b), grouped in batches of a similar length
+            within bounded windows, and provides results in the original order of the samples.
+        """
+        batches_it = iter_windowed_batches(items_it=samples_it,
+                                           window_size=self.__window_batches * self.__batch_size,
+                                           features_func=self.__create_features,
+                                           batch_size=self.__batch_size,
+                                           tokens_per_batch=self.__tokens_per_batch)
+
+        # Windows are read and tokenized lazily, i.e. within the background thread in case of prefetching.
+        if self.__prefetch_batches > 0:
+            batches_it = iter_prefetched(batches_it, depth=self.__prefetch_batches)
+
+        uint_labels = {}
+        for window, batch_inds, batch_features, is_window_end in batches_it:
+
+            for i, uint_label in zip(batch_inds, self.__model(batch_features)):
+                uint_labels[i] = int(uint_label)
+
+            if not is_window_end:
+                continue
+
+            for i, (row_ind, _, _) in enumerate(window):
+                yield [row_ind, uint_labels[i]]
+
+            uint_labels = {}
 
     def apply_core(self, input_data, pipeline_ctx):
         assert(isinstance(pipeline_ctx, PipelineContext))
 
-        def __iter_predict_result():
-            samples = BaseRowsStorage.from_tsv(samples_filepath)
+        def __iter_rows():
+            if self.__stream_chunk_size is None:
+                for row_ind, row in samples:
+                    yield row_ind, row[const.ID], row[BaseSingleTextProvider.TEXT_A], row[PairTextProvider.TEXT_B]
+                return
 
-            used_row_ids = set()
-            
-            data = {BaseSingleTextProvider.TEXT_A: [],
-                    PairTextProvider.TEXT_B: [],
-                    "row_ids": []}
+            columns = [const.ID, BaseSingleTextProvider.TEXT_A, PairTextProvider.TEXT_B]
+            for row_offset, chunk in iter_tsv_chunks(samples_filepath, chunk_size=self.__stream_chunk_size,
+                                                     columns=columns):
+                for i, values in enumerate(zip(*[chunk[col] for col in columns])):
+                    yield (row_offset + i,) + values
 
-            for row_ind, row in samples:
-                
-                # Considering unique rows only.
-                if row[const.ID] in used_row_ids:
-                    continue
-
-                data[BaseSingleTextProvider.TEXT_A].append(row[BaseSingleTextProvider.TEXT_A])
-                data[PairTextProvider.TEXT_B].append(row[PairTextProvider.TEXT_B])
-                data["row_ids"].append(row_ind)
-                
-                used_row_ids.add(row[const.ID])
+        def __iter_unique_samples():
+            """ Samples are written grouped by id, so the repeated rows follow each other,
+                and only the previous id is kept to consider unique rows in constant memory.
+            """
+            prev_row_id = None
 
-            for i in range(0, len(data[BaseSingleTextProvider.TEXT_A]), 10):
+            for row_ind, row_id, text_a, text_b in __iter_rows():
 
-                texts_a = data[BaseSingleTextProvider.TEXT_A][i:i + self.__batch_size]
-                texts_b = data[PairTextProvider.TEXT_B][i:i + self.__batch_size]
-                row_ids = data["row_ids"][i:i + self.__batch_size]
+                # Considering unique rows only.
+                if row_id == prev_row_id:
+                    continue
 
-                batch_features = self.__proc(texts_a=texts_a, texts_b=texts_b)
+                prev_row_id = row_id
 
-                for i, uint_label in enumerate(self.__model(batch_features)):
-                    yield [row_ids[i], int(uint_label)]
+                yield row_ind, text_a, text_b
 
         # Fetch other required in furter information from input_data.
         samples_filepath = self.__samples_io.create_target(
             data_type=self.__data_type,
             data_folding=pipeline_ctx.provide("data_folding"))
 
+        samples = None
+        if self.__stream_chunk_size is None:
+            samples = provide_shared_rows(pipeline_ctx, key="samples_rows", filepath=samples_filepath)
+            if samples is None:
+                samples = BaseRowsStorage.from_tsv(samples_filepath, col_types={'frames': str})
+            # Parsed samples are shared with the further pipeline items.
+            pipeline_ctx.update("samples_rows", (samples_filepath, samples))
+
         # Setup predicted result writer.
         tgt = pipeline_ctx.provide_or_none("predict_fp")
         if tgt is None:
@@ -100,10 +164,23 @@ class BertInferencePipelineItem(BasePipelineItem):
 
         # Gathering the content
         title, contents_it = self.__predict_provider.provide(
-            sample_id_with_uint_labels_iter=__iter_predict_result(),
+            sample_id_with_uint_labels_iter=self.__predict(__iter_unique_samples()),
             labels_scaler=self.__labels_scaler)
 
+        # Predictions are kept in memory (unless streaming mode) to be shared with the further pipeline items.
+        predict_rows = []
+
+        def __iter_kept_contents():
+            for row in contents_it:
+                if self.__stream_chunk_size is None:
+                    predict_rows.append(row)
+                yield row
+
         with self.__writer:
-            self.__writer.write(title=title, contents_it=contents_it)
+            self.__writer.write(title=title, contents_it=__iter_kept_contents())
+
+        if self.__stream_chunk_size is None:
+            predict_df = pd.DataFrame(predict_rows, columns=[str(col) for col in title])
+            pipeline_ctx.update("predict_rows", (tgt, DataFrameRows(predict_df)))
 
         return self.__samples_io
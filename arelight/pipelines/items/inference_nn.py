@@ -1,5 +1,7 @@
 from os.path import join, dirname
 
+import numpy as np
+import tensorflow as tf
 from arekit.common.data.input.readers.tsv import TsvReader
 from arekit.common.data.row_ids.multiple import MultipleIDProvider
 from arekit.common.data.views.samples import LinkedSamplesStorageView
@@ -23,6 +25,9 @@ from arekit.contrib.utils.processing.languages.ru.pos_service import PartOfSpeec
 
 class TensorflowNetworkInferencePipelineItem(BasePipelineItem):
 
+    # Name of the term embedding variable of the AREkit context networks.
+    TERM_EMBEDDING_VARIABLE = "term_emb"
+
     def __init__(self, model_name, bags_collection_type, model_input_type, predict_writer, samples_io,
                  data_type, bag_size, bags_per_minibatch, nn_io, labels_scaler, callbacks, emb_io):
         assert(isinstance(callbacks, list))
@@ -63,6 +68,79 @@ class TensorflowNetworkInferencePipelineItem(BasePipelineItem):
         self.__samples_io = samples_io
         self.__emb_io = emb_io
 
+        # Compiled model (own graph with the opened session) and its inference context,
+        # kept across the pipeline runs for the embedding of the same (padded) shape.
+        self.__graph = None
+        self.__model = None
+        self.__model_ctx = None
+        self.__inference_ctx = None
+        self.__embedding_shape = None
+        self.__embedding_assign = None
+
+    @staticmethod
+    def __pad_embedding(embedding):
+        """ Embedding rows depend on the vocabulary of the serialized samples.
+            Rows are padded up to the power of two, so that the graph could be reused
+            for the vocabularies of the similar size. Padded rows are never looked up.
+        """
+        embedding = np.asarray(embedding)
+        rows = embedding.shape[0]
+        capacity = 1 << max(rows - 1, 0).bit_length()
+        padded = np.zeros((capacity,) + embedding.shape[1:], dtype=embedding.dtype)
+        padded[:rows] = embedding
+        return padded
+
+    @staticmethod
+    def __create_embedding_assign(graph, shape):
+        """ Provides (placeholder, assign_op) to load the term embedding into the compiled graph.
+        """
+        name = TensorflowNetworkInferencePipelineItem.TERM_EMBEDDING_VARIABLE
+
+        with graph.as_default():
+            variables = [v for v in tf.compat.v1.global_variables() if v.op.name == name]
+
+            if len(variables) != 1:
+                raise Exception("Term embedding variable `{}` is missed in the compiled graph".format(name))
+
+            variable = variables[0]
+            if variable.shape.as_list() != list(shape):
+                raise Exception("Term embedding variable `{}` has shape {}, while {} is expected".format(
+                    name, variable.shape.as_list(), list(shape)))
+
+            placeholder = tf.compat.v1.placeholder(dtype=variable.dtype.base_dtype, shape=shape)
+            return placeholder, tf.compat.v1.assign(variable, placeholder)
+
+    def __dispose_model(self):
+        """ Closes the session of the compiled model and releases its graph.
+            Graph is owned by the model, so the graphs of the other models of the process are kept.
+        """
+        if self.__model_ctx is None:
+            return
+        self.__model_ctx.Session.close()
+        self.__graph = None
+        self.__model = None
+        self.__model_ctx = None
+        self.__inference_ctx = None
+        self.__embedding_shape = None
+        self.__embedding_assign = None
+
+    def __init_inference_ctx(self, inference_ctx, samples_filepath, vocab):
+        inference_ctx.initialize(
+            dtypes=[self.__data_type],
+            bags_collection_type=self.__bags_collection_type,
+            samples_view=LinkedSamplesStorageView(row_ids_provider=MultipleIDProvider()),
+            load_target_func=lambda _: samples_filepath,
+            samples_reader=TsvReader(),
+            has_model_predefined_state=True,
+            vocab=vocab,
+            labels_count=self.__config.ClassesCount,
+            input_shapes=NetworkInputShapes(iter_pairs=[
+                (NetworkInputShapes.FRAMES_PER_CONTEXT, self.__config.FramesPerContext),
+                (NetworkInputShapes.TERMS_PER_CONTEXT, self.__config.TermsPerContext),
+                (NetworkInputShapes.SYNONYMS_PER_CONTEXT, self.__config.SynonymsPerContext),
+            ]),
+            bag_size=self.__config.BagSize)
+
     def apply_core(self, input_data, pipeline_ctx):
         assert(isinstance(pipeline_ctx, PipelineContext))
 
@@ -86,39 +164,57 @@ class TensorflowNetworkInferencePipelineItem(BasePipelineItem):
         embedding = self.__emb_io.load_embedding(data_folding)
         vocab = self.__emb_io.load_vocab(data_folding)
 
+        embedding = self.__pad_embedding(embedding)
+
+        if self.__model is not None and self.__embedding_shape == embedding.shape:
+            # Graph and session are already prepared, so we only load the embedding and feed new samples.
+            placeholder, assign_op = self.__embedding_assign
+            self.__model_ctx.Session.run(assign_op, feed_dict={placeholder: embedding})
+            self.__init_inference_ctx(self.__inference_ctx, samples_filepath=samples_filepath, vocab=vocab)
+            self.__writer.set_target(tgt)
+            with self.__graph.as_default():
+                self.__model.predict(do_compile=False)
+            return self.__samples_io
+
+        # Previous graph could not be reused.
+        self.__dispose_model()
+
         # Setup config parameters.
         self.__config.set_term_embedding(embedding)
 
         inference_ctx = InferenceContext.create_empty()
-        inference_ctx.initialize(
-            dtypes=[self.__data_type],
-            bags_collection_type=self.__bags_collection_type,
-            samples_view=LinkedSamplesStorageView(row_ids_provider=MultipleIDProvider()),
-            load_target_func=lambda _: samples_filepath,
-            samples_reader=TsvReader(),
-            has_model_predefined_state=True,
-            vocab=vocab,
-            labels_count=self.__config.ClassesCount,
-            input_shapes=NetworkInputShapes(iter_pairs=[
-                (NetworkInputShapes.FRAMES_PER_CONTEXT, self.__config.FramesPerContext),
-                (NetworkInputShapes.TERMS_PER_CONTEXT, self.__config.TermsPerContext),
-                (NetworkInputShapes.SYNONYMS_PER_CONTEXT, self.__config.SynonymsPerContext),
-            ]),
-            bag_size=self.__config.BagSize)
-
-        # Model preparation.
-        model = BaseTensorflowModel(
-            context=self.__create_model_ctx(inference_ctx),
-            callbacks=self.__callbacks,
-            predict_pipeline=[
-                EpochLabelsPredictorPipelineItem(),
-                EpochLabelsCollectorPipelineItem(),
-                MinibatchHiddenFetcherPipelineItem()
-            ],
-            fit_pipeline=[MinibatchFittingPipelineItem()])
+        self.__init_inference_ctx(inference_ctx, samples_filepath=samples_filepath, vocab=vocab)
 
+        # Model is created and compiled within its own graph.
+        graph = tf.Graph()
         self.__writer.set_target(tgt)
 
-        model.predict(do_compile=True)
+        with graph.as_default():
+            model_ctx = self.__create_model_ctx(inference_ctx)
+            model = BaseTensorflowModel(
+                context=model_ctx,
+                callbacks=self.__callbacks,
+                predict_pipeline=[
+                    EpochLabelsPredictorPipelineItem(),
+                    EpochLabelsCollectorPipelineItem(),
+                    MinibatchHiddenFetcherPipelineItem()
+                ],
+                fit_pipeline=[MinibatchFittingPipelineItem()])
+
+            model.predict(do_compile=True)
+
+        try:
+            embedding_assign = self.__create_embedding_assign(graph, shape=embedding.shape)
+        except Exception:
+            model_ctx.Session.close()
+            raise
+
+        # Keep compiled model for the further runs.
+        self.__graph = graph
+        self.__model = model
+        self.__model_ctx = model_ctx
+        self.__inference_ctx = inference_ctx
+        self.__embedding_shape = embedding.shape
+        self.__embedding_assign = embedding_assign
 
         return self.__samples_io
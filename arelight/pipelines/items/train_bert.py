@@ -1,3 +1,4 @@
+import numpy as np
 from arekit.common.data import const
 from arekit.common.data.storages.base import BaseRowsStorage
 from arekit.common.pipeline.context import PipelineContext
@@ -7,14 +8,21 @@ from deeppavlov.models.bert import bert_classifier
 from deeppavlov.models.preprocessors.bert_preprocessor import BertPreprocessor
 from tqdm import tqdm
 
+from arelight.network.bert.features import BertFeaturesStore, load_or_create_features_store
+
 
 class BertFinetunePipelineItem(BasePipelineItem):
 
     def __init__(self, bert_config_file, model_checkpoint_path, do_lowercase,
                  learning_rate, vocab_filepath, max_seq_length, save_path,
-                 labels_count=3):
+                 labels_count=3, features_cache_dir=None):
+        """ features_cache_dir: str or None
+                directory for the tokenized samples; in case of None, samples
+                are tokenized once per pipeline run and kept in memory.
+        """
         assert(isinstance(bert_config_file, str))
         assert(isinstance(model_checkpoint_path, str))
+        assert(isinstance(features_cache_dir, str) or features_cache_dir is None)
 
         # Model classifier.
         self.__model = bert_classifier.BertClassifierModel(
@@ -30,6 +38,11 @@ class BertFinetunePipelineItem(BasePipelineItem):
                                        do_lower_case=do_lowercase,
                                        max_seq_length=max_seq_length)
 
+        self.__vocab_filepath = vocab_filepath
+        self.__do_lowercase = do_lowercase
+        self.__max_seq_length = max_seq_length
+        self.__features_cache_dir = features_cache_dir
+
     @staticmethod
     def get_synonym_group_index(synonyms, value):
         assert(isinstance(synonyms, SynonymsCollection))
@@ -41,36 +54,39 @@ class BertFinetunePipelineItem(BasePipelineItem):
         assert(isinstance(input_data, str))
         assert(isinstance(pipeline_ctx, PipelineContext))
 
-        def __iter_batches(s, batch_size):
-            assert(isinstance(s, BaseRowsStorage))
-
-            data = {"text_a": [], "text_b": [], "label": []}
+        def __create_store():
+            return BertFeaturesStore.from_texts(proc=self.__proc,
+                                                texts_a=list(df['text_a']),
+                                                texts_b=list(df['text_b']),
+                                                max_seq_length=self.__max_seq_length)
 
+        def __iter_batches(batch_size):
             # NOTE: it is important to iter shuffled data!
-            for row_ind, row in s.iter_shuffled():
-                data["text_a"].append(row['text_a'])
-                data["text_b"].append(row['text_b'])
-                data["label"].append(row[const.LABEL])
-
-            for i in range(0, len(data["text_a"]), batch_size):
-
-                texts_a = data["text_a"][i:i + batch_size]
-                texts_b = data["text_b"][i:i + batch_size]
-                labels = data["label"][i:i + batch_size]
-
-                batch_features = self.__proc(texts_a=texts_a, texts_b=texts_b)
+            indices = np.random.permutation(store.SamplesCount)
 
-                yield batch_features, labels
+            for i in range(0, len(indices), batch_size):
+                batch_inds = indices[i:i + batch_size]
+                yield store.get_features(batch_inds), [labels[ind] for ind in batch_inds]
 
         # Reading pipeline parameters.
         epochs_count = pipeline_ctx.provide("epochs_count")
         batch_size = pipeline_ctx.provide("batch_size")
-        samples = BaseRowsStorage.from_tsv(input_data)
+        df = BaseRowsStorage.from_tsv(input_data).DataFrame
+        labels = list(df[const.LABEL])
+
+        # Samples are tokenized once, so that every epoch only shuffles indices of the features.
+        store = __create_store() if self.__features_cache_dir is None else \
+            load_or_create_features_store(cache_dir=self.__features_cache_dir,
+                                          samples_filepath=input_data,
+                                          vocab_filepath=self.__vocab_filepath,
+                                          do_lowercase=self.__do_lowercase,
+                                          max_seq_length=self.__max_seq_length,
+                                          create_func=__create_store)
 
         for e in range(epochs_count):
 
-            it = __iter_batches(samples, batch_size)
-            batches = len(samples.DataFrame) / batch_size
+            it = __iter_batches(batch_size)
+            batches = store.SamplesCount / batch_size
 
             total_loss = 0
             pbar = tqdm(it, total=batches, desc="Epoch: {}".format(e), unit='batches')
@@ -1,5 +1,6 @@
 from arekit.common.news.base import News
 from arekit.common.news.sentence import BaseNewsSentence
+from arekit.common.pipeline.context import PipelineContext
 from ru_sent_tokenize import ru_sent_tokenize
 
 
@@ -16,3 +17,28 @@ def input_to_docs(input_data):
         docs.append(doc)
 
     return docs
+
+
+def iter_docs_sentences_terms(docs):
+    """ Provides terms of every sentence of the every document in docs.
+        Terms are separated by whitespaces, i.e. in the same way as in `TermsSplitterParser`.
+    """
+    for doc in docs:
+        assert(isinstance(doc, News))
+        for sentence in doc.iter_sentences():
+            yield sentence.Text.split()
+
+
+def provide_shared_rows(pipeline_ctx, key, filepath):
+    """ Provides rows, shared by the prior pipeline items through the context
+        under the `key`, in case they were read from (or written into) the given file.
+        Shared value is expected to be a pair of the filepath and the rows.
+    """
+    assert(isinstance(pipeline_ctx, PipelineContext))
+
+    shared = pipeline_ctx.provide_or_none(key)
+    if shared is None:
+        return None
+
+    shared_filepath, rows = shared
+    return rows if shared_filepath == filepath else None
@@ -0,0 +1,106 @@
+import os
+import time
+from collections import OrderedDict
+
+from arekit.common.data import const
+
+from arelight.readers.tsv import iter_tsv_chunks
+from arelight.snapshot import load_snapshot, save_snapshot, file_sha256
+
+# Indices, built within the current process: the latest index of every file path,
+# limited by the recently used `INDICES_CAPACITY` paths.
+_indices = OrderedDict()
+
+INDICES_CAPACITY = 16
+
+# Files, modified within this period, might be rewritten within the same modification time
+# on filesystems with coarse timestamps, so their contents are checked on every request.
+RACY_PERIOD_SEC = 2.0
+
+
+def build_docs_index_from_frames(frames_iter):
+    """ Provides dictionary of the document id towards the index of its
+        first row within the samples and the amount of its rows.
+        Documents are expected to be ordered; the index is
+        limited by the first row with the smaller document id.
+
+        frames_iter: iterable
+            frames of the samples: index of the first row of the frame and the data frame.
+    """
+    index = {}
+    prev_doc_id = None
+
+    for row_offset, chunk in frames_iter:
+        for i, doc_id in enumerate(chunk[const.DOC_ID]):
+            doc_id = int(doc_id)
+
+            if prev_doc_id is not None and doc_id < prev_doc_id:
+                return index
+
+            if doc_id != prev_doc_id:
+                index[doc_id] = [row_offset + i, 0]
+
+            index[doc_id][1] += 1
+            prev_doc_id = doc_id
+
+    return index
+
+
+def build_docs_index(filepath, chunk_size=100000):
+    return build_docs_index_from_frames(
+        iter_tsv_chunks(filepath, chunk_size=chunk_size, columns=[const.DOC_ID]))
+
+
+def get_docs_index(filepath):
+    """ Provides index of the documents of the samples file. Index is built once per
+        file contents and kept both within the process and in the sidecar file.
+        File size and modification time are trusted only for the files, modified
+        earlier than `RACY_PERIOD_SEC` before the index creation.
+    """
+    stat = os.stat(filepath)
+    abs_filepath = os.path.abspath(filepath)
+    stat_key = (stat.st_size, stat.st_mtime_ns)
+
+    entry = _indices.get(abs_filepath, None)
+    if entry is not None and entry[0] == stat_key and entry[1]:
+        _indices.move_to_end(abs_filepath)
+        return entry[3]
+
+    is_settled = time.time() - stat.st_mtime > RACY_PERIOD_SEC
+    signature = (abs_filepath, file_sha256(filepath))
+
+    if entry is not None and entry[2] == signature:
+        index = entry[3]
+    else:
+        snapshot_filepath = filepath + ".docs.snapshot"
+        index = load_snapshot(snapshot_filepath, signature=signature)
+
+        if index is None:
+            index = build_docs_index(filepath)
+            save_snapshot(snapshot_filepath, signature=signature, data=index)
+
+    # Index of the previous file contents is replaced.
+    _indices[abs_filepath] = (stat_key, is_settled, signature, index)
+    _indices.move_to_end(abs_filepath)
+    while len(_indices) > INDICES_CAPACITY:
+        _indices.popitem(last=False)
+
+    return index
+
+
+def find_docs_range_rows(index, docs_range):
+    """ Provides index of the first row and the amount of rows
+        of the documents within the range (inclusive).
+    """
+    assert(isinstance(index, dict))
+    assert(isinstance(docs_range, tuple))
+
+    bounds = [index[doc_id] for doc_id in index if docs_range[0] <= doc_id <= docs_range[1]]
+
+    if len(bounds) == 0:
+        return 0, 0
+
+    first_row = min([b[0] for b in bounds])
+    last_row = max([b[0] + b[1] for b in bounds])
+
+    return first_row, last_row - first_row
@@ -0,0 +1,69 @@
+import pandas as pd
+
+
+def iter_tsv_chunks(filepath, chunk_size, columns=None, col_types=None):
+    """ Reads the (optionally gzipped) TSV file by chunks of at most `chunk_size` rows,
+        so that the whole file is never kept in memory.
+        Provides index of the first row of the chunk within the file and the chunk contents.
+
+        columns: list or None
+            names of the columns to be read; all the columns are read in case of None.
+    """
+    assert(isinstance(chunk_size, int) and chunk_size > 0)
+    assert(isinstance(columns, list) or columns is None)
+
+    row_offset = 0
+    for chunk in pd.read_csv(filepath, sep='\t', index_col=False, compression='infer', encoding='utf-8',
+                             usecols=columns, dtype=col_types, chunksize=chunk_size):
+        yield row_offset, chunk
+        row_offset += len(chunk)
+
+
+def read_tsv_rows(filepath, skip_rows, rows_count, col_types=None):
+    """ Reads `rows_count` rows of the TSV file, which follow the first `skip_rows` rows.
+        Skipped rows are not parsed.
+    """
+    assert(isinstance(skip_rows, int) and skip_rows >= 0)
+    assert(isinstance(rows_count, int) and rows_count >= 0)
+
+    # Header is kept, since the first line of the file is not a row.
+    return pd.read_csv(filepath, sep='\t', index_col=False, compression='infer', encoding='utf-8',
+                       dtype=col_types, skiprows=range(1, skip_rows + 1), nrows=rows_count)
+
+
+class DataFrameRows(object):
+    """ Rows of the data frame, which is a part of the larger table, that starts from the `offset` row.
+        Provides rows in the same way as `BaseRowsStorage`, i.e. with the row index within the whole table.
+    """
+
+    def __init__(self, df, offset=0):
+        assert(isinstance(df, pd.DataFrame))
+        assert(isinstance(offset, int))
+        self.__df = df
+        self.__offset = offset
+
+    def iter_frames(self):
+        yield self.__offset, self.__df
+
+    def __iter__(self):
+        for i, (_, row) in enumerate(self.__df.iterrows()):
+            yield self.__offset + i, row
+
+
+class TsvChunkedRows(object):
+    """ Rows of the TSV file, which is read by chunks of `chunk_size` rows on every iteration.
+        Provides rows in the same way as `BaseRowsStorage`, but never keeps the whole file in memory.
+    """
+
+    def __init__(self, filepath, chunk_size, col_types=None):
+        self.__filepath = filepath
+        self.__chunk_size = chunk_size
+        self.__col_types = col_types
+
+    def iter_frames(self):
+        return iter_tsv_chunks(self.__filepath, chunk_size=self.__chunk_size, col_types=self.__col_types)
+
+    def __iter__(self):
+        for row_offset, chunk in self.iter_frames():
+            for row_ind, row in DataFrameRows(chunk, offset=row_offset):
+                yield row_ind, row
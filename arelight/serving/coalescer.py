@@ -0,0 +1,69 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class RequestsCoalescer(object):
+    """ Gathers concurrent requests for up to `max_wait_ms` milliseconds or `max_batch_size`
+        requests, processes all of them at once and fans the results back to every caller.
+        Requests are processed by a single worker thread, so `process_func` is never
+        called concurrently.
+
+        process_func: func(list) -> list
+            provides list of results for the list of request inputs (in the same order).
+    """
+
+    def __init__(self, process_func, max_batch_size=8, max_wait_ms=5):
+        assert(callable(process_func))
+        assert(isinstance(max_batch_size, int) and max_batch_size > 0)
+        assert(isinstance(max_wait_ms, (int, float)) and max_wait_ms >= 0)
+        self.__process_func = process_func
+        self.__max_batch_size = max_batch_size
+        self.__max_wait = max_wait_ms / 1000.0
+        self.__requests = queue.Queue()
+
+        worker = threading.Thread(target=self.__run)
+        worker.daemon = True
+        worker.start()
+
+    def submit(self, data):
+        """ Blocks until the result for the provided input data is ready.
+        """
+        future = Future()
+        self.__requests.put((data, future))
+        return future.result()
+
+    # region private methods
+
+    def __gather_batch(self):
+        batch = [self.__requests.get()]
+        deadline = time.monotonic() + self.__max_wait
+
+        while len(batch) < self.__max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.__requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def __run(self):
+        while True:
+            batch = self.__gather_batch()
+
+            try:
+                results = self.__process_func([data for data, _ in batch])
+                assert(len(results) == len(batch))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    # endregion
@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import os
+import shutil
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional, gzip is used otherwise.
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+ENCODINGS_EXTENSIONS = {
+    BROTLI: ".br",
+    GZIP: ".gz"
+}
+
+ETAG_EXTENSION = ".etag"
+
+__CHUNK_SIZE = 1 << 16
+
+
+def supported_encodings():
+    return [GZIP] if brotli is None else [BROTLI, GZIP]
+
+
+def __iter_chunks(f):
+    while True:
+        chunk = f.read(__CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def __write_gzip(filepath, target):
+    with open(filepath, "rb") as src, open(target, "wb") as dest:
+        # Zero mtime keeps the compressed contents reproducible.
+        with gzip.GzipFile(fileobj=dest, mode="wb", compresslevel=9, mtime=0) as gz:
+            shutil.copyfileobj(src, gz, __CHUNK_SIZE)
+
+
+def __write_brotli(filepath, target):
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT)
+    with open(filepath, "rb") as src, open(target, "wb") as dest:
+        for chunk in __iter_chunks(src):
+            dest.write(compressor.process(chunk))
+        dest.write(compressor.finish())
+
+
+def __file_etag(filepath):
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in __iter_chunks(f):
+            h.update(chunk)
+    return '"{}"'.format(h.hexdigest())
+
+
+def __replace(filepath, target, write_func):
+    tmp_target = "{}.{}.tmp".format(target, os.getpid())
+    write_func(filepath, tmp_target)
+    os.replace(tmp_target, target)
+
+
+def write_precompressed(filepath, encodings=None):
+    """ Writes compressed variants of the file alongside, i.e. `<filepath>.gz`, `<filepath>.br`,
+        and the entity tag (content hash) into `<filepath>.etag`, which is written last.
+        Returns the entity tag.
+    """
+    encodings = supported_encodings() if encodings is None else encodings
+
+    for encoding in encodings:
+        assert(encoding in ENCODINGS_EXTENSIONS)
+        if encoding == BROTLI and brotli is None:
+            raise Exception("Brotli compression requires `brotli` package to be installed")
+
+        __replace(filepath=filepath,
+                  target=filepath + ENCODINGS_EXTENSIONS[encoding],
+                  write_func=__write_brotli if encoding == BROTLI else __write_gzip)
+
+    etag = __file_etag(filepath)
+
+    def __write_etag(_, target):
+        with open(target, "w") as f:
+            f.write(etag)
+
+    __replace(filepath=filepath, target=filepath + ETAG_EXTENSION, write_func=__write_etag)
+
+    return etag
+
+
+def read_etag(filepath):
+    """ Provides entity tag of the file, or None in case of the latter is missed or outdated.
+    """
+    etag_filepath = filepath + ETAG_EXTENSION
+
+    if not os.path.exists(etag_filepath):
+        return None
+
+    # Source might be modified after the compression.
+    if os.path.getmtime(etag_filepath) < os.path.getmtime(filepath):
+        return None
+
+    with open(etag_filepath, "r") as f:
+        return f.read().strip()
+
+
+def parse_accept_encoding(header):
+    """ Provides set of encodings, accepted by the client.
+    """
+    accepted = set()
+    for item in (header or "").split(","):
+        params = [p.strip() for p in item.split(";")]
+        if not params[0]:
+            continue
+        if any(p.replace(" ", "") in ["q=0", "q=0.0", "q=0.00", "q=0.000"] for p in params[1:]):
+            continue
+        accepted.add(params[0].lower())
+    return accepted
+
+
+def select_precompressed(filepath, accept_encoding):
+    """ Provides (filepath, encoding) of the most compact variant of the file, which is
+        accepted by the client. Encoding is None for the uncompressed file.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+
+    for encoding in [BROTLI, GZIP]:
+        target = filepath + ENCODINGS_EXTENSIONS[encoding]
+        if (encoding in accepted or "*" in accepted) and os.path.exists(target) \
+                and os.path.getmtime(target) >= os.path.getmtime(filepath):
+            return target, encoding
+
+    return filepath, None
+
+
+def encoding_etag(etag, encoding):
+    """ Provides entity tag of the encoded representation, since the
+        representations of the different encodings are not byte-identical.
+    """
+    if etag is None or encoding is None:
+        return etag
+    assert(etag.endswith('"'))
+    return '{}-{}"'.format(etag[:-1], encoding)
+
+
+def etag_matches(if_none_match, etag):
+    """ Checks the `If-None-Match` header value against the entity tag.
+    """
+    if if_none_match is None or etag is None:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
@@ -0,0 +1,296 @@
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+from arelight.serving.coalescer import RequestsCoalescer
+from arelight.serving.precompressed import GZIP, read_etag, select_precompressed, etag_matches, \
+    parse_accept_encoding, write_precompressed, encoding_etag
+
+logger = logging.getLogger(__name__)
+
+
+class BratInferenceServer(ThreadingMixIn, HTTPServer):
+    """ Long-running HTTP server, which keeps all the inference resources
+        (models, collections, pipelines) loaded once and provides BRAT contents
+        for the texts submitted by users.
+
+        infer_func: func(texts) -> list
+            provides BRAT contents ({"text", "coll_data", "doc_data"}) for every input text.
+        render_func: func(contents, text) -> str
+            provides HTML page for the BRAT contents (empty dict if nothing was inferred)
+            and the input text (None if text was not provided).
+        max_batch_size: int
+            max amount of concurrent requests, coalesced into a single `infer_func` call.
+        max_wait_ms: int
+            max time of waiting for the concurrent requests to be coalesced.
+        output_dir: str or None
+            directory of the precomputed pages (see `write_precompressed`), served as is.
+        page_render_func: func(name) -> str or None
+            provides filepath of the page of the output directory, rendered on demand
+            (see `create_lazy_render_func`), or None in case of the unknown page.
+        cache_size: int
+            max amount of the responses, kept in memory for the repeated requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, infer_func, render_func, max_batch_size=1, max_wait_ms=5,
+                 output_dir=None, page_render_func=None, cache_size=0):
+        assert(callable(infer_func))
+        assert(callable(render_func))
+        assert(page_render_func is None or callable(page_render_func))
+        assert(isinstance(cache_size, int) and cache_size >= 0)
+        HTTPServer.__init__(self, server_address, BratInferenceRequestHandler)
+        self.__render_func = render_func
+        self.__output_dir = output_dir
+        self.__page_render_func = page_render_func
+        # Pages are written by the same process, so concurrent rendering of a page is not allowed.
+        self.__page_render_lock = threading.Lock()
+        self.__cache_size = cache_size
+        self.__cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+        # Pipelines as well as models are not thread-safe, therefore
+        # requests are passed to a single worker, which processes them in batches.
+        self.__coalescer = RequestsCoalescer(process_func=infer_func,
+                                             max_batch_size=max_batch_size,
+                                             max_wait_ms=max_wait_ms)
+
+    def infer(self, text):
+        assert(isinstance(text, str))
+        return self.__coalescer.submit(text)
+
+    def render(self, contents, text):
+        return self.__render_func(contents, text)
+
+    @property
+    def OutputDir(self):
+        return self.__output_dir
+
+    def render_page(self, name):
+        """ Provides filepath of the page, rendered on demand and precompressed, or None
+            in case of the page could not be rendered.
+        """
+        if self.__page_render_func is None:
+            return None
+
+        with self.__page_render_lock:
+            filepath = self.__page_render_func(name)
+            if filepath is not None and read_etag(filepath) is None:
+                write_precompressed(filepath)
+
+        return filepath
+
+    def get_response(self, key, create_func):
+        """ Provides response for the key, which is created by `create_func` in case
+            of the latter is missed in cache.
+        """
+        with self.__cache_lock:
+            response = self.__cache.get(key, None)
+            if response is not None:
+                self.__cache.move_to_end(key)
+                return response
+
+        response = create_func()
+
+        if self.__cache_size > 0:
+            with self.__cache_lock:
+                self.__cache[key] = response
+                while len(self.__cache) > self.__cache_size:
+                    self.__cache.popitem(last=False)
+
+        return response
+
+
+class BratResponse(object):
+    """ Response payload with the entity tag; compressed payload is kept once created.
+    """
+
+    def __init__(self, content_type, data):
+        assert(isinstance(data, str))
+        self.ContentType = content_type
+        self.Payload = data.encode("utf-8")
+        self.ETag = '"{}"'.format(hashlib.sha1(self.Payload).hexdigest())
+        self.__gzipped = None
+
+    @property
+    def GzippedPayload(self):
+        if self.__gzipped is None:
+            self.__gzipped = gzip.compress(self.Payload, mtime=0)
+        return self.__gzipped
+
+
+class BratInferenceRequestHandler(BaseHTTPRequestHandler):
+    """ Supported requests:
+            GET|POST /          -- HTML page with BRAT visualization of the `text` parameter.
+            GET|POST /api/brat  -- BRAT contents of the `text` parameter in JSON.
+            GET /output/<name>  -- precomputed page of the output directory, which
+                                   is rendered on demand in case of its absence.
+        Text might be provided in query, form or JSON body.
+        Responses are provided with ETag, so the repeated requests with `If-None-Match`
+        are replied with 304, and compressed in case of the client accepts gzip/brotli.
+    """
+
+    PAGE_PATH = "/"
+    API_PATH = "/api/brat"
+    OUTPUT_PATH = "/output/"
+    MIN_COMPRESS_SIZE = 1024
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith(self.OUTPUT_PATH):
+            self.__handle_output(name=url.path[len(self.OUTPUT_PATH):])
+            return
+        self.__handle(path=url.path, text=self.__text_from_query(url.query))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            text = json.loads(body).get("text", None) if len(body) > 0 else None
+        else:
+            text = self.__text_from_query(body)
+
+        self.__handle(path=url.path, text=text)
+
+    # region private methods
+
+    @staticmethod
+    def __text_from_query(query):
+        values = parse_qs(query).get("text", None)
+        return values[0] if values else None
+
+    def __handle(self, path, text):
+        text = text.strip() if text is not None and len(text.strip()) > 0 else None
+
+        try:
+            if path == self.API_PATH:
+                if text is None:
+                    self.send_error(400, "Parameter `text` is missed")
+                    return
+                response = self.server.get_response(
+                    key=(path, text),
+                    create_func=lambda: BratResponse(content_type="application/json",
+                                                     data=json.dumps(self.server.infer(text))))
+                self.__reply(response)
+            elif path == self.PAGE_PATH:
+                response = self.server.get_response(
+                    key=(path, text),
+                    create_func=lambda: BratResponse(
+                        content_type="text/html",
+                        data=self.server.render(self.server.infer(text) if text is not None else {}, text)))
+                self.__reply(response)
+            else:
+                self.send_error(404)
+        except Exception as e:
+            logger.exception(e)
+            self.send_error(500, str(e))
+
+    def __handle_output(self, name):
+        output_dir = self.server.OutputDir
+        filepath = os.path.join(output_dir, name) if output_dir is not None else None
+
+        # Only the files of the output directory are allowed.
+        if filepath is None or os.path.basename(name) != name or name in ["", ".", ".."]:
+            self.send_error(404)
+            return
+
+        if not os.path.isfile(filepath):
+            try:
+                filepath = self.server.render_page(name)
+            except Exception as e:
+                logger.exception(e)
+                self.send_error(500, str(e))
+                return
+
+        if filepath is None:
+            self.send_error(404)
+            return
+
+        target, encoding = select_precompressed(filepath, self.headers.get("Accept-Encoding", None))
+        etag = encoding_etag(read_etag(filepath), encoding)
+
+        if etag_matches(self.headers.get("If-None-Match", None), etag):
+            self.__reply_not_modified(etag)
+            return
+
+        content_type, _ = mimetypes.guess_type(name)
+        if content_type is None:
+            content_type = "application/octet-stream"
+        elif content_type.startswith("text/") or content_type in ["application/javascript", "application/json"]:
+            content_type += "; charset=utf-8"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(os.path.getsize(target)))
+        self.send_header("Vary", "Accept-Encoding")
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+
+        with open(target, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def __reply_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def __reply(self, response):
+        assert(isinstance(response, BratResponse))
+
+        is_gzipped = len(response.Payload) >= self.MIN_COMPRESS_SIZE and \
+            GZIP in parse_accept_encoding(self.headers.get("Accept-Encoding", None))
+        etag = encoding_etag(response.ETag, GZIP if is_gzipped else None)
+
+        if etag_matches(self.headers.get("If-None-Match", None), etag):
+            self.__reply_not_modified(etag)
+            return
+
+        payload = response.GzippedPayload if is_gzipped else response.Payload
+
+        self.send_response(200)
+        self.send_header("Content-Type", "{}; charset=utf-8".format(response.ContentType))
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if is_gzipped:
+            self.send_header("Content-Encoding", GZIP)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    # endregion
+
+
+def serve(infer_func, render_func, host="localhost", port=8080, max_batch_size=1, max_wait_ms=5,
+          output_dir=None, page_render_func=None, cache_size=0):
+    """ Starts the inference server and keeps it running.
+    """
+    server = BratInferenceServer(server_address=(host, port),
+                                 infer_func=infer_func,
+                                 render_func=render_func,
+                                 max_batch_size=max_batch_size,
+                                 max_wait_ms=max_wait_ms,
+                                 output_dir=output_dir,
+                                 page_render_func=page_render_func,
+                                 cache_size=cache_size)
+
+    logger.info("Serving on http://{host}:{port}{path}".format(
+        host=host, port=port, path=BratInferenceRequestHandler.PAGE_PATH))
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
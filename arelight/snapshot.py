@@ -0,0 +1,80 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from os.path import exists, dirname
+
+import pkg_resources
+
+logger = logging.getLogger(__name__)
+
+# Increase this value on every change of the snapshots contents format.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def file_sha256(filepath, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def get_package_version(name):
+    """ Provides version of the installed distribution, or None in case of its absence.
+    """
+    try:
+        return pkg_resources.get_distribution(name).version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+
+def __write_snapshot(filepath, signature, data):
+    target_dir = dirname(os.path.abspath(filepath))
+    if not exists(target_dir):
+        os.makedirs(target_dir)
+
+    fd, tmp_filepath = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((SNAPSHOT_FORMAT_VERSION, signature), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filepath, filepath)
+    except Exception:
+        if exists(tmp_filepath):
+            os.remove(tmp_filepath)
+        raise
+
+
+def save_snapshot(filepath, signature, data):
+    """ Saves pickled data with the signature header.
+        Snapshot is written into a temporary file first, so that readers never observe a partial file.
+        Snapshot is an optional cache, so the failure of writing it (e.g. read-only directory)
+        is logged and results in False.
+    """
+    try:
+        __write_snapshot(filepath, signature=signature, data=data)
+    except OSError as e:
+        logger.warning("Unable to save snapshot {}: {}".format(filepath, e))
+        return False
+
+    return True
+
+
+def load_snapshot(filepath, signature):
+    """ Provides snapshot data, or None in case when snapshot is missed,
+        corrupted or created for the different signature.
+    """
+    if not exists(filepath):
+        return None
+
+    try:
+        with open(filepath, "rb") as f:
+            if pickle.load(f) != (SNAPSHOT_FORMAT_VERSION, signature):
+                logger.info("Snapshot is outdated: {}".format(filepath))
+                return None
+            return pickle.load(f)
+    except Exception as e:
+        logger.warning("Unable to read snapshot {}: {}".format(filepath, e))
+        return None
@@ -0,0 +1,66 @@
+from arekit.common.text.stemmer import Stemmer
+from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
+from arekit.contrib.utils.synonyms.stemmer_based import StemmerBasedSynonymCollection
+
+from arelight.snapshot import file_sha256, load_snapshot, save_snapshot, get_package_version
+
+
+class SnapshotStemmerBasedSynonymCollection(StemmerBasedSynonymCollection):
+    """ Stemmer based collection, in which values are stemmed with the
+        help of the precomputed {value: stemmed value} dictionary.
+        Missed values are stemmed by the stemmer and then appended into dictionary.
+    """
+
+    def __init__(self, iter_group_values_lists, stemmer, sids, is_read_only, debug):
+        assert(isinstance(sids, dict))
+        # Should be initialized before the collection filling.
+        self.__sids = sids
+        super(SnapshotStemmerBasedSynonymCollection, self).__init__(
+            iter_group_values_lists=iter_group_values_lists,
+            stemmer=stemmer,
+            is_read_only=is_read_only,
+            debug=debug)
+
+    @property
+    def Sids(self):
+        return self.__sids
+
+    def _create_internal_sid(self, value):
+        sid = self.__sids.get(value, None)
+        if sid is None:
+            sid = super(SnapshotStemmerBasedSynonymCollection, self)._create_internal_sid(value)
+            self.__sids[value] = sid
+        return sid
+
+
+def create_synonyms_snapshot_signature(synonyms_filepath, stemmer):
+    """ Snapshot depends on the source file contents and the stemmer implementation,
+        i.e. stemmer type and versions of the installed packages it relies on.
+    """
+    assert(isinstance(stemmer, Stemmer))
+    stemmer_type = type(stemmer)
+    return (file_sha256(synonyms_filepath),
+            ".".join([stemmer_type.__module__, stemmer_type.__name__]),
+            get_package_version("arekit"),
+            get_package_version("pymystem3") if isinstance(stemmer, MystemWrapper) else None)
+
+
+def read_stemmer_based_synonyms_collection(iter_group_values_lists, synonyms_filepath, stemmer,
+                                           snapshot_filepath, is_read_only=False, debug=False):
+    """ Reads synonyms collection, in which stemming results are taken from the snapshot
+        file; snapshot is (re)created in case of absence or change of the synonyms source.
+    """
+    signature = create_synonyms_snapshot_signature(synonyms_filepath=synonyms_filepath, stemmer=stemmer)
+    sids = load_snapshot(snapshot_filepath, signature=signature)
+
+    synonyms = SnapshotStemmerBasedSynonymCollection(
+        iter_group_values_lists=iter_group_values_lists,
+        stemmer=stemmer,
+        sids={} if sids is None else sids,
+        is_read_only=is_read_only,
+        debug=debug)
+
+    if sids is None:
+        save_snapshot(snapshot_filepath, signature=signature, data=dict(synonyms.Sids))
+
+    return synonyms
@@ -1,15 +1,16 @@
+from os.path import join
+
 from arekit.contrib.networks.enum_name_types import ModelNamesService
-from arekit.contrib.source.rusentiframes.collection import RuSentiFramesCollection
-from arekit.contrib.source.rusentiframes.labels_fmt import RuSentiFramesLabelsFormatter, \
-    RuSentiFramesEffectLabelsFormatter
 from arekit.contrib.source.rusentiframes.types import RuSentiFramesVersionsService, RuSentiFramesVersions
 from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
 
-from arelight.pipelines.demo.labels.base import NegativeLabel, PositiveLabel
+from arelight.frames import read_frames_collections
+from arelight.pipelines.demo.brat_output import BRAT_OUTPUT_TYPES
 from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
 from arelight.pipelines.items.entities_default import TextEntitiesParser
 from arelight.samplers.types import SampleFormattersService
 
+from examples.args import const
 from examples.args.base import BaseArg
 from examples.entities.types import EntityFormattersService
 
@@ -32,24 +33,46 @@ class InputTextArg(BaseArg):
 
 class FramesColectionArg(BaseArg):
 
+    supported = {
+        u"ruattitudes-20": (RuSentiFramesVersions.V20, "rusentiframes-20.snapshot")
+    }
+
+    @staticmethod
+    def __read_collections(args):
+        if args.frames not in FramesColectionArg.supported:
+            raise ValueError("Frames collection '{}' is not supported. Expected one of: {}".format(
+                args.frames, ", ".join(FramesColectionArg.supported.keys())))
+
+        # Snapshot is optional, i.e. it might be disabled for the read-only data directory.
+        version, snapshot_filename = FramesColectionArg.supported[args.frames]
+        return read_frames_collections(
+            version=version,
+            snapshot_filepath=join(const.DATA_DIR, snapshot_filename) if args.frames_snapshot else None)
+
     @staticmethod
     def read_argument(args):
-        if args.frames == "ruattitudes-20":
-            return RuSentiFramesCollection.read_collection(
-                version=RuSentiFramesVersions.V20,
-                labels_fmt=RuSentiFramesLabelsFormatter(
-                    pos_label_type=PositiveLabel, neg_label_type=NegativeLabel),
-                effect_labels_fmt=RuSentiFramesEffectLabelsFormatter(
-                    pos_label_type=PositiveLabel, neg_label_type=NegativeLabel))
+        return FramesColectionArg.__read_collections(args)[0]
+
+    @staticmethod
+    def read_frame_variants_argument(args):
+        return FramesColectionArg.__read_collections(args)[1]
 
     @staticmethod
     def add_argument(parser, default="ruattitudes-20"):
+        assert(default in FramesColectionArg.supported)
         parser.add_argument('--frames',
                             dest='frames',
                             type=str,
+                            choices=list(FramesColectionArg.supported.keys()),
                             default=default,
                             nargs='?',
                             help='Collection for frames annotation in text (Default: {})'.format(default))
+        parser.add_argument('--frames-snapshot',
+                            dest='frames_snapshot',
+                            type=lambda x: (str(x).lower() == 'true'),
+                            default=True,
+                            help='Keep the read frames collection in the snapshot '
+                                 'of the data directory (Default: True)')
 
 
 class PredictOutputFilepathArg(BaseArg):
@@ -271,6 +294,23 @@ class SynonymsCollectionFilepathArg(BaseArg):
                             help="List of synonyms provided in lines of the source text file.")
 
 
+class NerCacheFilepathArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        # Optional for the scripts, which do not declare it.
+        return getattr(args, "ner_cache_filepath", None)
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--ner-cache',
+                            dest='ner_cache_filepath',
+                            type=str,
+                            default=default,
+                            help='SQLite database of the NER results, '
+                                 'shared across runs (Default: {})'.format(default))
+
+
 class EntitiesParserArg(BaseArg):
 
     @staticmethod
@@ -281,7 +321,8 @@ class EntitiesParserArg(BaseArg):
         elif arg == "bert-ontonotes":
             # We consider only such entity types that supported by ML model.
             ppl_item = BertOntonotesNERPipelineItem(
-                lambda s_obj: s_obj.ObjectType in ["ORG", "PERSON", "LOC", "GPE"])
+                lambda s_obj: s_obj.ObjectType in ["ORG", "PERSON", "LOC", "GPE"],
+                cache_filepath=NerCacheFilepathArg.read_argument(args))
             return ppl_item
 
     @staticmethod
@@ -451,3 +492,227 @@ class BertTextBFormatTypeArg(BaseArg):
                             default=default,
                             choices=list(SampleFormattersService.iter_names()),
                             help='TextB format type (Default: {})'.format(default))
+
+
+class ServerHostArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.host
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--host',
+                            dest='host',
+                            type=str,
+                            default=default,
+                            help='Host of the inference server (Default: {})'.format(default))
+
+
+class ServerPortArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.port
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--port',
+                            dest='port',
+                            type=int,
+                            default=default,
+                            help='Port of the inference server (Default: {})'.format(default))
+
+
+class BratUrlArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.brat_url
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--brat-url',
+                            dest='brat_url',
+                            type=str,
+                            default=default,
+                            help='URL of the BRAT toolkit, utilized for visualization (Default: {})'.format(default))
+
+
+class ServerCoalesceBatchSizeArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.coalesce_batch_size
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--coalesce-batch-size',
+                            dest='coalesce_batch_size',
+                            type=int,
+                            default=default,
+                            help='Max amount of concurrent requests, processed by '
+                                 'the server within a single batch (Default: {})'.format(default))
+
+
+class ServerCoalesceWaitArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.coalesce_wait_ms
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--coalesce-wait-ms',
+                            dest='coalesce_wait_ms',
+                            type=int,
+                            default=default,
+                            help='Max time in milliseconds of waiting for the concurrent requests '
+                                 'to be processed within a single batch (Default: {})'.format(default))
+
+
+class ServerCacheSizeArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.cache_size
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--cache-size',
+                            dest='cache_size',
+                            type=int,
+                            default=default,
+                            help='Max amount of responses, kept in memory for the '
+                                 'repeated requests (Default: {})'.format(default))
+
+
+class ServerOutputDirArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.output_dir
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--output-dir',
+                            dest='output_dir',
+                            type=str,
+                            default=default,
+                            help='Directory of the precomputed BRAT pages, served by the `/output/<name>` '
+                                 'path; pages of its manifest are rendered on demand (Default: {})'.format(default))
+
+
+class PrecompressOutputArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.precompress
+
+    @staticmethod
+    def add_argument(parser, default):
+        assert(isinstance(default, bool))
+        parser.add_argument('--precompress',
+                            dest='precompress',
+                            type=lambda x: (str(x).lower() == 'true'),
+                            default=default,
+                            help='Write compressed variants and ETag of the html output '
+                                 'alongside (Default: {})'.format(default))
+
+
+class BratOutputArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.brat_output
+
+    @staticmethod
+    def add_argument(parser, default):
+        assert(default in BRAT_OUTPUT_TYPES)
+        parser.add_argument('--brat-output',
+                            dest='brat_output',
+                            type=str,
+                            choices=BRAT_OUTPUT_TYPES,
+                            default=default,
+                            help='BRAT output: html page with the embedded contents, html page written by '
+                                 'streaming, or html pages rendered on demand (Default: {})'.format(default))
+
+
+class BratProcessesArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.brat_processes
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--brat-processes',
+                            dest='brat_processes',
+                            type=int,
+                            default=default,
+                            help='Amount of processes, utilized for the BRAT output '
+                                 'of documents (Default: {})'.format(default))
+
+
+class TokensPerBatchArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.tokens_per_batch
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--tokens-per-batch',
+                            dest='tokens_per_batch',
+                            type=int,
+                            default=default,
+                            help='Max amount of tokens (including padding) in a single '
+                                 'batch of inference (Default: {})'.format(default))
+
+
+class WindowBatchesArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.window_batches
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--window-batches',
+                            dest='window_batches',
+                            type=int,
+                            default=default,
+                            help='Amount of batches, which samples are tokenized and grouped by '
+                                 'length together (Default: {})'.format(default))
+
+
+class StreamChunkSizeArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.stream_chunk_size
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--stream-chunk-size',
+                            dest='stream_chunk_size',
+                            type=int,
+                            default=default,
+                            help='Read samples by chunks of the given amount of rows '
+                                 'instead of the whole file (Default: {})'.format(default))
+
+
+class PrefetchBatchesArg(BaseArg):
+
+    @staticmethod
+    def read_argument(args):
+        return args.prefetch_batches
+
+    @staticmethod
+    def add_argument(parser, default):
+        parser.add_argument('--prefetch-batches',
+                            dest='prefetch_batches',
+                            type=int,
+                            default=default,
+                            help='Amount of batches, tokenized in background during the '
+                                 'inference; 0 disables prefetching (Default: {})'.format(default))
@@ -36,3 +36,7 @@ BERT_FINETUNED_CKPT_PATH = join(BERT_FINETUNED_MODEL_PATHDIR, BERT_DEFAULT_STATE
 
 # The common output directory.
 OUTPUT_DIR = join(current_dir, "../../_output")
+
+# Demo serving.
+DEMO_TEMPLATE_FILEPATH = join(current_dir, "../demo/index-template.html")
+DEMO_DEFAULT_TEXT = "США вводит санкции против РФ"
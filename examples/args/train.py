@@ -143,3 +143,22 @@ class ModelInputTypeArg(BaseArg):
                             nargs='?',
                             help='Input format type (Default: {})'.format(default))
 
+
+class FeaturesCacheDirArg(BaseArg):
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def read_argument(args):
+        return args.features_cache_dir
+
+    @staticmethod
+    def add_argument(parser, default=None):
+        parser.add_argument('--features-cache-dir',
+                            dest='features_cache_dir',
+                            type=str,
+                            default=default,
+                            nargs='?',
+                            help='Directory for the tokenized samples, memory-mapped during '
+                                 'training (Default: {})'.format(default))
@@ -3,7 +3,6 @@
 
 import cgitb
 import cgi
-import json
 import sys
 from os.path import join, basename
 
@@ -16,6 +15,7 @@ from arekit.contrib.utils.entities.formatters.str_simple_sharp_prefixed_fmt impo
 from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitterParser
 from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
 
+from arelight.brat_html import BratTemplate, json_value, text_value
 from arelight.doc_ops import InMemoryDocOperations
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
 from arelight.pipelines.demo.infer_bert_rus import demo_infer_texts_bert_pipeline
@@ -35,24 +35,15 @@ def cgi_output(data):
 def prepare_template(data, text, bratUrl):
     assert (isinstance(data, dict))
 
-    with open("index-template.html", "r") as template_file:
-        template_local = template_file.read()
-
-    template_local = template_local.replace("$____MODEL_NAME____",
-                                            "SentRuBERT")
-
-    template_local = template_local.replace("$____MODEL_DESCRIPTION____",
-                                            "(ra-20-srubert-large-neut-nli-pretrained-3l-finetuned)")
-
-    template_local = template_local.replace("$____SCRIPT_NAME____", basename(__file__))
-
-    template_local = template_local.replace("$____COL_DATA_SEM____", json.dumps(data.get('coll_data', '')))
-    template_local = template_local.replace("$____DOC_DATA_SEM____", json.dumps(data.get('doc_data', '')))
-
-    template_local = template_local.replace("$____TEXT____", text)
-    template_local = template_local.replace("$____BRAT_URL____", bratUrl)
-
-    return template_local
+    return BratTemplate.load("index-template.html").render({
+        "MODEL_NAME": "SentRuBERT",
+        "MODEL_DESCRIPTION": "(ra-20-srubert-large-neut-nli-pretrained-3l-finetuned)",
+        "SCRIPT_NAME": basename(__file__),
+        "COL_DATA_SEM": json_value(data.get('coll_data', '')),
+        "DOC_DATA_SEM": json_value(data.get('doc_data', '')),
+        "TEXT": text_value(text),
+        "BRAT_URL": bratUrl
+    })
 
 
 cgitb.enable(display=0, logdir="/")
@@ -81,6 +72,7 @@ demo_pipeline = demo_infer_texts_bert_pipeline(
     labels_scaler=ThreeLabelScaler())
 
 synonyms = read_synonyms_collection(synonyms_filepath="/arelight/data/synonyms.txt",
+                                    snapshot_filepath="/arelight/data/synonyms.txt.snapshot",
                                     stemmer=MystemWrapper())
 
 text_parser = BaseTextParser(pipeline=[
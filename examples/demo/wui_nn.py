@@ -3,7 +3,6 @@
 
 import cgitb
 import cgi
-import json
 import sys
 from os.path import join, basename
 
@@ -14,9 +13,6 @@ from arekit.common.synonyms.grouping import SynonymsCollectionValuesGroupingProv
 from arekit.common.text.parser import BaseTextParser
 from arekit.contrib.networks.enum_input_types import ModelInputType
 from arekit.contrib.networks.enum_name_types import ModelNames
-from arekit.contrib.source.rusentiframes.collection import RuSentiFramesCollection
-from arekit.contrib.source.rusentiframes.labels_fmt import RuSentiFramesLabelsFormatter, \
-    RuSentiFramesEffectLabelsFormatter
 from arekit.contrib.source.rusentiframes.types import RuSentiFramesVersions
 from arekit.contrib.utils.entities.formatters.str_simple_fmt import StringEntitiesSimpleFormatter
 from arekit.contrib.utils.pipelines.items.text.frames import FrameVariantsParser
@@ -26,11 +22,11 @@ from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitt
 from arekit.contrib.utils.pipelines.items.text.tokenizer import DefaultTextTokenizer
 from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
 
+from arelight.brat_html import BratTemplate, json_value, text_value
 from arelight.doc_ops import InMemoryDocOperations
-from arelight.network.nn.common import create_and_fill_variant_collection
+from arelight.frames import read_frames_collections
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
 from arelight.pipelines.demo.infer_nn_rus import demo_infer_texts_tensorflow_nn_pipeline
-from arelight.pipelines.demo.labels.base import NegativeLabel, PositiveLabel
 from arelight.pipelines.demo.utils import read_synonyms_collection
 from arelight.pipelines.items.backend_brat_html import BratHtmlEmbeddingPipelineItem
 from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
@@ -48,21 +44,15 @@ def prepare_template(data, text, bratUrl, model_name):
     assert(isinstance(model_name, ModelNames))
     assert(isinstance(data, dict))
 
-    with open("index-template.html", "r") as template_file:
-        template_local = template_file.read()
-
-    template_local = template_local.replace("$____MODEL_NAME____", model_name.value)
-    template_local = template_local.replace("$____MODEL_DESCRIPTION____", "(RuSentRel finetuned)")
-
-    template_local = template_local.replace("$____SCRIPT_NAME____", basename(__file__))
-
-    template_local = template_local.replace("$____COL_DATA_SEM____", json.dumps(data.get('coll_data', '')))
-    template_local = template_local.replace("$____DOC_DATA_SEM____", json.dumps(data.get('doc_data', '')))
-
-    template_local = template_local.replace("$____TEXT____", text)
-    template_local = template_local.replace("$____BRAT_URL____", bratUrl)
-
-    return template_local
+    return BratTemplate.load("index-template.html").render({
+        "MODEL_NAME": model_name.value,
+        "MODEL_DESCRIPTION": "(RuSentRel finetuned)",
+        "SCRIPT_NAME": basename(__file__),
+        "COL_DATA_SEM": json_value(data.get('coll_data', '')),
+        "DOC_DATA_SEM": json_value(data.get('doc_data', '')),
+        "TEXT": text_value(text),
+        "BRAT_URL": bratUrl
+    })
 
 
 cgitb.enable(display=0, logdir="/")
@@ -83,12 +73,9 @@ data_dir = "/arelight/data"
 state_name = "ra-20-srubert-large-neut-nli-pretrained-3l"
 finetuned_state_name = "ra-20-srubert-large-neut-nli-pretrained-3l-finetuned"
 
-frames_collection = RuSentiFramesCollection.read_collection(
+frames_collection, frame_variants_collection = read_frames_collections(
     version=RuSentiFramesVersions.V20,
-    labels_fmt=RuSentiFramesLabelsFormatter(
-        pos_label_type=PositiveLabel, neg_label_type=NegativeLabel),
-    effect_labels_fmt=RuSentiFramesEffectLabelsFormatter(
-        pos_label_type=PositiveLabel, neg_label_type=NegativeLabel))
+    snapshot_filepath=join(data_dir, "rusentiframes-20.snapshot"))
 
 demo_pipeline = demo_infer_texts_tensorflow_nn_pipeline(
     texts_count=1,
@@ -100,7 +87,9 @@ demo_pipeline = demo_infer_texts_tensorflow_nn_pipeline(
     frames_collection=frames_collection)
 
 stemmer = MystemWrapper()
-synonyms = read_synonyms_collection(synonyms_filepath="/arelight/data/synonyms.txt", stemmer=stemmer)
+synonyms = read_synonyms_collection(synonyms_filepath="/arelight/data/synonyms.txt",
+                                    snapshot_filepath="/arelight/data/synonyms.txt.snapshot",
+                                    stemmer=stemmer)
 
 demo_pipeline.append(BratHtmlEmbeddingPipelineItem(brat_url="http://localhost:8001/"))
 
@@ -109,7 +98,6 @@ single_doc = [text.strip()]
 doc_ops = InMemoryDocOperations(docs=input_to_docs(single_doc))
 
 # Initialize text parser with the related dependencies.
-frame_variants_collection = create_and_fill_variant_collection(frames_collection)
 text_parser = BaseTextParser(pipeline=[
     TermsSplitterParser(),
     BertOntonotesNERPipelineItem(lambda s_obj: s_obj.ObjectType in ["ORG", "PERSON", "LOC", "GPE"]),
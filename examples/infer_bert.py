@@ -10,9 +10,12 @@ from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitt
 
 from arelight.doc_ops import InMemoryDocOperations
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
+from arelight.pipelines.demo.brat_output import BRAT_OUTPUT_CONTENTS, BRAT_OUTPUT_PAGES
 from arelight.pipelines.demo.infer_bert_rus import demo_infer_texts_bert_pipeline
+from arelight.pipelines.items.backend_brat_compress import BratHtmlPrecompressPipelineItem
 from arelight.pipelines.items.backend_brat_html import BratHtmlEmbeddingPipelineItem
-from arelight.pipelines.items.utils import input_to_docs
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
 
 from examples.args import common
 from examples.args import train
@@ -34,12 +37,21 @@ if __name__ == '__main__':
     common.TokensPerContextArg.add_argument(parser, default=128)
     common.EntityFormatterTypesArg.add_argument(parser, default="hidden-bert-styled")
     common.PredictOutputFilepathArg.add_argument(parser, default=None)
+    common.PrecompressOutputArg.add_argument(parser, default=False)
+    common.BratOutputArg.add_argument(parser, default=BRAT_OUTPUT_CONTENTS)
+    common.BratProcessesArg.add_argument(parser, default=1)
     common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
     common.BertCheckpointFilepathArg.add_argument(parser, default=const.BERT_FINETUNED_CKPT_PATH)
     common.BertConfigFilepathArg.add_argument(parser, default=const.BERT_CONFIG_PATH)
     common.BertVocabFilepathArg.add_argument(parser, default=const.BERT_VOCAB_PATH)
     common.BertTextBFormatTypeArg.add_argument(parser, default='nli_m')
     train.DoLowercaseArg.add_argument(parser, default=const.BERT_DO_LOWERCASE)
+    train.BatchSizeArg.add_argument(parser, default=10)
+    common.TokensPerBatchArg.add_argument(parser, default=None)
+    common.WindowBatchesArg.add_argument(parser, default=32)
+    common.StreamChunkSizeArg.add_argument(parser, default=None)
+    common.PrefetchBatchesArg.add_argument(parser, default=2)
 
     # Parsing arguments.
     args = parser.parse_args()
@@ -50,6 +62,7 @@ if __name__ == '__main__':
     entities_parser = common.EntitiesParserArg.read_argument(args)
     terms_per_context = common.TermsPerContextArg.read_argument(args)
     actual_content = text_from_arg if text_from_arg is not None else texts_from_files
+    brat_output = common.BratOutputArg.read_argument(args)
 
     pipeline = demo_infer_texts_bert_pipeline(
         texts_count=len(texts_from_files),
@@ -60,7 +73,14 @@ if __name__ == '__main__':
         bert_vocab_path=common.BertVocabFilepathArg.read_argument(args),
         bert_finetuned_ckpt_path=common.BertCheckpointFilepathArg.read_argument(args),
         do_lowercase=train.DoLowercaseArg.read_argument(args),
-        max_seq_length=common.TokensPerContextArg.read_argument(args)
+        max_seq_length=common.TokensPerContextArg.read_argument(args),
+        batch_size=train.BatchSizeArg.read_argument(args),
+        tokens_per_batch=common.TokensPerBatchArg.read_argument(args),
+        window_batches=common.WindowBatchesArg.read_argument(args),
+        stream_chunk_size=common.StreamChunkSizeArg.read_argument(args),
+        prefetch_batches=common.PrefetchBatchesArg.read_argument(args),
+        brat_output=brat_output,
+        brat_processes=common.BratProcessesArg.read_argument(args)
     )
 
     synonyms = read_synonyms_collection(filepath=common.SynonymsCollectionFilepathArg.read_argument(args))
@@ -73,16 +93,27 @@ if __name__ == '__main__':
                 synonyms=synonyms, value=value))
     ])
 
+    docs = input_to_docs(actual_content)
+
+    # Perform batched NER for all the sentences of the documents in advance.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.prefetch(iter_docs_sentences_terms(docs))
+
     data_pipeline = create_neutral_annotation_pipeline(
         synonyms=synonyms,
         dist_in_terms_bound=terms_per_context,
-        doc_ops=InMemoryDocOperations(docs=input_to_docs(actual_content)),
-        terms_per_context=50,
+        doc_ops=InMemoryDocOperations(docs=docs),
+        terms_per_context=terms_per_context,
         text_parser=text_parser)
 
-    pipeline.append(
-        BratHtmlEmbeddingPipelineItem(brat_url="http://localhost:8001/")
-    )
+    if brat_output == BRAT_OUTPUT_CONTENTS:
+        pipeline.append(
+            BratHtmlEmbeddingPipelineItem(brat_url="http://localhost:8001/")
+        )
+
+    # Pages are compressed once rendered.
+    if common.PrecompressOutputArg.read_argument(args) and brat_output != BRAT_OUTPUT_PAGES:
+        pipeline.append(BratHtmlPrecompressPipelineItem())
 
     no_folding = NoFolding(doc_ids=list(range(len(actual_content))),
                            supported_data_type=DataType.Test)
@@ -93,6 +124,7 @@ if __name__ == '__main__':
         "template_filepath": join(const.DATA_DIR, "brat_template.html"),
         "predict_fp": "{}.npz".format(backend_template) if backend_template is not None else None,
         "brat_vis_fp": "{}.html".format(backend_template) if backend_template is not None else None,
+        "brat_pages_dir": "{}_pages".format(backend_template) if backend_template is not None else None,
         "data_type_pipelines": {DataType.Test: data_pipeline},
         "data_folding": no_folding
     })
@@ -15,11 +15,13 @@ from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitt
 from arekit.contrib.utils.pipelines.items.text.tokenizer import DefaultTextTokenizer
 
 from arelight.doc_ops import InMemoryDocOperations
-from arelight.network.nn.common import create_and_fill_variant_collection
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
+from arelight.pipelines.demo.brat_output import BRAT_OUTPUT_CONTENTS, BRAT_OUTPUT_PAGES
 from arelight.pipelines.demo.infer_nn_rus import demo_infer_texts_tensorflow_nn_pipeline
+from arelight.pipelines.items.backend_brat_compress import BratHtmlPrecompressPipelineItem
 from arelight.pipelines.items.backend_brat_html import BratHtmlEmbeddingPipelineItem
-from arelight.pipelines.items.utils import input_to_docs
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
 from examples.args import const, common, train
 from examples.entities.factory import create_entity_formatter
 from examples.utils import create_labels_scaler, read_synonyms_collection
@@ -36,12 +38,16 @@ if __name__ == '__main__':
     common.ModelNameArg.add_argument(parser, default=ModelNames.PCNN.value)
     common.TermsPerContextArg.add_argument(parser, default=const.TERMS_PER_CONTEXT)
     common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
     common.EntityFormatterTypesArg.add_argument(parser, default="hidden-simple-eng")
     common.VocabFilepathArg.add_argument(parser, default=None)
     common.EmbeddingMatrixFilepathArg.add_argument(parser, default=None)
     common.ModelLoadDirArg.add_argument(parser, default=const.NEURAL_NETWORKS_TARGET_DIR)
     common.StemmerArg.add_argument(parser, default="mystem")
     common.PredictOutputFilepathArg.add_argument(parser, default=None)
+    common.PrecompressOutputArg.add_argument(parser, default=False)
+    common.BratOutputArg.add_argument(parser, default=BRAT_OUTPUT_CONTENTS)
+    common.BratProcessesArg.add_argument(parser, default=1)
     common.FramesColectionArg.add_argument(parser)
     train.BagsPerMinibatchArg.add_argument(parser, default=const.BAGS_PER_MINIBATCH)
     train.ModelInputTypeArg.add_argument(parser, default=ModelInputType.SingleInstance)
@@ -56,6 +62,7 @@ if __name__ == '__main__':
     terms_per_context = common.TermsPerContextArg.read_argument(args)
     synonyms_filepath = common.SynonymsCollectionFilepathArg.read_argument(args)
     entities_parser = common.EntitiesParserArg.read_argument(args)
+    brat_output = common.BratOutputArg.read_argument(args)
 
     # Reading text-related parameters.
     texts_from_files = common.FromFilesArg.read_argument(args)
@@ -81,17 +88,29 @@ if __name__ == '__main__':
         frames_collection=frames_collection,
         model_load_dir=common.ModelLoadDirArg.read_argument(args),
         entity_fmt=create_entity_formatter(common.EntityFormatterTypesArg.read_argument(args)),
-        bags_per_minibatch=train.BagsPerMinibatchArg.read_argument(args)
+        bags_per_minibatch=train.BagsPerMinibatchArg.read_argument(args),
+        brat_output=brat_output,
+        brat_processes=common.BratProcessesArg.read_argument(args)
     )
 
-    demo_pipeline.append(BratHtmlEmbeddingPipelineItem(brat_url="http://localhost:8001/"))
+    if brat_output == BRAT_OUTPUT_CONTENTS:
+        demo_pipeline.append(BratHtmlEmbeddingPipelineItem(brat_url="http://localhost:8001/"))
+
+    # Pages are compressed once rendered.
+    if common.PrecompressOutputArg.read_argument(args) and brat_output != BRAT_OUTPUT_PAGES:
+        demo_pipeline.append(BratHtmlPrecompressPipelineItem())
 
     backend_template = common.PredictOutputFilepathArg.read_argument(args)
 
-    doc_ops = InMemoryDocOperations(docs=input_to_docs(input_texts))
+    docs = input_to_docs(input_texts)
+    doc_ops = InMemoryDocOperations(docs=docs)
+
+    # Perform batched NER for all the sentences of the documents in advance.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.prefetch(iter_docs_sentences_terms(docs))
 
     # Initialize text parser with the related dependencies.
-    frame_variants_collection = create_and_fill_variant_collection(frames_collection)
+    frame_variants_collection = common.FramesColectionArg.read_frame_variants_argument(args)
     text_parser = BaseTextParser(pipeline=[
         TermsSplitterParser(),
         entities_parser,
@@ -116,6 +135,7 @@ if __name__ == '__main__':
         "template_filepath": join(const.DATA_DIR, "brat_template.html"),
         "predict_fp": "{}.npz".format(backend_template) if backend_template is not None else None,
         "brat_vis_fp": "{}.html".format(backend_template) if backend_template is not None else None,
+        "brat_pages_dir": "{}_pages".format(backend_template) if backend_template is not None else None,
         "data_folding": NoFolding(doc_ids=[0], supported_data_type=DataType.Test),
         "data_type_pipelines": {DataType.Test: test_pipeline}
     })
@@ -20,7 +20,8 @@ from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitt
 
 from arelight.doc_ops import InMemoryDocOperations
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
-from arelight.pipelines.items.utils import input_to_docs
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
 from arelight.samplers.bert import create_bert_sample_provider
 from arelight.samplers.types import BertSampleProviderTypes
 
@@ -39,6 +40,7 @@ if __name__ == '__main__':
     common.InputTextArg.add_argument(parser, default=None)
     common.FromFilesArg.add_argument(parser, default=[DEFAULT_TEXT_FILEPATH])
     common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
     common.TermsPerContextArg.add_argument(parser, default=const.TERMS_PER_CONTEXT)
     common.EntityFormatterTypesArg.add_argument(parser, default="hidden-bert-styled")
     common.SynonymsCollectionFilepathArg.add_argument(parser, default=join(const.DATA_DIR, "synonyms.txt"))
@@ -54,7 +56,13 @@ if __name__ == '__main__':
     entity_fmt = create_entity_formatter(common.EntityFormatterTypesArg.read_argument(args))
     input_texts = text_from_arg if text_from_arg is not None else texts_from_files
     opin_annot = BaseOpinionAnnotator()
-    doc_ops = InMemoryDocOperations(docs=input_to_docs(input_texts))
+    docs = input_to_docs(input_texts)
+    doc_ops = InMemoryDocOperations(docs=docs)
+
+    # Perform batched NER for all the sentences of the documents in advance.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.prefetch(iter_docs_sentences_terms(docs))
+
     labels_fmt = StringLabelsFormatter(stol={"neu": NoLabel})
     label_scaler = SingleLabelScaler(NoLabel())
 
@@ -29,10 +29,10 @@ from arekit.contrib.utils.vectorizers.bpe import BPEVectorizer
 from arekit.contrib.utils.vectorizers.random_norm import RandomNormalVectorizer
 
 from arelight.doc_ops import InMemoryDocOperations
-from arelight.network.nn.common import create_and_fill_variant_collection
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
 from arelight.pipelines.demo.labels.scalers import ThreeLabelScaler
-from arelight.pipelines.items.utils import input_to_docs
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
 
 from examples.args import const
 from examples.args import common
@@ -50,6 +50,7 @@ if __name__ == '__main__':
     common.FromFilesArg.add_argument(parser, default=[DEFAULT_TEXT_FILEPATH])
     common.SynonymsCollectionFilepathArg.add_argument(parser, default=join(const.DATA_DIR, "synonyms.txt"))
     common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
     common.TermsPerContextArg.add_argument(parser, default=const.TERMS_PER_CONTEXT)
     common.EntityFormatterTypesArg.add_argument(parser, default="hidden-simple-eng")
     common.StemmerArg.add_argument(parser, default="mystem")
@@ -68,7 +69,13 @@ if __name__ == '__main__':
     terms_per_context = common.TermsPerContextArg.read_argument(args)
     entities_parser = common.EntitiesParserArg.read_argument(args)
     frames_collection = common.FramesColectionArg.read_argument(args)
-    doc_ops = InMemoryDocOperations(docs=input_to_docs(input_texts))
+    docs = input_to_docs(input_texts)
+    doc_ops = InMemoryDocOperations(docs=docs)
+
+    # Perform batched NER for all the sentences of the documents in advance.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.prefetch(iter_docs_sentences_terms(docs))
+
     stemmer = common.StemmerArg.read_argument(args)
 
     ctx = NetworkSerializationContext(
@@ -100,7 +107,7 @@ if __name__ == '__main__':
     ])
 
     # Initialize text parser with the related dependencies.
-    frame_variants_collection = create_and_fill_variant_collection(frames_collection)
+    frame_variants_collection = common.FramesColectionArg.read_frame_variants_argument(args)
     text_parser = BaseTextParser(pipeline=[
         TermsSplitterParser(),
         entities_parser,
@@ -0,0 +1,136 @@
+import argparse
+import logging
+from os.path import join
+
+from arekit.common.experiment.data_type import DataType
+from arekit.common.folding.nofold import NoFolding
+from arekit.common.news.entities_grouping import EntitiesGroupingPipelineItem
+from arekit.common.synonyms.grouping import SynonymsCollectionValuesGroupingProviders
+from arekit.common.text.parser import BaseTextParser
+from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitterParser
+
+from arelight.brat_pages import create_lazy_render_func
+from arelight.doc_ops import InMemoryDocOperations
+from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
+from arelight.pipelines.demo.infer_bert_rus import demo_infer_texts_bert_pipeline
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
+from arelight.serving.server import serve
+
+from examples.args import common
+from examples.args import train
+from examples.args import const
+from examples.entities.factory import create_entity_formatter
+from examples.entities.types import EntityFormatterTypes
+from examples.utils import create_labels_scaler, read_synonyms_collection, create_demo_page_render_func
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="BERT-based inference server, which loads "
+                                                 "all the required resources once")
+
+    # Providing arguments.
+    common.ServerHostArg.add_argument(parser, default="localhost")
+    common.ServerPortArg.add_argument(parser, default=8080)
+    common.BratUrlArg.add_argument(parser, default="http://localhost:8001/")
+    common.ServerCoalesceBatchSizeArg.add_argument(parser, default=8)
+    common.ServerCoalesceWaitArg.add_argument(parser, default=5)
+    common.ServerCacheSizeArg.add_argument(parser, default=128)
+    common.ServerOutputDirArg.add_argument(parser, default=None)
+    common.SynonymsCollectionFilepathArg.add_argument(parser, default=join(const.DATA_DIR, "synonyms.txt"))
+    common.LabelsCountArg.add_argument(parser, default=3)
+    common.TermsPerContextArg.add_argument(parser, default=const.TERMS_PER_CONTEXT)
+    common.TokensPerContextArg.add_argument(parser, default=128)
+    common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
+    common.BertCheckpointFilepathArg.add_argument(parser, default=const.BERT_FINETUNED_CKPT_PATH)
+    common.BertConfigFilepathArg.add_argument(parser, default=const.BERT_CONFIG_PATH)
+    common.BertVocabFilepathArg.add_argument(parser, default=const.BERT_VOCAB_PATH)
+    common.BertTextBFormatTypeArg.add_argument(parser, default='nli_m')
+    train.DoLowercaseArg.add_argument(parser, default=const.BERT_DO_LOWERCASE)
+    train.BatchSizeArg.add_argument(parser, default=10)
+    common.TokensPerBatchArg.add_argument(parser, default=None)
+    common.WindowBatchesArg.add_argument(parser, default=32)
+    common.PrefetchBatchesArg.add_argument(parser, default=2)
+
+    # Parsing arguments.
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    entities_parser = common.EntitiesParserArg.read_argument(args)
+    terms_per_context = common.TermsPerContextArg.read_argument(args)
+
+    # Everything below is loaded once and kept for the whole lifetime of the server.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.preload()
+
+    demo_pipeline = demo_infer_texts_bert_pipeline(
+        texts_count=1,
+        output_dir=const.OUTPUT_DIR,
+        entity_fmt=create_entity_formatter(EntityFormatterTypes.HiddenBertStyled),
+        labels_scaler=create_labels_scaler(common.LabelsCountArg.read_argument(args)),
+        bert_config_path=common.BertConfigFilepathArg.read_argument(args),
+        bert_vocab_path=common.BertVocabFilepathArg.read_argument(args),
+        bert_finetuned_ckpt_path=common.BertCheckpointFilepathArg.read_argument(args),
+        text_b_type=common.BertTextBFormatTypeArg.read_argument(args),
+        do_lowercase=train.DoLowercaseArg.read_argument(args),
+        max_seq_length=common.TokensPerContextArg.read_argument(args),
+        batch_size=train.BatchSizeArg.read_argument(args),
+        tokens_per_batch=common.TokensPerBatchArg.read_argument(args),
+        window_batches=common.WindowBatchesArg.read_argument(args),
+        prefetch_batches=common.PrefetchBatchesArg.read_argument(args))
+
+    synonyms = read_synonyms_collection(filepath=common.SynonymsCollectionFilepathArg.read_argument(args))
+
+    text_parser = BaseTextParser(pipeline=[
+        TermsSplitterParser(),
+        entities_parser,
+        EntitiesGroupingPipelineItem(
+            lambda value: SynonymsCollectionValuesGroupingProviders.provide_existed_or_register_missed_value(
+                synonyms=synonyms, value=value))
+    ])
+
+    doc_ops = InMemoryDocOperations(docs=[])
+
+    data_pipeline = create_neutral_annotation_pipeline(
+        synonyms=synonyms,
+        dist_in_terms_bound=terms_per_context,
+        doc_ops=doc_ops,
+        terms_per_context=terms_per_context,
+        text_parser=text_parser)
+
+    def infer(texts):
+        """ Concurrent requests are processed as a single batch of documents.
+        """
+        docs = input_to_docs(texts)
+
+        if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+            entities_parser.prefetch(iter_docs_sentences_terms(docs))
+
+        doc_ops.set_docs(docs)
+
+        doc_ids = [doc.ID for doc in docs]
+
+        return demo_pipeline.run(None, {
+            "data_type_pipelines": {DataType.Test: data_pipeline},
+            "data_folding": NoFolding(doc_ids=doc_ids, supported_data_type=DataType.Test),
+            "docs_ranges": [(doc_id, doc_id) for doc_id in doc_ids]
+        })
+
+    output_dir = common.ServerOutputDirArg.read_argument(args)
+
+    serve(infer_func=infer,
+          render_func=create_demo_page_render_func(
+              template_filepath=const.DEMO_TEMPLATE_FILEPATH,
+              model_name="SentRuBERT",
+              model_description="({})".format(const.BERT_DEFAULT_FINETUNED),
+              brat_url=common.BratUrlArg.read_argument(args),
+              default_text=const.DEMO_DEFAULT_TEXT),
+          host=common.ServerHostArg.read_argument(args),
+          port=common.ServerPortArg.read_argument(args),
+          max_batch_size=common.ServerCoalesceBatchSizeArg.read_argument(args),
+          max_wait_ms=common.ServerCoalesceWaitArg.read_argument(args),
+          output_dir=output_dir,
+          page_render_func=create_lazy_render_func(output_dir) if output_dir is not None else None,
+          cache_size=common.ServerCacheSizeArg.read_argument(args))
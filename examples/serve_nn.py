@@ -0,0 +1,141 @@
+import argparse
+import logging
+from os.path import join
+
+from arekit.common.experiment.data_type import DataType
+from arekit.common.folding.nofold import NoFolding
+from arekit.common.news.entities_grouping import EntitiesGroupingPipelineItem
+from arekit.common.synonyms.grouping import SynonymsCollectionValuesGroupingProviders
+from arekit.common.text.parser import BaseTextParser
+from arekit.contrib.networks.enum_input_types import ModelInputType
+from arekit.contrib.networks.enum_name_types import ModelNames
+from arekit.contrib.utils.pipelines.items.text.frames import FrameVariantsParser
+from arekit.contrib.utils.pipelines.items.text.frames_lemmatized import LemmasBasedFrameVariantsParser
+from arekit.contrib.utils.pipelines.items.text.frames_negation import FrameVariantsSentimentNegation
+from arekit.contrib.utils.pipelines.items.text.terms_splitter import TermsSplitterParser
+from arekit.contrib.utils.pipelines.items.text.tokenizer import DefaultTextTokenizer
+
+from arelight.brat_pages import create_lazy_render_func
+from arelight.doc_ops import InMemoryDocOperations
+from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
+from arelight.pipelines.demo.infer_nn_rus import demo_infer_texts_tensorflow_nn_pipeline
+from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
+from arelight.pipelines.items.utils import input_to_docs, iter_docs_sentences_terms
+from arelight.serving.server import serve
+
+from examples.args import const, common, train
+from examples.entities.factory import create_entity_formatter
+from examples.utils import create_labels_scaler, read_synonyms_collection, create_demo_page_render_func
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Neural network based inference server, which loads "
+                                                 "all the required resources once")
+
+    # Providing arguments.
+    common.ServerHostArg.add_argument(parser, default="localhost")
+    common.ServerPortArg.add_argument(parser, default=8080)
+    common.BratUrlArg.add_argument(parser, default="http://localhost:8001/")
+    common.ServerCoalesceBatchSizeArg.add_argument(parser, default=8)
+    common.ServerCoalesceWaitArg.add_argument(parser, default=5)
+    common.ServerCacheSizeArg.add_argument(parser, default=128)
+    common.ServerOutputDirArg.add_argument(parser, default=None)
+    common.SynonymsCollectionFilepathArg.add_argument(parser, default=join(const.DATA_DIR, "synonyms.txt"))
+    common.LabelsCountArg.add_argument(parser, default=3)
+    common.ModelNameArg.add_argument(parser, default=ModelNames.PCNN.value)
+    common.TermsPerContextArg.add_argument(parser, default=const.TERMS_PER_CONTEXT)
+    common.EntitiesParserArg.add_argument(parser, default="bert-ontonotes")
+    common.NerCacheFilepathArg.add_argument(parser, default=None)
+    common.EntityFormatterTypesArg.add_argument(parser, default="hidden-simple-eng")
+    common.ModelLoadDirArg.add_argument(parser, default=const.NEURAL_NETWORKS_TARGET_DIR)
+    common.StemmerArg.add_argument(parser, default="mystem")
+    common.FramesColectionArg.add_argument(parser)
+    train.BagsPerMinibatchArg.add_argument(parser, default=const.BAGS_PER_MINIBATCH)
+    train.ModelInputTypeArg.add_argument(parser, default=ModelInputType.SingleInstance)
+
+    # Parsing arguments.
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    model_name = common.ModelNameArg.read_argument(args)
+    stemmer = common.StemmerArg.read_argument(args)
+    terms_per_context = common.TermsPerContextArg.read_argument(args)
+    entities_parser = common.EntitiesParserArg.read_argument(args)
+
+    # Everything below is loaded once and kept for the whole lifetime of the server.
+    if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+        entities_parser.preload()
+
+    synonyms = read_synonyms_collection(filepath=common.SynonymsCollectionFilepathArg.read_argument(args))
+
+    frames_collection = common.FramesColectionArg.read_argument(args)
+
+    demo_pipeline = demo_infer_texts_tensorflow_nn_pipeline(
+        texts_count=1,
+        output_dir=const.OUTPUT_DIR,
+        model_name=model_name,
+        model_input_type=train.ModelInputTypeArg.read_argument(args),
+        frames_collection=frames_collection,
+        model_load_dir=common.ModelLoadDirArg.read_argument(args),
+        entity_fmt=create_entity_formatter(common.EntityFormatterTypesArg.read_argument(args)),
+        labels_scaler=create_labels_scaler(common.LabelsCountArg.read_argument(args)),
+        bags_per_minibatch=train.BagsPerMinibatchArg.read_argument(args))
+
+    frame_variants_collection = common.FramesColectionArg.read_frame_variants_argument(args)
+    text_parser = BaseTextParser(pipeline=[
+        TermsSplitterParser(),
+        entities_parser,
+        EntitiesGroupingPipelineItem(
+            lambda value: SynonymsCollectionValuesGroupingProviders.provide_existed_or_register_missed_value(
+                synonyms, value)),
+        DefaultTextTokenizer(keep_tokens=True),
+        FrameVariantsParser(frame_variants=frame_variants_collection),
+        LemmasBasedFrameVariantsParser(save_lemmas=False,
+                                       stemmer=stemmer,
+                                       frame_variants=frame_variants_collection),
+        FrameVariantsSentimentNegation()])
+
+    doc_ops = InMemoryDocOperations(docs=[])
+
+    data_pipeline = create_neutral_annotation_pipeline(synonyms=synonyms,
+                                                       dist_in_terms_bound=terms_per_context,
+                                                       terms_per_context=terms_per_context,
+                                                       doc_ops=doc_ops,
+                                                       text_parser=text_parser,
+                                                       dist_in_sentences=0)
+
+    def infer(texts):
+        """ Concurrent requests are processed as a single batch of documents.
+        """
+        docs = input_to_docs(texts)
+
+        if isinstance(entities_parser, BertOntonotesNERPipelineItem):
+            entities_parser.prefetch(iter_docs_sentences_terms(docs))
+
+        doc_ops.set_docs(docs)
+
+        doc_ids = [doc.ID for doc in docs]
+
+        return demo_pipeline.run(None, {
+            "data_type_pipelines": {DataType.Test: data_pipeline},
+            "data_folding": NoFolding(doc_ids=doc_ids, supported_data_type=DataType.Test),
+            "docs_ranges": [(doc_id, doc_id) for doc_id in doc_ids]
+        })
+
+    output_dir = common.ServerOutputDirArg.read_argument(args)
+
+    serve(infer_func=infer,
+          render_func=create_demo_page_render_func(
+              template_filepath=const.DEMO_TEMPLATE_FILEPATH,
+              model_name=model_name.value,
+              model_description="(RuSentRel finetuned)",
+              brat_url=common.BratUrlArg.read_argument(args),
+              default_text=const.DEMO_DEFAULT_TEXT),
+          host=common.ServerHostArg.read_argument(args),
+          port=common.ServerPortArg.read_argument(args),
+          max_batch_size=common.ServerCoalesceBatchSizeArg.read_argument(args),
+          max_wait_ms=common.ServerCoalesceWaitArg.read_argument(args),
+          output_dir=output_dir,
+          page_render_func=create_lazy_render_func(output_dir) if output_dir is not None else None,
+          cache_size=common.ServerCacheSizeArg.read_argument(args))
@@ -24,6 +24,7 @@ if __name__ == '__main__':
     train.EpochsCountArg.add_argument(parser, default=4)
     train.BatchSizeArg.add_argument(parser, default=6)
     train.DoLowercaseArg.add_argument(parser, default=False)
+    train.FeaturesCacheDirArg.add_argument(parser, default=None)
 
     # Parsing arguments.
     args = parser.parse_args()
@@ -37,7 +38,8 @@ if __name__ == '__main__':
                                  max_seq_length=common.TokensPerContextArg.read_argument(args),
                                  learning_rate=train.LearningRateArg.read_argument(args),
                                  save_path=common.BertSaveFilepathArg.read_argument(args),
-                                 labels_count=3)
+                                 labels_count=3,
+                                 features_cache_dir=train.FeaturesCacheDirArg.read_argument(args))
     ])
 
     pipeline.run(common.InputSamplesFilepath.read_argument(args),
@@ -2,9 +2,10 @@ from enum import Enum
 
 from arekit.contrib.source.synonyms.utils import iter_synonym_groups
 from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
-from arekit.contrib.utils.synonyms.stemmer_based import StemmerBasedSynonymCollection
 
+from arelight.brat_html import BratTemplate, json_value, text_value
 from arelight.pipelines.demo.labels.scalers import ThreeLabelScaler
+from arelight.synonyms import read_stemmer_based_synonyms_collection
 
 
 def create_labels_scaler(labels_count):
@@ -16,18 +17,45 @@ def create_labels_scaler(labels_count):
     raise NotImplementedError("Not supported")
 
 
-def read_synonyms_collection(filepath):
+def read_synonyms_collection(filepath, snapshot_filepath=None):
+    """ Stemmed values of the collection are kept in the snapshot file
+        (next to the synonyms file by default) for the further runs.
+    """
 
     def __iter_groups(filepath):
         with open(filepath, 'r') as file:
             for group in iter_synonym_groups(file):
                 yield group
 
-    return StemmerBasedSynonymCollection(
+    return read_stemmer_based_synonyms_collection(
         iter_group_values_lists=__iter_groups(filepath),
+        synonyms_filepath=filepath,
         stemmer=MystemWrapper(),
-        is_read_only=False,
-        debug=False)
+        snapshot_filepath=filepath + ".snapshot" if snapshot_filepath is None else snapshot_filepath)
+
+
+def create_demo_page_render_func(template_filepath, model_name, model_description, brat_url, default_text):
+    """ Provides function which renders the demo page for the BRAT contents and text.
+        Template is loaded once, so it might be utilized by the long-running inference server.
+    """
+
+    template = BratTemplate.load(template_filepath).bind({
+        "MODEL_NAME": model_name,
+        "MODEL_DESCRIPTION": model_description,
+        "SCRIPT_NAME": "",
+        "BRAT_URL": brat_url
+    })
+
+    def __render(contents, text):
+        assert(isinstance(contents, dict))
+        return template.render({
+            "COL_DATA_SEM": json_value(contents.get('coll_data', '')),
+            "DOC_DATA_SEM": json_value(contents.get('doc_data', '')),
+            # Text is provided by user.
+            "TEXT": text_value(text if text is not None else default_text)
+        })
+
+    return __render
 
 
 class EnumConversionService(object):
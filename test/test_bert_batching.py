@@ -0,0 +1,103 @@
+import unittest
+
+from arelight.network.bert.batching import iter_length_bucketed_batches, trim_features_padding, iter_prefetched, \
+    iter_windowed_batches
+
+
+class Features(object):
+
+    def __init__(self, length, max_seq_length):
+        padding = [0] * (max_seq_length - length)
+        self.input_ids = list(range(1, length + 1)) + padding
+        self.input_mask = [1] * length + padding
+        self.input_type_ids = [0] * max_seq_length
+
+
+class CountedFeatures(Features):
+    """ Keeps track of the amount of the alive instances.
+    """
+
+    alive = 0
+    peak = 0
+
+    def __init__(self, length, max_seq_length):
+        super(CountedFeatures, self).__init__(length, max_seq_length)
+        CountedFeatures.alive += 1
+        CountedFeatures.peak = max(CountedFeatures.peak, CountedFeatures.alive)
+
+    def __del__(self):
+        CountedFeatures.alive -= 1
+
+
+class TestBertBatching(unittest.TestCase):
+
+    lengths = [10, 120, 12, 128, 11, 64]
+
+    def test_batch_size(self):
+        batches = list(iter_length_bucketed_batches(lengths=self.lengths, batch_size=4))
+        self.assertEqual(batches, [[0, 4, 2, 5], [1, 3]])
+
+    def test_tokens_per_batch(self):
+        batches = list(iter_length_bucketed_batches(lengths=self.lengths, batch_size=10, tokens_per_batch=130))
+        # Every item is considered exactly once.
+        self.assertEqual(sorted(sum(batches, [])), list(range(len(self.lengths))))
+        for batch in batches:
+            self.assertTrue(len(batch) == 1 or max([self.lengths[i] for i in batch]) * len(batch) <= 130)
+
+    def test_trim_padding(self):
+        features = trim_features_padding([Features(length=3, max_seq_length=8),
+                                          Features(length=5, max_seq_length=8)])
+        for f in features:
+            self.assertEqual(len(f.input_ids), 5)
+            self.assertEqual(len(f.input_mask), 5)
+            self.assertEqual(len(f.input_type_ids), 5)
+        self.assertEqual(features[0].input_mask, [1, 1, 1, 0, 0])
+
+    def test_windowed(self):
+        consumed = []
+
+        def __iter_items():
+            for length in self.lengths * 10:
+                consumed.append(length)
+                yield length
+
+        def __features(window):
+            return [CountedFeatures(length=length, max_seq_length=128) for length in window]
+
+        batches_it = iter_windowed_batches(items_it=__iter_items(), window_size=4,
+                                           features_func=__features, batch_size=2)
+
+        # The first batch is provided before the rest items are read.
+        next(batches_it)
+        self.assertEqual(len(consumed), 4)
+
+        items_count = 2
+        for window, batch_inds, batch_features, _ in batches_it:
+            items_count += len(batch_inds)
+            self.assertEqual([len(f.input_ids) for f in batch_features],
+                             [max([window[i] for i in batch_inds])] * len(batch_inds))
+
+        self.assertEqual(items_count, len(self.lengths) * 10)
+        # At most a single window of features is held at once, besides the batch of the consumer.
+        self.assertLessEqual(CountedFeatures.peak, 4 + 2)
+
+    def test_prefetched(self):
+        self.assertEqual(list(iter_prefetched(iter(range(100)), depth=3)), list(range(100)))
+
+    def test_prefetched_error(self):
+
+        def __iter_failed():
+            yield 0
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            list(iter_prefetched(__iter_failed(), depth=1))
+
+    def test_prefetched_early_exit(self):
+        for i in iter_prefetched(iter(range(100)), depth=1):
+            if i == 5:
+                break
+
+
+if __name__ == '__main__':
+    unittest.main()
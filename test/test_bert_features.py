@@ -0,0 +1,75 @@
+import shutil
+import tempfile
+import unittest
+from os.path import join
+
+from arelight.network.bert.features import BertFeaturesStore, create_features_cache_dir
+
+
+class Features(object):
+
+    def __init__(self, text_a, text_b):
+        length = len(text_a.split()) + len(text_b.split())
+        self.input_ids = list(range(1, length + 1))
+        self.input_mask = [1] * length
+        self.input_type_ids = [0] * len(text_a.split()) + [1] * len(text_b.split())
+
+
+def proc(texts_a, texts_b):
+    return [Features(a, b) for a, b in zip(texts_a, texts_b)]
+
+
+class TestBertFeaturesStore(unittest.TestCase):
+
+    texts_a = ["a b c", "a", "a b c d e"]
+    texts_b = ["x", "x y", "x"]
+
+    def test_store(self):
+        store = BertFeaturesStore.from_texts(proc=proc, texts_a=self.texts_a, texts_b=self.texts_b,
+                                             max_seq_length=8, chunk_size=2)
+        self.assertEqual(store.SamplesCount, 3)
+
+        features = store.get_features([2, 0])
+        self.assertEqual(list(features[0].input_ids), [1, 2, 3, 4, 5, 6, 0, 0])
+        self.assertEqual(list(features[1].input_type_ids), [0, 0, 0, 1, 0, 0, 0, 0])
+
+    def test_save_load(self):
+        target_dir = tempfile.mkdtemp()
+        try:
+            store = BertFeaturesStore.from_texts(proc=proc, texts_a=self.texts_a, texts_b=self.texts_b,
+                                                 max_seq_length=8)
+            store.save(target_dir)
+            loaded = BertFeaturesStore.load(target_dir, mmap=True)
+            self.assertEqual(list(loaded.get_features([1])[0].input_mask), [1, 1, 1, 0, 0, 0, 0, 0])
+        finally:
+            shutil.rmtree(target_dir)
+
+    def test_cache_dir_vocab(self):
+        target_dir = tempfile.mkdtemp()
+        try:
+            samples_filepath = join(target_dir, "samples.tsv")
+            vocab_filepath = join(target_dir, "vocab.txt")
+            with open(samples_filepath, "w") as f:
+                f.write("a\tb\n")
+
+            def create_dir():
+                return create_features_cache_dir(cache_dir=target_dir,
+                                                 samples_filepath=samples_filepath,
+                                                 vocab_filepath=vocab_filepath,
+                                                 do_lowercase=True,
+                                                 max_seq_length=8)[0]
+
+            with open(vocab_filepath, "w") as f:
+                f.write("a\nb\n")
+            dir_before = create_dir()
+
+            # The same path, but the other vocabulary.
+            with open(vocab_filepath, "w") as f:
+                f.write("b\na\n")
+            self.assertNotEqual(dir_before, create_dir())
+        finally:
+            shutil.rmtree(target_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,12 @@ import json
 import unittest
 from os.path import join, dirname, realpath
 
+import pandas as pd
+
 from arelight.brat_backend import BratBackend
 from arelight.pipelines.demo.labels.base import PositiveLabel, NegativeLabel
 from arelight.pipelines.demo.labels.scalers import ThreeLabelScaler
+from arelight.readers.tsv import DataFrameRows
 
 
 class TestBratEmbedding(unittest.TestCase):
@@ -13,6 +16,124 @@ class TestBratEmbedding(unittest.TestCase):
     TEST_DATA_DIR = join(current_dir, "data")
     ORIGIN_DATA_DIR = join(current_dir, "../data")
 
+    # Expected contents of the document 0 of the "sample-test-0" (two sentences).
+    DOC_0_TEXT = "DOC: 0 \n 24 марта президент сша джо байден провел переговоры с лидерами стран " \
+                 "евросоюза в брюсселе вызвав внимание рынка и предположения о том, что америке удалось " \
+                 "уговорить ес совместно бойкотировать российские нефть и газ. \n европейский союз " \
+                 "крайне зависим от россии в плане поставок нефти и газа. \n \n"
+
+    DOC_0_ROWS_COUNT = 32
+
+    # Entity ids, types and character bounds.
+    DOC_0_ENTITIES = [(0, "GPE", 28, 31),
+                      (1, "PERSON", 32, 42),
+                      (2, "ORG", 78, 87),
+                      (3, "GPE", 90, 98),
+                      (4, "GPE", 148, 155),
+                      (5, "ORG", 174, 176),
+                      (6, "ORG", 227, 243),
+                      (7, "GPE", 262, 268)]
+
+    # Row index, label and entity ids (subject, object) of the rows with the positive result.
+    DOC_0_RELATIONS = [(0, "NEG", 0, 1),
+                       (1, "NEG", 0, 2),
+                       (2, "NEG", 0, 3),
+                       (3, "NEG", 0, 4),
+                       (5, "NEG", 1, 0),
+                       (6, "NEG", 1, 2)]
+
+    @staticmethod
+    def __label_to_rel(labels_scaler):
+        return {str(labels_scaler.label_to_uint(PositiveLabel())): "POS",
+                str(labels_scaler.label_to_uint(NegativeLabel())): "NEG"}
+
+    @staticmethod
+    def __expected_entities(char_offset=0, id_offset=0):
+        return [["T{}".format(id_offset + e_id), e_type, [[char_offset + start, char_offset + end]]]
+                for e_id, e_type, start, end in TestBratEmbedding.DOC_0_ENTITIES]
+
+    @staticmethod
+    def __expected_relations(row_offset=0, id_offset=0):
+        return [[row_offset + row_ind, label, [[BratBackend.SUBJECT_ROLE, "T{}".format(id_offset + s_id)],
+                                               [BratBackend.OBJECT_ROLE, "T{}".format(id_offset + o_id)]]]
+                for row_ind, label, s_id, o_id in TestBratEmbedding.DOC_0_RELATIONS]
+
+    def __read_docs(self, docs_count):
+        """ Provides samples and results, in which every document is a copy of the document 0.
+        """
+        samples = pd.read_csv(join(self.TEST_DATA_DIR, "sample-test-0.tsv.gz"), sep='\t', index_col=False)
+        result = pd.read_csv(join(self.TEST_DATA_DIR, "out.tsv.gz"), sep='\t', index_col=False)
+
+        # Results are provided for the rows of the sample, while the rest rows are not labeled.
+        result = result.reindex(range(len(samples)), fill_value=0)
+
+        samples = pd.concat([samples.assign(doc_id=doc_id) for doc_id in range(docs_count)], ignore_index=True)
+        result = pd.concat([result] * docs_count, ignore_index=True)
+
+        return DataFrameRows(samples), DataFrameRows(result)
+
+    def __to_data(self, brat_be, samples_data_filepath=None, result_data_filepath=None, docs_range=None,
+                  samples=None, result=None):
+        return brat_be.to_data(obj_color_types={"ORG": '#7fa2ff', "GPE": "#7fa200", "PERSON": "#7f00ff"},
+                               rel_color_types={"POS": "GREEN", "NEG": "RED"},
+                               samples_data_filepath=samples_data_filepath,
+                               result_data_filepath=result_data_filepath,
+                               label_to_rel=self.__label_to_rel(ThreeLabelScaler()),
+                               docs_range=docs_range,
+                               samples=samples,
+                               result=result)
+
+    def test_to_data(self):
+        contents = self.__to_data(BratBackend(),
+                                  samples_data_filepath=join(self.TEST_DATA_DIR, "sample-test-0.tsv.gz"),
+                                  result_data_filepath=join(self.TEST_DATA_DIR, "out.tsv.gz"),
+                                  docs_range=(0, 5))
+
+        doc_data = contents["doc_data"]
+        self.assertEqual(contents["text"], self.DOC_0_TEXT)
+        self.assertEqual(doc_data["text"], self.DOC_0_TEXT)
+        self.assertEqual(doc_data["entities"], self.__expected_entities())
+        self.assertEqual(doc_data["relations"], self.__expected_relations())
+
+    def test_to_data_docs(self):
+        samples, result = self.__read_docs(docs_count=2)
+        doc_data = self.__to_data(BratBackend(), samples=samples, result=result)["doc_data"]
+
+        # Documents are separated by space; ids of the second document follow the ids of the first one.
+        char_offset = len(self.DOC_0_TEXT) + 1
+        id_offset = len(self.DOC_0_ENTITIES)
+        row_offset = self.DOC_0_ROWS_COUNT
+
+        self.assertEqual(doc_data["text"], self.DOC_0_TEXT + " " + self.DOC_0_TEXT.replace("DOC: 0", "DOC: 1"))
+        self.assertEqual(doc_data["entities"],
+                         self.__expected_entities() +
+                         self.__expected_entities(char_offset=char_offset, id_offset=id_offset))
+        self.assertEqual(doc_data["relations"],
+                         self.__expected_relations() +
+                         self.__expected_relations(row_offset=row_offset, id_offset=id_offset))
+
+    def test_to_data_processes(self):
+        samples, result = self.__read_docs(docs_count=5)
+
+        single = self.__to_data(BratBackend(processes=1), samples=samples, result=result)
+        pooled = self.__to_data(BratBackend(processes=2, docs_per_task=1), samples=samples, result=result)
+
+        self.assertEqual(single["text"], pooled["text"])
+        self.assertEqual(single["doc_data"], pooled["doc_data"])
+
+    def test_entity_ids_unique(self):
+        samples, result = self.__read_docs(docs_count=3)
+        doc_data = self.__to_data(BratBackend(processes=2, docs_per_task=1), samples=samples, result=result)["doc_data"]
+
+        entity_ids = [e_id for e_id, _, _ in doc_data["entities"]]
+        self.assertEqual(len(entity_ids), 3 * len(self.DOC_0_ENTITIES))
+        self.assertEqual(len(set(entity_ids)), len(entity_ids))
+
+        # Relations refer to the existing entities.
+        for _, _, args in doc_data["relations"]:
+            for _, e_id in args:
+                self.assertIn(e_id, entity_ids)
+
     def __to_html(self, template_filepath, contents, brat_url):
         # Loading template file.
         with open(template_filepath, "r") as templateFile:
@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from arelight.brat_html import BratTemplate, json_value, text_value, write_html
+
+
+class TestBratHtml(unittest.TestCase):
+
+    template = "<a href='$____BRAT_URL____'/>coll=$____COL_DATA_SEM____;doc=$____DOC_DATA_SEM____;$____TEXT____"
+
+    def test_write(self):
+
+        def __write_doc_data(stream, text_stream):
+            stream.write('{"text": "t"}')
+            text_stream.write("t")
+
+        output = io.StringIO()
+        write_html(output=output,
+                   template=BratTemplate(self.template),
+                   coll_data={"a": 1},
+                   brat_url="http://localhost:8001/",
+                   write_doc_data_func=__write_doc_data)
+
+        self.assertEqual(output.getvalue(),
+                         "<a href='http://localhost:8001/'/>coll={\"a\": 1};doc={\"text\": \"t\"};t")
+
+    def test_coll_data_url(self):
+        output = io.StringIO()
+        write_html(output=output,
+                   template=BratTemplate("coll=$____COL_DATA_SEM____"),
+                   coll_data="{}",
+                   brat_url="",
+                   coll_data_url="coll_data.js",
+                   write_doc_data_func=lambda stream, text_stream: None)
+
+        self.assertEqual(output.getvalue(), "coll=((window.bratCollData = window.bratCollData || {}), "
+                                            "head.js(\"coll_data.js\"), window.bratCollData)")
+
+    def test_escape(self):
+        text = "</textarea><script>alert(1)</script>"
+        page = BratTemplate("<textarea>$____TEXT____</textarea><script>var d = $____DOC_DATA_SEM____</script>").render({
+            "TEXT": text_value(text),
+            "DOC_DATA_SEM": json_value({"text": text})})
+
+        self.assertNotIn("<script>alert", page)
+        self.assertEqual(page.count("</script>"), 1)
+        self.assertEqual(json.loads(page[page.index("var d = ") + 8:page.rindex("</script>")])["text"], text)
+
+    def test_render(self):
+        template = BratTemplate(self.template).bind({"BRAT_URL": "/brat/"})
+        self.assertEqual(template.Placeholders, ["COL_DATA_SEM", "DOC_DATA_SEM", "TEXT"])
+        self.assertEqual(template.render({"COL_DATA_SEM": json_value([1]), "TEXT": "$____BRAT_URL____"}),
+                         "<a href='/brat/'/>coll=[1];doc=$____DOC_DATA_SEM____;$____BRAT_URL____")
+
+    def test_load(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".html", delete=False) as f:
+            f.write(self.template)
+        try:
+            self.assertIs(BratTemplate.load(f.name), BratTemplate.load(f.name))
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
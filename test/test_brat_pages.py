@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join, dirname, realpath, exists
+
+import pandas as pd
+
+from arelight.brat_pages import create_pages_manifest, render_page
+from arelight.serving.precompressed import write_precompressed, ETAG_EXTENSION, GZIP
+
+
+class TestBratPages(unittest.TestCase):
+
+    current_dir = dirname(realpath(__file__))
+    TEST_DATA_DIR = join(current_dir, "data")
+    ORIGIN_DATA_DIR = join(current_dir, "../data")
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__pages_dir = join(self.__dir, "pages")
+        self.__samples_filepath = join(self.__dir, "sample-test-0.tsv.gz")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir)
+
+    def __write_samples(self, replace_func):
+        samples = pd.read_csv(join(self.TEST_DATA_DIR, "sample-test-0.tsv.gz"), sep='\t', index_col=False)
+        samples["entity_values"] = samples["entity_values"].apply(replace_func)
+        samples.to_csv(self.__samples_filepath, sep='\t', index=False, compression='gzip')
+
+    def __create_manifest(self):
+        return create_pages_manifest(target_dir=self.__pages_dir,
+                                     samples_filepath=self.__samples_filepath,
+                                     result_filepath=join(self.TEST_DATA_DIR, "out.tsv.gz"),
+                                     template_filepath=join(self.ORIGIN_DATA_DIR, "brat_template.html"),
+                                     label_to_rel={"1": "POS", "2": "NEG"},
+                                     obj_color_types={"ORG": '#7fa2ff', "GPE": "#7fa200", "PERSON": "#7f00ff"},
+                                     rel_color_types={"POS": "GREEN", "NEG": "RED"},
+                                     brat_url="http://localhost:8001/")
+
+    # Document text is embedded into the page in JSON.
+    ENTITY_VALUE = json.dumps("джо байден")[1:-1]
+
+    @staticmethod
+    def __read(filepath):
+        with open(filepath, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_regenerate(self):
+        self.__write_samples(lambda values: values)
+        page_filepath = render_page(self.__create_manifest(), page_ind=0)
+        write_precompressed(page_filepath, encodings=[GZIP])
+        self.assertIn(self.ENTITY_VALUE, self.__read(page_filepath))
+
+        # Samples of the other run are written into the same directory.
+        self.__write_samples(lambda values: values.replace("джо байден", "байден"))
+        manifest_filepath = self.__create_manifest()
+
+        # Pages of the previous run are removed together with their compressed variants.
+        self.assertFalse(exists(page_filepath))
+        self.assertFalse(exists(page_filepath + ETAG_EXTENSION))
+
+        page_filepath = render_page(manifest_filepath, page_ind=0)
+        self.assertNotIn(self.ENTITY_VALUE, self.__read(page_filepath))
+
+    def test_outdated(self):
+        self.__write_samples(lambda values: values)
+        manifest_filepath = self.__create_manifest()
+        page_filepath = render_page(manifest_filepath, page_ind=0)
+
+        # Page, which is older than the manifest, is rendered again.
+        with open(page_filepath, "w") as f:
+            f.write("outdated")
+        os.utime(page_filepath, (0, 0))
+        self.assertNotEqual(self.__read(render_page(manifest_filepath, page_ind=0)), "outdated")
+
+
+if __name__ == '__main__':
+    unittest.main()
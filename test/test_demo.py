@@ -9,9 +9,6 @@ from arekit.common.synonyms.grouping import SynonymsCollectionValuesGroupingProv
 from arekit.common.text.parser import BaseTextParser
 from arekit.contrib.networks.enum_input_types import ModelInputType
 from arekit.contrib.networks.enum_name_types import ModelNames
-from arekit.contrib.source.rusentiframes.collection import RuSentiFramesCollection
-from arekit.contrib.source.rusentiframes.labels_fmt import RuSentiFramesLabelsFormatter, \
-    RuSentiFramesEffectLabelsFormatter
 from arekit.contrib.source.rusentiframes.types import RuSentiFramesVersions
 from arekit.contrib.utils.entities.formatters.str_simple_fmt import StringEntitiesSimpleFormatter
 from arekit.contrib.utils.entities.formatters.str_simple_sharp_prefixed_fmt import SharpPrefixedEntitiesSimpleFormatter
@@ -23,11 +20,10 @@ from arekit.contrib.utils.pipelines.items.text.tokenizer import DefaultTextToken
 from arekit.contrib.utils.processing.lemmatization.mystem import MystemWrapper
 
 from arelight.doc_ops import InMemoryDocOperations
-from arelight.network.nn.common import create_and_fill_variant_collection
+from arelight.frames import read_frames_collections
 from arelight.pipelines.annot_nolabel import create_neutral_annotation_pipeline
 from arelight.pipelines.demo.infer_bert_rus import demo_infer_texts_bert_pipeline
 from arelight.pipelines.demo.infer_nn_rus import demo_infer_texts_tensorflow_nn_pipeline
-from arelight.pipelines.demo.labels.base import NegativeLabel, PositiveLabel
 from arelight.pipelines.demo.labels.scalers import ThreeLabelScaler
 from arelight.pipelines.demo.utils import read_synonyms_collection
 from arelight.pipelines.items.entities_bert_ontonotes import BertOntonotesNERPipelineItem
@@ -60,12 +56,7 @@ class TestDemo(unittest.TestCase):
         return template_local
 
     def test_demo_rus_nn(self):
-        frames_collection = RuSentiFramesCollection.read_collection(
-            version=RuSentiFramesVersions.V20,
-            labels_fmt=RuSentiFramesLabelsFormatter(
-                pos_label_type=PositiveLabel, neg_label_type=NegativeLabel),
-            effect_labels_fmt=RuSentiFramesEffectLabelsFormatter(
-                pos_label_type=PositiveLabel, neg_label_type=NegativeLabel))
+        frames_collection, frame_variants_collection = read_frames_collections(version=RuSentiFramesVersions.V20)
 
         demo_pipeline = demo_infer_texts_tensorflow_nn_pipeline(
             texts_count=1,
@@ -79,7 +70,6 @@ class TestDemo(unittest.TestCase):
         stemmer = MystemWrapper()
 
         # Initialize text parser with the related dependencies.
-        frame_variants_collection = create_and_fill_variant_collection(frames_collection)
         text_parser = BaseTextParser(pipeline=[
             TermsSplitterParser(),
             BertOntonotesNERPipelineItem(lambda s_obj: s_obj.ObjectType in ["ORG", "PERSON", "LOC", "GPE"]),
@@ -0,0 +1,30 @@
+import unittest
+
+from arelight.ner.alignment import align_labels, MERGE_FIRST, MERGE_MAJORITY, MERGE_OUTSIDE
+
+
+class TestNerAlignment(unittest.TestCase):
+
+    terms = ["Владимир", "Путин,", "США"]
+    tokens = ["Владимир", "Путин", ",", "США"]
+    labels = ["B-PERSON", "I-PERSON", "O", "B-GPE"]
+
+    def test_first(self):
+        self.assertEqual(align_labels(self.terms, self.tokens, self.labels, policy=MERGE_FIRST),
+                         ["B-PERSON", "I-PERSON", "B-GPE"])
+
+    def test_outside(self):
+        self.assertEqual(align_labels(self.terms, self.tokens, self.labels, policy=MERGE_OUTSIDE),
+                         ["B-PERSON", "O", "B-GPE"])
+
+    def test_majority(self):
+        self.assertEqual(align_labels(["Путин", "Газпром"], ["Путин", "Газ", "пром"], ["B-PERSON", "B-ORG", "I-ORG"],
+                                      policy=MERGE_MAJORITY),
+                         ["B-PERSON", "B-ORG"])
+        self.assertEqual(align_labels(["Газпром"], ["Газ", "пр", "ом"], ["O", "I-ORG", "I-ORG"],
+                                      policy=MERGE_MAJORITY),
+                         ["B-ORG"])
+
+
+if __name__ == '__main__':
+    unittest.main()
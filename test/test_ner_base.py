@@ -0,0 +1,30 @@
+import unittest
+
+from arelight.ner.base import BaseNER
+
+
+class FixedTagsNER(BaseNER):
+
+    def __init__(self, tags):
+        self.__tags = tags
+
+    def _extract_tags(self, seqences):
+        return self.__tags
+
+
+class TestBaseNER(unittest.TestCase):
+
+    def test_decode(self):
+        ner = FixedTagsNER(tags=[["B-PERSON", "I-PERSON", "O", "B-GPE", "O", "I-GPE", "B-ORG"],
+                                 ["I-ORG", "O"]])
+        extracted = ner.extract([["t"] * 7, ["t"] * 2])
+
+        # Inner tag extends the last object, even after the outside tag.
+        self.assertEqual([(o.Position, o.Length, o.ObjectType) for o in extracted[0]],
+                         [(0, 2, "PERSON"), (3, 2, "GPE"), (6, 1, "ORG")])
+        # Inner tag without the prior begin tag is omitted.
+        self.assertEqual(extracted[1], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from arelight.ner.cache import NerCache
+from arelight.ner.obj_desc import NerObjectDescriptor
+
+
+class TestNerCache(unittest.TestCase):
+
+    terms = ["Москва", "и", "Вашингтон"]
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__filepath = os.path.join(self.__dir, "ner.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir)
+
+    def __put(self, cache):
+        cache.put_many([self.terms], [[NerObjectDescriptor(pos=0, length=1, obj_type="GPE"),
+                                       NerObjectDescriptor(pos=2, length=1, obj_type="GPE")]])
+
+    def test_memory(self):
+        cache = NerCache(model_key="a", capacity=1)
+        self.assertIsNone(cache.get(self.terms))
+        self.__put(cache)
+
+        objects = cache.get(self.terms)
+        self.assertEqual([o.get_range() for o in objects], [(0, 1), (2, 3)])
+        self.assertEqual(cache.HitRate, 0.5)
+
+        # Least recently used sequence is dropped.
+        cache.put_many([["США"]], [[]])
+        self.assertIsNone(cache.get(self.terms))
+
+    def test_disk(self):
+        cache = NerCache(model_key="a", filepath=self.__filepath)
+        self.__put(cache)
+        cache.close()
+
+        cache = NerCache(model_key="a", filepath=self.__filepath)
+        self.assertEqual(len(cache.get(self.terms)), 2)
+        self.assertEqual(cache.get_stats()["disk_hits"], 1)
+        cache.close()
+
+        # Results are invalidated for the other model.
+        cache = NerCache(model_key="b", filepath=self.__filepath)
+        self.assertIsNone(cache.get(self.terms))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
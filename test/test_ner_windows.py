@@ -0,0 +1,29 @@
+import unittest
+
+from arelight.ner.obj_desc import NerObjectDescriptor
+from arelight.ner.windows import create_windows, merge_windows_objects
+
+
+class TestNerWindows(unittest.TestCase):
+
+    def test_create(self):
+        self.assertEqual(create_windows(5, window_size=8, overlap=2), [(0, 5)])
+        self.assertEqual(create_windows(20, window_size=8, overlap=2), [(0, 8), (6, 14), (12, 20)])
+
+    def test_merge(self):
+        windows = [(0, 8), (6, 14)]
+        windows_objects = [
+            [NerObjectDescriptor(pos=1, length=1, obj_type="PERSON"),
+             NerObjectDescriptor(pos=6, length=2, obj_type="ORG")],
+            # The first object is the same as the last one of the prior window.
+            [NerObjectDescriptor(pos=0, length=2, obj_type="ORG"),
+             NerObjectDescriptor(pos=5, length=1, obj_type="GPE")]]
+
+        merged = merge_windows_objects(windows, windows_objects)
+
+        self.assertEqual([(o.get_range(), o.ObjectType) for o in merged],
+                         [((1, 2), "PERSON"), ((6, 8), "ORG"), ((11, 12), "GPE")])
+
+
+if __name__ == '__main__':
+    unittest.main()
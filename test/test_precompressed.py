@@ -0,0 +1,118 @@
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from arelight.serving.precompressed import write_precompressed, read_etag, select_precompressed, GZIP
+from arelight.serving.server import BratInferenceServer
+
+
+class TestPrecompressed(unittest.TestCase):
+
+    def setUp(self):
+        self.__dir = tempfile.mkdtemp()
+        self.__filepath = os.path.join(self.__dir, "page.html")
+        with open(self.__filepath, "w") as f:
+            f.write("<html>" + "text " * 1000 + "</html>")
+
+    def tearDown(self):
+        shutil.rmtree(self.__dir)
+
+    def test_write(self):
+        etag = write_precompressed(self.__filepath, encodings=[GZIP])
+        self.assertEqual(read_etag(self.__filepath), etag)
+
+        target, encoding = select_precompressed(self.__filepath, "gzip, deflate")
+        self.assertEqual(encoding, GZIP)
+        with gzip.open(target, "rb") as gz, open(self.__filepath, "rb") as f:
+            self.assertEqual(gz.read(), f.read())
+
+        self.assertEqual(select_precompressed(self.__filepath, "gzip;q=0"), (self.__filepath, None))
+
+    def test_serve(self):
+        infer_calls = []
+
+        def __infer(texts):
+            infer_calls.extend(texts)
+            return [{"text": t} for t in texts]
+
+        server = BratInferenceServer(server_address=("localhost", 0),
+                                     infer_func=__infer,
+                                     render_func=lambda contents, text: "page " * 1000,
+                                     output_dir=self.__dir,
+                                     cache_size=4)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://localhost:{}".format(server.server_address[1])
+
+        try:
+            write_precompressed(self.__filepath, encodings=[GZIP])
+            response = urlopen(Request(url + "/output/page.html", headers={"Accept-Encoding": "gzip"}))
+            self.assertEqual(response.headers["Content-Encoding"], GZIP)
+            self.assertEqual(response.headers["Content-Type"], "text/html; charset=utf-8")
+            with self.assertRaises(HTTPError) as e:
+                urlopen(Request(url + "/output/page.html", headers={"If-None-Match": response.headers["ETag"],
+                                                                    "Accept-Encoding": "gzip"}))
+            self.assertEqual(e.exception.code, 304)
+
+            # Uncompressed representation has the other entity tag.
+            plain = urlopen(Request(url + "/output/page.html", headers={"If-None-Match": response.headers["ETag"]}))
+            self.assertIsNone(plain.headers["Content-Encoding"])
+            self.assertNotEqual(plain.headers["ETag"], response.headers["ETag"])
+
+            with open(os.path.join(self.__dir, "coll_data.js"), "w") as f:
+                f.write("var collData = {};")
+            response = urlopen(url + "/output/coll_data.js")
+            # Python versions differ in the registered type of the scripts.
+            self.assertIn("javascript", response.headers["Content-Type"])
+
+            for _ in range(2):
+                response = urlopen(url + "/?text=abc")
+            self.assertEqual(infer_calls, ["abc"])
+            with self.assertRaises(HTTPError) as e:
+                urlopen(Request(url + "/?text=abc", headers={"If-None-Match": response.headers["ETag"]}))
+            self.assertEqual(e.exception.code, 304)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_serve_lazy(self):
+        rendered = []
+
+        def __render_page(name):
+            if name != "lazy.html":
+                return None
+            filepath = os.path.join(self.__dir, name)
+            with open(filepath, "w") as f:
+                f.write("<html>lazy</html>")
+            rendered.append(name)
+            return filepath
+
+        server = BratInferenceServer(server_address=("localhost", 0),
+                                     infer_func=lambda texts: texts,
+                                     render_func=lambda contents, text: "",
+                                     output_dir=self.__dir,
+                                     page_render_func=__render_page)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://localhost:{}".format(server.server_address[1])
+
+        try:
+            for _ in range(2):
+                response = urlopen(url + "/output/lazy.html")
+                self.assertEqual(response.read(), b"<html>lazy</html>")
+            self.assertEqual(rendered, ["lazy.html"])
+            self.assertIsNotNone(response.headers["ETag"])
+
+            with self.assertRaises(HTTPError) as e:
+                urlopen(url + "/output/missed.html")
+            self.assertEqual(e.exception.code, 404)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
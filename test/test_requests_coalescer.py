@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+from arelight.serving.coalescer import RequestsCoalescer
+
+
+class TestRequestsCoalescer(unittest.TestCase):
+
+    def __submit_concurrently(self, coalescer, inputs):
+        results = [None] * len(inputs)
+
+        def __submit(i):
+            try:
+                results[i] = coalescer.submit(inputs[i])
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=__submit, args=(i,)) for i in range(len(inputs))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        return results
+
+    def test_results(self):
+        batches = []
+
+        def __process(texts):
+            batches.append(len(texts))
+            return [text.upper() for text in texts]
+
+        coalescer = RequestsCoalescer(process_func=__process, max_batch_size=4, max_wait_ms=50)
+        inputs = ["text-{}".format(i) for i in range(10)]
+
+        results = self.__submit_concurrently(coalescer, inputs)
+
+        self.assertEqual(results, [text.upper() for text in inputs])
+        self.assertEqual(sum(batches), len(inputs))
+        self.assertTrue(max(batches) <= 4)
+
+    def test_error(self):
+
+        def __process(texts):
+            raise ValueError()
+
+        coalescer = RequestsCoalescer(process_func=__process, max_batch_size=2, max_wait_ms=0)
+
+        for result in self.__submit_concurrently(coalescer, ["a", "b", "c"]):
+            self.assertIsInstance(result, ValueError)
+
+        # Worker keeps running after the failure.
+        with self.assertRaises(ValueError):
+            coalescer.submit("d")
+
+
+if __name__ == '__main__':
+    unittest.main()
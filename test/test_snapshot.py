@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from os.path import join
+from unittest import mock
+
+import pkg_resources
+
+from arelight.snapshot import save_snapshot, load_snapshot, get_package_version
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.target_dir = tempfile.mkdtemp()
+        self.filepath = join(self.target_dir, "data.snapshot")
+
+    def tearDown(self):
+        shutil.rmtree(self.target_dir)
+
+    def test_save_load(self):
+        save_snapshot(self.filepath, signature=("hash", 1), data={"a": "b"})
+        self.assertEqual(load_snapshot(self.filepath, signature=("hash", 1)), {"a": "b"})
+
+    def test_outdated(self):
+        save_snapshot(self.filepath, signature=("hash", 1), data={"a": "b"})
+        self.assertIsNone(load_snapshot(self.filepath, signature=("hash", 2)))
+
+    def test_corrupted(self):
+        with open(self.filepath, "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(load_snapshot(self.filepath, signature=("hash", 1)))
+
+    def test_readonly(self):
+        # Directory could not be created within a file.
+        blocker_filepath = join(self.target_dir, "blocker")
+        with open(blocker_filepath, "w") as f:
+            f.write("")
+        filepath = join(blocker_filepath, "data.snapshot")
+
+        self.assertFalse(save_snapshot(filepath, signature=("hash", 1), data={"a": "b"}))
+        self.assertIsNone(load_snapshot(filepath, signature=("hash", 1)))
+
+    @unittest.skipIf(hasattr(os, "geteuid") and os.geteuid() == 0, "permissions are not applied to root")
+    def test_readonly_dir(self):
+        readonly_dir = join(self.target_dir, "readonly")
+        os.makedirs(readonly_dir)
+        os.chmod(readonly_dir, 0o555)
+        try:
+            self.assertFalse(save_snapshot(join(readonly_dir, "data.snapshot"), signature=("hash", 1), data={}))
+        finally:
+            os.chmod(readonly_dir, 0o755)
+
+    def test_missed(self):
+        self.assertIsNone(load_snapshot(self.filepath, signature=("hash", 1)))
+
+    def test_package_version(self):
+        self.assertIsNone(get_package_version("arelight-missed-package"))
+
+        def create_signature(version):
+            distribution = mock.Mock(version=version)
+            with mock.patch.object(pkg_resources, "get_distribution", return_value=distribution):
+                return "hash", get_package_version("arekit")
+
+        save_snapshot(self.filepath, signature=create_signature("0.22.0"), data={"a": "b"})
+        self.assertEqual(load_snapshot(self.filepath, signature=create_signature("0.22.0")), {"a": "b"})
+        # Upgraded package forces rebuilding.
+        self.assertIsNone(load_snapshot(self.filepath, signature=create_signature("0.22.1")))
+
+
+if __name__ == '__main__':
+    unittest.main()